@@ -1,7 +1,15 @@
 # alerts/alert_manager.py
 
+import atexit
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from clock.clock import current_clock
 from logs.log_manager import log_event
-from config import EMAIL_ENABLED, TELEGRAM_ENABLED, WEBHOOK_ENABLED
+from config import EMAIL_ENABLED, TELEGRAM_ENABLED, WEBHOOK_ENABLED, ALERT_CONFIG
 
 
 def send_email_alert(service, message):
@@ -15,16 +23,232 @@ def send_telegram_alert(service, message):
 
 
 def send_webhook_alert(service, message):
-    if WEBHOOK_ENABLED:
+    if not WEBHOOK_ENABLED:
+        return
+
+    url = ALERT_CONFIG.get("webhook_url")
+    if not url:
         print(f"🌐 Webhook sent → {service}: {message}")
+        return
 
+    body = json.dumps({"service": service, "message": message}).encode()
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=ALERT_CONFIG["delivery_timeout"]) as response:
+        response.read()
 
-def send_alert(service, message):
+
+class _ChannelRateLimit:
     """
-    Unified alert dispatcher
+    Per-channel token bucket, `per_minute` deliveries per minute.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def allow(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _AlertGroup:
+    __slots__ = ("started", "message", "suppressed")
+
+    def __init__(self, started, message):
+        self.started = started
+        self.message = message
+        self.suppressed = 0
+
+
+class AlertAggregator:
+    """
+    Coalesces alerts and delivers them off the caller's thread.
+
+    The first alert for a (service, alert_type) pair goes out immediately;
+    repeats within `window` seconds are counted and sent as one summary
+    when the window closes. Each channel has its own per-minute rate
+    limit, and deliveries run on a bounded worker pool with retries.
+    Every dispatched alert or summary is logged once at CRITICAL;
+    coalesced repeats only at DEBUG.
     """
-    log_event("CRITICAL", service, f"ALERT TRIGGERED: {message}")
 
-    send_email_alert(service, message)
-    send_telegram_alert(service, message)
-    send_webhook_alert(service, message)
+    def __init__(self, channels, window=60, rate_limits=None, workers=4,
+                 queue_size=1000, delivery_retries=3, retry_backoff=1.0):
+        self.channels = channels
+        self.window = window
+        self.delivery_retries = delivery_retries
+        self.retry_backoff = retry_backoff
+
+        rate_limits = rate_limits or {}
+        self._limits = {
+            name: _ChannelRateLimit(rate_limits[name])
+            for name in channels if name in rate_limits
+        }
+        self.stats = {"sent": 0, "coalesced": 0, "rate_limited": 0, "dropped": 0, "failed": 0}
+
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="alert")
+        self._sweeper = None
+        self._stopping = threading.Event()
+
+    # ---- caller side --------------------------------------------------
+
+    def submit(self, service, message, alert_type=None):
+        """
+        Returns True if the alert was dispatched, False if it was coalesced.
+        """
+        if self._sweeper is None:
+            self._start_sweeper()
+
+        key = (service, alert_type or message)
+        # Coalescing windows follow the process clock; delivery stays real-time
+        now = current_clock.time()
+
+        with self._lock:
+            group = self._groups.get(key)
+            if group is not None and now - group.started < self.window:
+                group.suppressed += 1
+                group.message = message
+                self.stats["coalesced"] += 1
+                coalesced = True
+            else:
+                coalesced = False
+                self._groups[key] = _AlertGroup(now, message)
+
+        if coalesced:
+            log_event("DEBUG", service, "Alert coalesced: %s", args=(message,))
+            return False
+
+        if group is not None and group.suppressed:
+            self._dispatch(service, self._summary(group))
+        self._dispatch(service, message)
+        return True
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _summary(self, group):
+        return f"{group.message} (+{group.suppressed} similar in the last {self.window}s)"
+
+    def _dispatch(self, service, message):
+        log_event("CRITICAL", service, "ALERT TRIGGERED: %s", args=(message,))
+        for name, send in self.channels.items():
+            with self._lock:
+                limit = self._limits.get(name)
+                allowed = limit is None or limit.allow()
+            if not allowed:
+                self._count("rate_limited")
+                continue
+
+            if not self._slots.acquire(blocking=False):
+                self._count("dropped")
+                continue
+            try:
+                self._executor.submit(self._deliver, name, send, service, message)
+            except RuntimeError:
+                # Executor already shut down
+                self._slots.release()
+                self._count("dropped")
+
+    # ---- workers ------------------------------------------------------
+
+    def _deliver(self, name, send, service, message):
+        try:
+            for attempt in range(1, self.delivery_retries + 1):
+                try:
+                    send(service, message)
+                    self._count("sent")
+                    return
+                except Exception as e:
+                    if attempt == self.delivery_retries:
+                        self._count("failed")
+                        log_event(
+                            "ERROR",
+                            "AlertManager",
+                            "Alert delivery via %s failed after %d attempts: %s",
+                            args=(name, attempt, e)
+                        )
+                        return
+                    time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+        finally:
+            self._slots.release()
+
+    def _start_sweeper(self):
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="alert-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        interval = max(0.1, min(self.window, 5))
+        while not self._stopping.wait(interval):
+            self.sweep()
+
+    def sweep(self, force=False):
+        """
+        Emit summaries for groups whose window has closed.
+        """
+        now = current_clock.time()
+        expired = []
+        with self._lock:
+            for key, group in list(self._groups.items()):
+                if force or now - group.started >= self.window:
+                    del self._groups[key]
+                    if group.suppressed:
+                        expired.append((key[0], group))
+
+        for service, group in expired:
+            self._dispatch(service, self._summary(group))
+
+    def shutdown(self, wait=True):
+        self._stopping.set()
+        self.sweep(force=True)
+        self._executor.shutdown(wait=wait)
+
+
+def _enabled_channels():
+    channels = {}
+    if EMAIL_ENABLED:
+        channels["email"] = send_email_alert
+    if TELEGRAM_ENABLED:
+        channels["telegram"] = send_telegram_alert
+    if WEBHOOK_ENABLED:
+        channels["webhook"] = send_webhook_alert
+    return channels
+
+
+_aggregator = AlertAggregator(
+    _enabled_channels(),
+    window=ALERT_CONFIG["coalesce_window"],
+    rate_limits=ALERT_CONFIG["rate_limits"],
+    workers=ALERT_CONFIG["workers"],
+    queue_size=ALERT_CONFIG["queue_size"],
+    delivery_retries=ALERT_CONFIG["delivery_retries"]
+)
+atexit.register(_aggregator.shutdown)
+
+
+def get_aggregator():
+    return _aggregator
+
+
+def send_alert(service, message, alert_type=None):
+    """
+    Unified alert dispatcher
+    """
+    _aggregator.submit(service, message, alert_type)
@@ -0,0 +1,73 @@
+# alerts/webhook_stub.py
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class WebhookStubServer:
+    """
+    Local HTTP endpoint that records alert webhook POSTs.
+
+    Point ALERT_CONFIG["webhook_url"] at `url` to exercise real HTTP
+    delivery. `fail_next` makes the next N requests return 503 so retry
+    handling can be tested.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.received = []
+        self.fail_next = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/alerts"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+
+                with stub._lock:
+                    failing = stub.fail_next > 0
+                    if failing:
+                        stub.fail_next -= 1
+                    else:
+                        try:
+                            stub.received.append(json.loads(body or b"{}"))
+                        except ValueError:
+                            stub.received.append({"raw": body.decode(errors="replace")})
+
+                self.send_response(503 if failing else 200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="webhook-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    server = WebhookStubServer(port=8085)
+    print(f"Webhook stub listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,145 @@
+# analytics/columnar.py
+
+import json
+import mmap
+import os
+from array import array
+
+from analytics.events import EVENTS
+from analytics.log_index import scan_segment
+
+_MAGIC = b"LOGCOL1\n"
+
+# name -> array typecode; -1 encodes "none" in error and retry
+_COLUMNS = (("ts", "d"), ("service", "H"), ("event", "B"), ("error", "b"), ("retry", "h"))
+
+
+def compact_segment(path, out_path, index_dir=None, block_size=1 << 20):
+    """
+    Write the events of a (rotated, no longer growing) JSONL segment to a
+    columnar file: a JSON header with the dictionaries, then one packed
+    array per column. Returns the number of rows.
+    """
+    services, errors = [], []
+    columns = {name: array(code) for name, code in _COLUMNS}
+
+    def code(table, value):
+        if value not in table:
+            table.append(value)
+        return table.index(value)
+
+    for ts, service, event, error, retry in scan_segment(path, index_dir, block_size=block_size):
+        columns["ts"].append(ts)
+        columns["service"].append(code(services, service))
+        columns["event"].append(EVENTS.index(event))
+        columns["error"].append(-1 if error is None else code(errors, error))
+        columns["retry"].append(-1 if retry is None else min(retry, 32767))
+
+    rows = len(columns["ts"])
+    layout, offset = {}, 0
+    for name, _ in _COLUMNS:
+        layout[name] = offset
+        # Keep every column aligned for memoryview.cast
+        offset += -(-rows * columns[name].itemsize // 8) * 8
+
+    header = json.dumps({
+        "source": os.path.basename(path),
+        "rows": rows,
+        "t_min": min(columns["ts"]) if rows else None,
+        "t_max": max(columns["ts"]) if rows else None,
+        "services": services,
+        "events": list(EVENTS),
+        "errors": errors,
+        "columns": layout
+    }).encode()
+    prefix = len(_MAGIC) + len(header) + 1
+    padding = -prefix % 8
+
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC + header + b"\n" + b" " * padding)
+        for name, _ in _COLUMNS:
+            data = columns[name].tobytes()
+            f.write(data + b"\0" * (-len(data) % 8))
+    os.replace(tmp, out_path)
+    return rows
+
+
+class ColumnarSegment:
+    """
+    Read-only view of a compacted segment. Columns are memoryviews over
+    the mmapped file, so nothing is parsed or copied up front.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            if self._file.readline() != _MAGIC:
+                raise ValueError(f"Not a columnar log segment: {path}")
+            self.header = json.loads(self._file.readline())
+            base = self._file.tell()
+            base += -base % 8
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        rows = self.header["rows"]
+        self._view = memoryview(self._map)
+        self.columns = {}
+        for name, code in _COLUMNS:
+            start = base + self.header["columns"][name]
+            size = rows * array(code).itemsize
+            self.columns[name] = self._view[start:start + size].cast(code)
+
+    @property
+    def t_min(self):
+        return self.header["t_min"]
+
+    @property
+    def t_max(self):
+        return self.header["t_max"]
+
+    def events(self, since=None, until=None, services=None):
+        """
+        Same tuples as analytics.log_index.scan_segment().
+        """
+        if self.header["rows"] == 0:
+            return
+        if since is not None and self.t_max < since:
+            return
+        if until is not None and self.t_min > until:
+            return
+
+        names = self.header["services"]
+        wanted = None
+        if services is not None:
+            wanted = {i for i, name in enumerate(names) if name in services}
+            if not wanted:
+                return
+        events = self.header["events"]
+        errors = self.header["errors"]
+
+        c = self.columns
+        for ts, service, event, error, retry in zip(
+                c["ts"], c["service"], c["event"], c["error"], c["retry"]):
+            if since is not None and ts < since:
+                continue
+            if until is not None and ts > until:
+                continue
+            if wanted is not None and service not in wanted:
+                continue
+            yield (
+                ts, names[service], events[event],
+                errors[error] if error >= 0 else None,
+                retry if retry >= 0 else None
+            )
+
+    def close(self):
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        self._view.release()
+        self._map.close()
+        self._file.close()
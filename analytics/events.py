@@ -0,0 +1,96 @@
+# analytics/events.py
+#
+# Maps JSON log entries to the events the log analytics work with.
+
+import re
+from datetime import datetime, timezone
+
+EVENTS = (
+    "call_success", "retry", "retries_exhausted", "error",
+    "breaker_open", "breaker_half_open", "breaker_closed"
+)
+
+# First match wins; matched against the lower-cased message
+ERROR_TYPES = (
+    ("rate_limit", ("429", "too many requests", "throttled", "rate limit")),
+    ("timeout", ("timeout", "timed out")),
+    ("server", ("500", "502", "503", "504", "unavailable")),
+    ("auth", ("auth", "401", "403")),
+    ("bulkhead", ("bulkhead",)),
+    ("concurrency_limit", ("concurrency limit",))
+)
+
+# Byte patterns of every line that can produce an event: the scanner
+# only decodes lines containing one of them. Anchoring on the key keeps
+# the regex on its fast literal-prefix search.
+EVENT_MARKERS = re.compile(
+    rb'"message": "(?:Circuit breaker |Retry \d|Call successful|All retries exhausted)'
+    rb'|"level": "(?:ERROR|CRITICAL)"'
+)
+
+_seconds = {}
+
+
+def parse_timestamp(text):
+    """
+    Epoch seconds of a log timestamp (naive UTC ISO, LogRecord.timestamp).
+    Whole seconds are cached: consecutive entries share them.
+    """
+    whole = text[:19]
+    base = _seconds.get(whole)
+    if base is None:
+        if len(_seconds) > 4096:
+            _seconds.clear()
+        base = _seconds[whole] = datetime.fromisoformat(whole).replace(tzinfo=timezone.utc).timestamp()
+    return base + float(text[19:]) if len(text) > 19 else base
+
+
+def error_type(message):
+    message = message.lower()
+    for name, needles in ERROR_TYPES:
+        if any(needle in message for needle in needles):
+            return name
+    return "other"
+
+
+def classify(level, message):
+    """
+    Event name for a log entry, or None if it is not one.
+    """
+    if message.startswith("Circuit breaker OPEN"):
+        return "breaker_open"
+    if message.startswith("Circuit breaker HALF_OPEN"):
+        return "breaker_half_open"
+    if message.startswith("Circuit breaker CLOSED"):
+        return "breaker_closed"
+    if message.startswith("Call successful"):
+        return "call_success"
+    if message.startswith("Retry ") and " failed" in message:
+        return "retry"
+    if message.startswith("All retries exhausted"):
+        return "retries_exhausted"
+    if level in ("ERROR", "CRITICAL"):
+        return "error"
+    return None
+
+
+def make_event(timestamp, level, service, message, retry_count):
+    """
+    (timestamp, service, event, error_type, retry_count) for a log entry,
+    or None. error_type is set for retries and errors only.
+    """
+    event = classify(level, message)
+    if event is None:
+        return None
+    kind = error_type(message) if event in ("retry", "error") else None
+    return parse_timestamp(timestamp), service, event, kind, retry_count
+
+
+def to_event(entry):
+    """
+    make_event() for a decoded JSON log entry.
+    """
+    return make_event(
+        entry["timestamp"], entry.get("level"), entry.get("service") or "",
+        entry.get("message") or "", entry.get("retry_count")
+    )
@@ -0,0 +1,285 @@
+# analytics/log_analytics.py
+#
+# Usage:
+#   python -m analytics.log_analytics report --since 24h --service ElevenLabs
+#   python -m analytics.log_analytics report --since 2026-01-28 --until 2026-01-29
+#   python -m analytics.log_analytics compact
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from config import LOG_FILE_PATH, LOG_ANALYTICS_CONFIG
+from analytics.columnar import ColumnarSegment, compact_segment
+from analytics.events import parse_timestamp
+from analytics.log_index import fingerprint, load_index, log_segments, scan_segment
+
+_RELATIVE = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+class LogAnalytics:
+    """
+    Breaker outage, MTTR, retry and error reports over the JSON log and
+    its rotated backups.
+
+    JSONL segments are read through mmap with a sidecar block index (by
+    time and service) in `index_dir`; compact() turns rotated segments
+    into columnar files there, which are read instead of the JSONL from
+    then on. Sidecars are keyed by a content fingerprint, so they follow
+    segments across rotations, and compacted segments stay queryable
+    after rotation deletes their source.
+    """
+
+    def __init__(self, path=LOG_FILE_PATH, index_dir=None, block_size=None):
+        self.path = path
+        self.index_dir = index_dir or LOG_ANALYTICS_CONFIG["index_dir"]
+        self.block_size = block_size or LOG_ANALYTICS_CONFIG["block_size"]
+
+    def _columnar_path(self, key):
+        return os.path.join(self.index_dir, f"{key}.col")
+
+    def build_indexes(self):
+        """
+        Bring every segment's sidecar index up to date and drop indexes
+        of segments that no longer exist. Returns the segment count.
+        """
+        keep = set()
+        segments = log_segments(self.path)
+        for path in segments:
+            key = fingerprint(path)
+            if key is None:
+                continue
+            keep.add(f"{key}.idx")
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                load_index(path, data, self.index_dir, self.block_size)
+
+        for stale in glob.glob(os.path.join(self.index_dir, "*.idx")):
+            if os.path.basename(stale) not in keep:
+                os.remove(stale)
+        return len(segments)
+
+    def compact(self):
+        """
+        Compact rotated segments that have no columnar copy yet. The live
+        log is never compacted. Returns {segment path: rows}.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        compacted = {}
+        for path in log_segments(self.path):
+            if path == self.path:
+                continue
+            key = fingerprint(path)
+            if key is None or os.path.exists(self._columnar_path(key)):
+                continue
+            compacted[path] = compact_segment(
+                path, self._columnar_path(key), self.index_dir, self.block_size
+            )
+        return compacted
+
+    def events(self, since=None, until=None, services=None):
+        """
+        Every event in the window, segment by segment, oldest first:
+        compacted history first, then the current segments.
+        """
+        services = set(services) if services else None
+        current = {}
+        for path in log_segments(self.path):
+            current[path] = fingerprint(path)
+        live_keys = {key for key in current.values() if key}
+
+        history = []
+        for col_path in glob.glob(os.path.join(self.index_dir, "*.col")):
+            key = os.path.basename(col_path)[:-len(".col")]
+            if key not in live_keys:
+                history.append(ColumnarSegment(col_path))
+        history.sort(key=lambda segment: segment.t_min or 0)
+
+        for segment in history:
+            try:
+                yield from segment.events(since, until, services)
+            finally:
+                segment.close()
+
+        for path, key in current.items():
+            col_path = self._columnar_path(key) if key else None
+            if col_path and path != self.path and os.path.exists(col_path):
+                segment = ColumnarSegment(col_path)
+                try:
+                    yield from segment.events(since, until, services)
+                finally:
+                    segment.close()
+            else:
+                yield from scan_segment(
+                    path, self.index_dir, since, until, services, self.block_size
+                )
+
+    def report(self, since=None, until=None, services=None):
+        return build_report(self.events(since, until, services), since, until)
+
+
+def _new_service():
+    return {
+        "calls_succeeded": 0,
+        "retries": 0,
+        "retries_exhausted": 0,
+        "errors": Counter(),
+        "intervals": []
+    }
+
+
+def _iso(ts):
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _summarize(stats, since, until):
+    succeeded = stats["calls_succeeded"]
+    calls = succeeded + stats["retries_exhausted"]
+
+    open_seconds = 0.0
+    recoveries = []
+    intervals = []
+    for opened, closed in stats["intervals"]:
+        end = closed if closed is not None else until
+        if opened is not None and closed is not None:
+            recoveries.append(closed - opened)
+        start = opened if since is None or opened is None else max(opened, since)
+        if start is not None:
+            open_seconds += max(0.0, end - start)
+        intervals.append({
+            "opened": _iso(opened),
+            "closed": _iso(closed),
+            "seconds": round(end - start, 3) if start is not None else None
+        })
+
+    return {
+        "calls_succeeded": succeeded,
+        "retries": stats["retries"],
+        "retries_exhausted": stats["retries_exhausted"],
+        "retries_per_success": round(stats["retries"] / succeeded, 4) if succeeded else None,
+        "retry_amplification": round((calls + stats["retries"]) / calls, 4) if calls else None,
+        "errors": dict(stats["errors"].most_common()),
+        "breaker": {
+            "outages": len(intervals),
+            "open_seconds": round(open_seconds, 3),
+            "mttr": round(sum(recoveries) / len(recoveries), 3) if recoveries else None,
+            "intervals": intervals
+        }
+    }
+
+
+def build_report(events, since=None, until=None):
+    """
+    Aggregate (timestamp, service, event, error_type, retry_count) tuples.
+
+    A breaker is open from its OPEN event to the next CLOSED one
+    (HALF_OPEN probing included); MTTR is the mean of completed open
+    intervals. An interval still open at the end of the window counts up
+    to `until`, or to the last event when there is no `until`.
+    """
+    per_service = {}
+    open_since = {}
+    count = 0
+    last = since
+
+    for ts, service, event, error, _ in events:
+        count += 1
+        last = ts if last is None else max(last, ts)
+        stats = per_service.get(service)
+        if stats is None:
+            stats = per_service[service] = _new_service()
+
+        if event == "call_success":
+            stats["calls_succeeded"] += 1
+        elif event == "retry":
+            stats["retries"] += 1
+            stats["errors"][error] += 1
+        elif event == "retries_exhausted":
+            stats["retries_exhausted"] += 1
+        elif event == "error":
+            stats["errors"][error] += 1
+        elif event == "breaker_open":
+            open_since.setdefault(service, ts)
+        elif event == "breaker_closed":
+            # Opened before the window (or the oldest segment) if unseen
+            stats["intervals"].append((open_since.pop(service, since), ts))
+
+    for service, opened in open_since.items():
+        per_service[service]["intervals"].append((opened, None))
+
+    if until is None:
+        until = last if last is not None else time.time()
+
+    overall = _new_service()
+    for stats in per_service.values():
+        for key in ("calls_succeeded", "retries", "retries_exhausted"):
+            overall[key] += stats[key]
+        overall["errors"].update(stats["errors"])
+    overall = _summarize(overall, since, until)
+    del overall["breaker"]
+
+    return {
+        "window": {"since": _iso(since), "until": _iso(until)},
+        "events": count,
+        "overall": overall,
+        "services": {
+            service: _summarize(stats, since, until)
+            for service, stats in sorted(per_service.items())
+        }
+    }
+
+
+def parse_time(text, now=None):
+    """
+    ISO timestamp (UTC, like the log) or a relative age such as "30m",
+    "24h" or "7d" before now.
+    """
+    if text is None:
+        return None
+    match = _RELATIVE.match(text)
+    if match:
+        now = time.time() if now is None else now
+        return now - float(match.group(1)) * _UNITS[match.group(2)]
+    return parse_timestamp(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Log analytics over the JSON log")
+    parser.add_argument("command", nargs="?", default="report",
+                        choices=("report", "index", "compact"))
+    parser.add_argument("--log", default=LOG_FILE_PATH, help="live log file")
+    parser.add_argument("--index-dir", help="sidecar directory (default: LOG_ANALYTICS_CONFIG)")
+    parser.add_argument("--since", help="ISO timestamp (UTC) or age such as 24h")
+    parser.add_argument("--until", help="ISO timestamp (UTC) or age such as 1h")
+    parser.add_argument("--service", action="append", help="only this service (repeatable)")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args(argv)
+
+    analytics = LogAnalytics(args.log, args.index_dir)
+    started = time.perf_counter()
+    if args.command == "index":
+        result = {"segments": analytics.build_indexes()}
+    elif args.command == "compact":
+        result = {"compacted": analytics.compact()}
+    else:
+        result = analytics.report(parse_time(args.since), parse_time(args.until), args.service)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
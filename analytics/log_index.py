@@ -0,0 +1,241 @@
+# analytics/log_index.py
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+
+from analytics.events import EVENT_MARKERS, make_event, parse_timestamp, to_event
+
+FINGERPRINT_BYTES = 4096
+
+_MAGIC = b"LOGIDX1\n"
+_BLOCK = struct.Struct("<QQddQ")   # start, end, t_min, t_max, service mask
+_ALL_SERVICES = (1 << 64) - 1
+# Unanchored: a literal-prefix search is much faster than ^ with re.M,
+# and inside messages the quotes are escaped
+_TIMESTAMP = re.compile(rb'\{"timestamp": "([^"]+)"')
+_SERVICE = re.compile(rb'"service": "([^"\\]*)"')
+# LogRecord.to_json() field order; other lines go through json.loads
+_ENTRY = re.compile(
+    rb'\{"timestamp": "([^"]+)", "level": "([A-Z]+)", "service": "([^"\\]*)", '
+    rb'"message": "((?:[^"\\]|\\.)*)", "retry_count": (null|\d+)'
+)
+
+
+def fingerprint(path):
+    """
+    Content id of a log segment: a hash of its first FINGERPRINT_BYTES,
+    so it survives rotation renames and appends. None for shorter files,
+    which are cheap enough to scan without sidecars.
+    """
+    with open(path, "rb") as f:
+        head = f.read(FINGERPRINT_BYTES)
+    if len(head) < FINGERPRINT_BYTES:
+        return None
+    return hashlib.sha1(head).hexdigest()[:16]
+
+
+def log_segments(path):
+    """
+    The live log and its rotated backups, oldest first.
+    """
+    rotated = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        rotated.append(f"{path}.{index}")
+        index += 1
+    segments = rotated[::-1]
+    if os.path.exists(path):
+        segments.append(path)
+    return segments
+
+
+class LogIndex:
+    """
+    Sparse sidecar index of one JSONL log segment.
+
+    The file is cut into blocks of whole lines (about `block_size` bytes
+    each); per block the index keeps the byte range, the time range and a
+    bitmask of the services it mentions, so a query only reads blocks
+    that can match. Blocks are summarized with regexes over the mmapped
+    bytes, without decoding JSON. A growing file is extended from its last
+    block; a trailing partial line is left for the next update.
+    """
+
+    def __init__(self, block_size=1 << 20):
+        self.block_size = block_size
+        self.services = []
+        self.blocks = []
+        self.size = 0
+
+    # ---- persistence --------------------------------------------------
+
+    @classmethod
+    def load(cls, path, block_size=1 << 20):
+        index = cls(block_size)
+        try:
+            with open(path, "rb") as f:
+                if f.readline() != _MAGIC:
+                    return index
+                header = json.loads(f.readline())
+                data = f.read()
+        except (OSError, ValueError):
+            return index
+
+        if header.get("block_size") != block_size:
+            return index
+        index.services = header["services"]
+        index.size = header["size"]
+        index.blocks = [list(entry) for entry in _BLOCK.iter_unpack(data)]
+        return index
+
+    def save(self, path):
+        header = {"block_size": self.block_size, "size": self.size, "services": self.services}
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(json.dumps(header).encode() + b"\n")
+            for block in self.blocks:
+                f.write(_BLOCK.pack(*block))
+        os.replace(tmp, path)
+
+    # ---- building -----------------------------------------------------
+
+    def _service_bit(self, name):
+        if name not in self.services:
+            self.services.append(name)
+        position = self.services.index(name)
+        # Past 64 services a block is simply read for every query
+        return 1 << position if position < 64 else _ALL_SERVICES
+
+    def update(self, data):
+        """
+        Index everything in `data` (the segment's bytes, e.g. an mmap)
+        past the last complete block. Returns True if anything changed.
+        """
+        if len(data) < self.size:
+            # Truncated or replaced: start over
+            self.services, self.blocks, self.size = [], [], 0
+
+        before = (self.size, len(self.services))
+        # The last block may have grown since: redo it
+        start = self.blocks.pop()[0] if self.blocks else 0
+        while start < len(data):
+            end = data.find(b"\n", start + self.block_size) + 1
+            if end <= 0:
+                end = data.rfind(b"\n", start) + 1
+                if end <= start:
+                    break
+
+            chunk = data[start:end]
+            stamps = _TIMESTAMP.findall(chunk)
+            if stamps:
+                # ISO timestamps order lexically
+                t_min = parse_timestamp(min(stamps).decode())
+                t_max = parse_timestamp(max(stamps).decode())
+            else:
+                t_min, t_max = 0.0, float("inf")
+            mask = 0
+            for name in set(_SERVICE.findall(chunk)):
+                mask |= self._service_bit(name.decode())
+
+            self.blocks.append([start, end, t_min, t_max, mask])
+            start = end
+
+        self.size = self.blocks[-1][1] if self.blocks else 0
+        return (self.size, len(self.services)) != before
+
+    # ---- queries ------------------------------------------------------
+
+    def select(self, since=None, until=None, services=None):
+        """
+        Byte ranges of the blocks that may hold matching lines.
+        """
+        wanted = _ALL_SERVICES
+        if services is not None:
+            wanted = 0
+            for name in services:
+                if name in self.services:
+                    position = self.services.index(name)
+                    wanted |= 1 << position if position < 64 else _ALL_SERVICES
+
+        for start, end, t_min, t_max, mask in self.blocks:
+            if since is not None and t_max < since:
+                continue
+            if until is not None and t_min > until:
+                continue
+            if not mask & wanted:
+                continue
+            yield start, end
+
+
+def _scan_block(chunk, since, until, services):
+    previous = -1
+    for match in EVENT_MARKERS.finditer(chunk):
+        line_start = chunk.rfind(b"\n", 0, match.start()) + 1
+        if line_start == previous:
+            continue
+        previous = line_start
+        line_end = chunk.find(b"\n", match.end())
+        if line_end < 0:
+            line_end = len(chunk)
+
+        fields = _ENTRY.match(chunk, line_start, line_end)
+        try:
+            if fields is not None:
+                timestamp, level, service, message, retry_count = fields.groups()
+                event = make_event(
+                    timestamp.decode(), level.decode(), service.decode(), message.decode(),
+                    None if retry_count == b"null" else int(retry_count)
+                )
+            else:
+                event = to_event(json.loads(chunk[line_start:line_end]))
+        except (ValueError, KeyError):
+            continue
+        if event is None:
+            continue
+        if since is not None and event[0] < since:
+            continue
+        if until is not None and event[0] > until:
+            continue
+        if services is not None and event[1] not in services:
+            continue
+        yield event
+
+
+def scan_segment(path, index_dir=None, since=None, until=None, services=None,
+                 block_size=1 << 20):
+    """
+    Yield (timestamp, service, event, error_type, retry_count) for every
+    event in a JSONL segment, reading it through mmap and skipping blocks
+    its sidecar index (`index_dir`/<fingerprint>.idx) rules out.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            index = load_index(path, data, index_dir, block_size)
+            for start, end in index.select(since, until, services):
+                yield from _scan_block(data[start:end], since, until, services)
+
+
+def index_path(path, index_dir):
+    key = fingerprint(path)
+    if key is None or index_dir is None:
+        return None
+    return os.path.join(index_dir, f"{key}.idx")
+
+
+def load_index(path, data, index_dir=None, block_size=1 << 20):
+    """
+    The segment's sidecar index, brought up to date with `data`.
+    """
+    sidecar = index_path(path, index_dir)
+    index = LogIndex.load(sidecar, block_size) if sidecar else LogIndex(block_size)
+    if index.update(data) and sidecar:
+        os.makedirs(index_dir, exist_ok=True)
+        index.save(sidecar)
+    return index
@@ -0,0 +1,155 @@
+# bench/mock_service.py
+
+import asyncio
+import math
+import random
+
+from clock.clock import current_clock
+from errors.exceptions import TransientServiceError, PermanentServiceError, RateLimitError
+
+ERROR_TYPES = {
+    "timeout": (TransientServiceError, "timeout occurred"),
+    "server": (TransientServiceError, "503 Service Unavailable"),
+    "auth": (PermanentServiceError, "authentication failed")
+}
+
+
+def sample_latency(spec, rng):
+    """
+    Draw one latency (seconds) from a distribution spec such as
+    {"dist": "lognormal", "median": 0.2, "sigma": 0.5}.
+    """
+    dist = spec.get("dist", "constant")
+    if dist == "constant":
+        return spec.get("value", 0.0)
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"])
+    if dist == "exponential":
+        return rng.expovariate(1.0 / spec["mean"])
+    if dist == "lognormal":
+        return rng.lognormvariate(math.log(spec["median"]), spec.get("sigma", 0.5))
+    raise ValueError(f"Unknown latency distribution: {dist}")
+
+
+class ConfigurableMockService:
+    """
+    TTS-shaped mock with a latency model, per-error-type rates and a
+    scripted outage timeline.
+
+    `timeline` is a list of phases, each
+        {"start": s, "end": s, "errors": {"server": 1.0}, "latency": {...}}
+    with times in seconds since start(). Inside a phase its error rates
+    and latency replace the defaults.
+
+    `quota` ({"requests_per_second": n}) rejects requests beyond n per
+    one-second window with RateLimitError, whose retry_after points at
+    the start of the next window.
+    """
+
+    def __init__(self, name="MockTTS", latency=None, errors=None, timeline=None, seed=None,
+                 quota=None):
+        self.name = name
+        self.latency = latency or {"dist": "constant", "value": 0.0}
+        self.errors = errors or {}
+        self.timeline = sorted(timeline or [], key=lambda phase: phase["start"])
+        self.voice_id = "bench"
+        self.model_id = "bench"
+        self.quota = quota
+
+        self._quota_window = None
+        self._quota_used = 0
+
+        self._rng = random.Random(seed)
+        self._started = None
+
+        self.attempts = 0
+        self.attempts_by_text = {}
+        self.failures = 0
+        self.throttled = 0
+
+    def start(self):
+        self._started = current_clock.monotonic()
+
+    def elapsed(self):
+        if self._started is None:
+            self.start()
+        return current_clock.monotonic() - self._started
+
+    def _phase(self):
+        now = self.elapsed()
+        for phase in self.timeline:
+            if phase["start"] <= now < phase["end"]:
+                return phase
+        return None
+
+    def _plan(self):
+        """
+        Decide latency and outcome for one request.
+        """
+        phase = self._phase()
+        latency_spec = (phase or {}).get("latency", self.latency)
+        errors = (phase or {}).get("errors", self.errors)
+
+        latency = sample_latency(latency_spec, self._rng)
+        roll = self._rng.random()
+        for error_type, rate in errors.items():
+            if roll < rate:
+                return latency, error_type
+            roll -= rate
+        return latency, None
+
+    def _count(self, text):
+        self.attempts += 1
+        self.attempts_by_text[text] = self.attempts_by_text.get(text, 0) + 1
+
+    def _check_quota(self):
+        if self.quota is None:
+            return
+        now = self.elapsed()
+        window = int(now)
+        if window != self._quota_window:
+            self._quota_window, self._quota_used = window, 0
+        self._quota_used += 1
+        if self._quota_used > self.quota["requests_per_second"]:
+            self.throttled += 1
+            raise RateLimitError(
+                f"{self.name} 429 Too Many Requests",
+                service_name=self.name,
+                retry_after=window + 1 - now
+            )
+
+    def _raise(self, error_type):
+        error_class, message = ERROR_TYPES[error_type]
+        raise error_class(f"{self.name} {message}", service_name=self.name)
+
+    @property
+    def fail_mode(self):
+        phase = self._phase()
+        return bool(phase and phase.get("errors"))
+
+    def text_to_speech(self, text):
+        self._count(text)
+        self._check_quota()
+        latency, error_type = self._plan()
+        if latency:
+            current_clock.sleep(latency)
+        if error_type:
+            self.failures += 1
+            self._raise(error_type)
+        return b"bench-audio"
+
+    async def text_to_speech_async(self, text):
+        self._count(text)
+        self._check_quota()
+        latency, error_type = self._plan()
+        if latency:
+            await asyncio.sleep(latency)
+        if error_type:
+            self.failures += 1
+            self._raise(error_type)
+        return b"bench-audio"
+
+    def health_check(self):
+        _, error_type = self._plan()
+        if error_type:
+            self._raise(error_type)
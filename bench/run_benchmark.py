@@ -0,0 +1,372 @@
+# bench/run_benchmark.py
+#
+# Usage:
+#   python -m bench.run_benchmark --scenario outage --calls 20000 \
+#       --concurrency 100 --output bench_results.json
+
+import argparse
+import functools
+import json
+import subprocess
+import time
+from datetime import datetime
+
+from clock.clock import VirtualClock, current_clock, set_clock
+from config import (
+    RETRY_CONFIG, RETRY_BUDGET_CONFIG, CIRCUIT_BREAKER_CONFIG, CONCURRENCY_LIMIT_CONFIG
+)
+from bench.mock_service import ConfigurableMockService
+from bench.scenarios import SCENARIOS
+from call_queue_module.call_queue import CallQueue, PRIORITY_COLD
+from circuit_breaker.circuit_breaker import CircuitBreaker
+from circuit_breaker.concurrency_limiter import AdaptiveConcurrencyLimiter
+from engine.call_engine import CallEngine
+from engine.process_pool import ProcessCallPool
+from retry.rate_limiter import RateLimiter
+from retry.retry_budget import RetryBudget
+from retry.retry_handler import RetryHandler
+from alerts.alert_manager import get_aggregator
+from logs import log_manager
+from logs.logger import get_writer, flush as flush_logs
+from metrics.instruments import LIMITER_REJECTED
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index], 6)
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class _Overhead:
+    """
+    Wraps every registered log sink and the alert aggregator to measure
+    how much caller time logging and alerting take during a run.
+    """
+
+    def __init__(self):
+        self.log_events = 0
+        self.log_seconds = 0.0
+        self.alerts = 0
+        self.alert_seconds = 0.0
+        self._sinks = {}
+        self._submit = None
+
+    def install(self):
+        for sink in log_manager.get_sinks().values():
+            self._sinks[sink] = sink.write
+            sink.write = self._timed_sink(sink.write)
+
+        aggregator = get_aggregator()
+        self._submit = aggregator.submit
+
+        def timed_submit(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return self._submit(*args, **kwargs)
+            finally:
+                self.alerts += 1
+                self.alert_seconds += time.perf_counter() - started
+        aggregator.submit = timed_submit
+
+    def _timed_sink(self, write):
+        def timed(record):
+            started = time.perf_counter()
+            try:
+                write(record)
+            finally:
+                self.log_events += 1
+                self.log_seconds += time.perf_counter() - started
+        return timed
+
+    def uninstall(self):
+        for sink, write in self._sinks.items():
+            sink.write = write
+        if self._submit is not None:
+            del get_aggregator().submit
+
+    def report(self):
+        return {
+            "log_sink_writes": self.log_events,
+            "log_sink_seconds": round(self.log_seconds, 6),
+            "log_us_per_write": round(1e6 * self.log_seconds / self.log_events, 3) if self.log_events else None,
+            "alerts_submitted": self.alerts,
+            "alert_seconds": round(self.alert_seconds, 6)
+        }
+
+
+def _breaker_report(transitions, timeline):
+    """
+    Time-to-trip / time-to-recover relative to each scripted outage phase.
+    """
+    phases = []
+    for phase in timeline:
+        if not phase.get("errors"):
+            continue
+        trip = next(
+            (t for state, t in transitions if state == "OPEN" and t >= phase["start"]), None
+        )
+        recover = next(
+            (t for state, t in transitions if state == "CLOSED" and t >= phase["end"]), None
+        )
+        phases.append({
+            "start": phase["start"],
+            "end": phase["end"],
+            "time_to_trip": round(trip - phase["start"], 6) if trip is not None else None,
+            "time_to_recover": round(recover - phase["end"], 6) if recover is not None else None
+        })
+
+    open_seconds = 0.0
+    opened_at = None
+    for state, t in transitions:
+        if state == "OPEN" and opened_at is None:
+            opened_at = t
+        elif state == "CLOSED" and opened_at is not None:
+            open_seconds += t - opened_at
+            opened_at = None
+
+    return {
+        "transitions": [{"state": state, "at": round(t, 6)} for state, t in transitions],
+        "open_seconds": round(open_seconds, 6),
+        "outages": phases
+    }
+
+
+def _build_queue(calls, arrival_rate):
+    """
+    Closed loop (everything ready at once) or open loop: contact i becomes
+    ready at i / arrival_rate seconds, so the run spans the whole timeline
+    even while the breaker is shedding load.
+    """
+    contacts = [f"Contact-{i}" for i in range(calls)]
+    if not arrival_rate:
+        return CallQueue(contacts)
+    queue = CallQueue()
+    base = current_clock.time()
+    for i, contact in enumerate(contacts):
+        queue.push(contact, not_before=base + i / arrival_rate)
+    return queue
+
+
+def run_scenario(name, calls=None, concurrency=None, arrival_rate=None, seed=1,
+                 virtual_time=None):
+    scenario = SCENARIOS[name]
+    if virtual_time is None:
+        virtual_time = scenario.get("virtual_time", False)
+
+    previous_clock = set_clock(VirtualClock()) if virtual_time else None
+    try:
+        return _run_scenario(name, scenario, calls, concurrency, arrival_rate, seed, virtual_time)
+    finally:
+        if previous_clock is not None:
+            set_clock(previous_clock)
+
+
+def _run_scenario(name, scenario, calls, concurrency, arrival_rate, seed, virtual_time):
+    calls = calls or scenario["calls"]
+    concurrency = concurrency or scenario["concurrency"]
+    arrival_rate = arrival_rate or scenario.get("arrival_rate")
+
+    service = ConfigurableMockService(seed=seed, **scenario["service"])
+    limit_config = {**CONCURRENCY_LIMIT_CONFIG, **scenario.get("concurrency_limit", {})}
+    limiter = None
+    if limit_config.pop("enabled"):
+        limiter = AdaptiveConcurrencyLimiter(service.name, **limit_config)
+    shed_before = LIMITER_REJECTED.labels(service.name).value
+    retry_handler = RetryHandler(
+        **{**RETRY_CONFIG, **scenario.get("retry", {})},
+        retry_budget=RetryBudget(**RETRY_BUDGET_CONFIG),
+        concurrency_limiter=limiter,
+        rate_limiter=RateLimiter(**scenario["rate_limit"]) if "rate_limit" in scenario else None
+    )
+    breaker = CircuitBreaker(
+        service.name, **{**CIRCUIT_BREAKER_CONFIG, **scenario.get("circuit_breaker", {})}
+    )
+
+    transitions = []
+    breaker.add_listener(lambda _, state, __: transitions.append((state, service.elapsed())))
+
+    latencies = []
+    outcomes = {"succeeded": 0, "failed": 0, "skipped": 0}
+    failed_contacts = []
+
+    def on_complete(contact, outcome, duration):
+        outcomes[outcome] += 1
+        if outcome == "succeeded":
+            latencies.append(duration)
+        elif outcome == "failed":
+            failed_contacts.append(contact)
+
+    service.start()
+    engine = CallEngine(
+        _build_queue(calls, arrival_rate),
+        service,
+        retry_handler,
+        breaker,
+        service_name=service.name,
+        concurrency=concurrency,
+        on_complete=on_complete
+    )
+
+    overhead = _Overhead()
+    overhead.install()
+    wall_started = time.perf_counter()
+    try:
+        stats = current_clock.run(engine.run())
+    finally:
+        overhead.uninstall()
+    wall_seconds = time.perf_counter() - wall_started
+
+    attempted = len(service.attempts_by_text)
+    retries = service.attempts - attempted
+    wasted = sum(
+        service.attempts_by_text.get(f"Hello {contact}", 1) - 1 for contact in failed_contacts
+    )
+    latencies.sort()
+
+    return {
+        "scenario": name,
+        "description": scenario["description"],
+        "calls": calls,
+        "concurrency": concurrency,
+        "arrival_rate": arrival_rate,
+        "virtual_time": virtual_time,
+        "elapsed": stats["elapsed"],
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput": stats["calls_per_second"],
+        "outcomes": outcomes,
+        "latency": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": round(latencies[-1], 6) if latencies else None
+        },
+        "retries": {
+            "provider_attempts": service.attempts,
+            "retries": retries,
+            "wasted_retries": wasted,
+            "throttled": service.throttled,
+            "retry_amplification": round(service.attempts / attempted, 4) if attempted else None
+        },
+        "breaker": _breaker_report(transitions, service.timeline),
+        "concurrency_limit": {
+            "algorithm": limiter.algorithm,
+            "final_limit": limiter.limit,
+            "shed": int(LIMITER_REJECTED.labels(service.name).value - shed_before)
+        } if limiter is not None else None,
+        "overhead": overhead.report()
+    }
+
+
+def _paced_contacts(calls, arrival_rate):
+    """
+    Contacts for a pooled run; with an arrival rate each carries its
+    "not before" time, as in _build_queue.
+    """
+    base = time.time()
+    for i in range(calls):
+        if arrival_rate:
+            yield f"Contact-{i}", PRIORITY_COLD, base + i / arrival_rate
+        else:
+            yield f"Contact-{i}"
+
+
+def run_pooled(name, calls=None, concurrency=None, arrival_rate=None, processes=2, seed=1):
+    """
+    Run spread across worker processes with a shared breaker; open loop
+    at the scenario's arrival rate like run_scenario(). Reports throughput
+    and outcomes overall and per process: per-call detail stays in the
+    workers.
+    """
+    scenario = SCENARIOS[name]
+    calls = calls or scenario["calls"]
+    concurrency = concurrency or scenario["concurrency"]
+    arrival_rate = arrival_rate or scenario.get("arrival_rate")
+
+    pool = ProcessCallPool(
+        functools.partial(ConfigurableMockService, seed=seed, **scenario["service"]),
+        service_name="MockTTS",
+        processes=processes,
+        concurrency=max(1, concurrency // processes),
+        retry_config={**RETRY_CONFIG, **scenario.get("retry", {})},
+        breaker_config={**CIRCUIT_BREAKER_CONFIG, **scenario.get("circuit_breaker", {})}
+    )
+    stats = pool.run(_paced_contacts(calls, arrival_rate))
+
+    timeline_end = max((phase["end"] for phase in scenario["service"].get("timeline", ())), default=0)
+    if stats["elapsed"] < timeline_end:
+        log_manager.log_event(
+            "WARNING",
+            "bench",
+            f"Pooled {name} run ended after {stats['elapsed']}s, before its scripted "
+            f"timeline ({timeline_end}s): raise --calls to exercise it"
+        )
+    keys = ("succeeded", "failed", "skipped")
+    return {
+        "scenario": name,
+        "description": scenario["description"],
+        "calls": calls,
+        "concurrency": concurrency,
+        "arrival_rate": arrival_rate,
+        "processes": stats["processes"],
+        "elapsed": stats["elapsed"],
+        "throughput": stats["calls_per_second"],
+        "timeline_covered": stats["elapsed"] >= timeline_end,
+        "outcomes": {key: stats[key] for key in keys},
+        "per_process": [
+            {key: worker[key] for key in keys} for worker in stats["per_process"]
+        ]
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resilience load test / benchmark")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default: all)")
+    parser.add_argument("--calls", type=int, help="override number of calls")
+    parser.add_argument("--concurrency", type=int, help="override concurrency")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="shard calls across this many worker processes")
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate (calls/s)")
+    parser.add_argument("--virtual-time", action="store_true", default=None,
+                        help="run on a virtual clock (default: per scenario)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", help="free-form label stored in the output")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    # Console logging would dominate the measurement
+    get_writer().console = "off"
+
+    results = {
+        "label": args.label,
+        "revision": _git_revision(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "results": [
+            run_pooled(name, args.calls, args.concurrency, args.rate, args.processes, args.seed)
+            if args.processes > 1 else
+            run_scenario(name, args.calls, args.concurrency, args.rate, args.seed, args.virtual_time)
+            for name in (args.scenario or sorted(SCENARIOS))
+        ]
+    }
+    flush_logs()
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return results
+
+
+if __name__ == "__main__":
+    main()
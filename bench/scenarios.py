@@ -0,0 +1,88 @@
+# bench/scenarios.py
+
+# Fast retry/breaker settings so scenarios finish in seconds
+_FAST_RETRY = {"initial_delay": 0.01, "max_delay": 0.2}
+_FAST_BREAKER = {"recovery_timeout": 0.5, "ramp_up_duration": 0.5, "window_size": 50}
+
+SCENARIOS = {
+    "steady": {
+        "description": "Healthy provider, lognormal latency, 1% transient errors",
+        "calls": 5000,
+        "concurrency": 100,
+        "service": {
+            "latency": {"dist": "lognormal", "median": 0.02, "sigma": 0.5},
+            "errors": {"server": 0.01}
+        },
+        "retry": _FAST_RETRY,
+        "circuit_breaker": _FAST_BREAKER
+    },
+    "brownout": {
+        "description": "Latency x10 and 30% errors between 1s and 3s",
+        "calls": 20000,
+        "concurrency": 200,
+        "arrival_rate": 5000,
+        "service": {
+            "latency": {"dist": "lognormal", "median": 0.02, "sigma": 0.5},
+            "errors": {"server": 0.01},
+            "timeline": [
+                {
+                    "start": 1.0, "end": 3.0,
+                    "latency": {"dist": "lognormal", "median": 0.2, "sigma": 0.8},
+                    "errors": {"server": 0.2, "timeout": 0.1}
+                }
+            ]
+        },
+        "retry": _FAST_RETRY,
+        "circuit_breaker": _FAST_BREAKER
+    },
+    "outage": {
+        "description": "Hard outage (every request fails) between 1s and 2.5s",
+        "calls": 20000,
+        "concurrency": 200,
+        "arrival_rate": 5000,
+        "service": {
+            "latency": {"dist": "uniform", "low": 0.01, "high": 0.03},
+            "timeline": [
+                {
+                    "start": 1.0, "end": 2.5,
+                    "latency": {"dist": "constant", "value": 0.005},
+                    "errors": {"server": 1.0}
+                }
+            ]
+        },
+        "retry": _FAST_RETRY,
+        "circuit_breaker": _FAST_BREAKER
+    },
+    "quota": {
+        "description": "Provider quota of 1000 req/s (429 + Retry-After) under 1500 calls/s",
+        "calls": 6000,
+        "concurrency": 200,
+        "arrival_rate": 1500,
+        "service": {
+            "latency": {"dist": "lognormal", "median": 0.02, "sigma": 0.5},
+            "quota": {"requests_per_second": 1000}
+        },
+        "retry": {**_FAST_RETRY, "max_delay": 2},
+        "circuit_breaker": _FAST_BREAKER,
+        "rate_limit": {"requests_per_second": 1000, "burst": 20}
+    },
+    "outage_100k": {
+        "description": "100k calls over ~100 virtual seconds with a 30-second hard "
+                       "outage, using the production retry/breaker settings",
+        "calls": 100000,
+        "concurrency": 500,
+        "arrival_rate": 1000,
+        "virtual_time": True,
+        "service": {
+            "latency": {"dist": "lognormal", "median": 0.3, "sigma": 0.5},
+            "errors": {"server": 0.01},
+            "timeline": [
+                {
+                    "start": 30.0, "end": 60.0,
+                    "latency": {"dist": "constant", "value": 0.05},
+                    "errors": {"server": 1.0}
+                }
+            ]
+        }
+    }
+}
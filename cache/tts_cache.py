@@ -0,0 +1,352 @@
+# cache/tts_cache.py
+
+import asyncio
+import atexit
+import hashlib
+import mmap
+import os
+import queue
+import string
+import threading
+from collections import OrderedDict
+
+from clock.clock import current_clock
+from errors.exceptions import BaseServiceError
+from logs.log_manager import log_event
+
+
+def cache_key(text, voice, model):
+    """
+    Content address for a piece of synthesized audio.
+    """
+    digest = hashlib.sha256()
+    for part in (voice, model, text):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def produced_by(audio, voice, model):
+    """
+    (voice, model) of the provider that synthesized `audio` when it says
+    so (services.tts_chain.SynthesizedAudio), else the given ones.
+    """
+    return (
+        getattr(audio, "voice_id", voice),
+        getattr(audio, "model_id", model)
+    )
+
+
+def template_static_parts(template):
+    """
+    Literal segments of a str.format template, e.g.
+    "Hello {name}, thanks for calling" -> ["Hello", ", thanks for calling"].
+    """
+    return [
+        literal.strip()
+        for literal, _, _, _ in string.Formatter().parse(template)
+        if literal.strip()
+    ]
+
+
+class TTSCache:
+    """
+    Two-tier content-addressed cache for synthesized audio.
+
+    - memory: LRU bounded by `memory_bytes`
+    - disk: one file per key under `disk_path`, bounded by `disk_bytes`,
+      read back through mmap so hits are not copied into Python memory
+
+    Entries older than `ttl` seconds (on `clock`, the process clock by
+    default) are treated as misses in both tiers.
+    Lookups return a bytes-like object (bytes or a memoryview over mmap).
+
+    The lock only guards the in-memory structures; file I/O happens
+    outside it. put() stores in memory and hands the disk write to a
+    background writer thread (dropped if `write_queue_size` writes are
+    already waiting), and get_async() maps disk hits in a worker thread,
+    so the event loop only ever touches the memory tier.
+    """
+
+    def __init__(self, disk_path=None, memory_bytes=64 * 1024 * 1024,
+                 disk_bytes=1024 * 1024 * 1024, ttl=7 * 24 * 3600,
+                 write_queue_size=1000, clock=None):
+        self.disk_path = disk_path
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.ttl = ttl
+        self.clock = clock or current_clock
+
+        self.stats = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0,
+            "writes_dropped": 0
+        }
+
+        self._memory = OrderedDict()   # key -> (stored_at, audio)
+        self._memory_size = 0
+        self._disk = OrderedDict()     # key -> (stored_at, size), oldest access first
+        self._disk_size = 0
+        self._lock = threading.Lock()
+
+        self._writes = queue.Queue(maxsize=write_queue_size)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+            self._load_disk_index()
+            atexit.register(self.flush)
+
+    # ---- disk index ---------------------------------------------------
+
+    def _path(self, key):
+        return os.path.join(self.disk_path, f"{key}.audio")
+
+    def _load_disk_index(self):
+        entries = []
+        for item in os.scandir(self.disk_path):
+            if item.name.endswith(".audio") and item.is_file():
+                stat = item.stat()
+                entries.append((stat.st_mtime, item.name[:-6], stat.st_size))
+        for mtime, key, size in sorted(entries):
+            self._disk[key] = (mtime, size)
+            self._disk_size += size
+
+    # ---- lookups ------------------------------------------------------
+
+    def _expired(self, stored_at, now):
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, text, voice="default", model="default"):
+        key = cache_key(text, voice, model)
+        audio = self._get_memory(key)
+        if audio is None and self._on_disk(key):
+            audio = self._get_disk(key)
+        return self._counted(audio)
+
+    async def get_async(self, text, voice="default", model="default"):
+        """
+        get() for the event loop: disk hits are mapped in a worker thread.
+        """
+        key = cache_key(text, voice, model)
+        audio = self._get_memory(key)
+        if audio is None and self._on_disk(key):
+            audio = await asyncio.to_thread(self._get_disk, key)
+        return self._counted(audio)
+
+    def _counted(self, audio):
+        if audio is None:
+            with self._lock:
+                self.stats["misses"] += 1
+        return audio
+
+    def _get_memory(self, key):
+        now = self.clock.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is None:
+                return None
+            if self._expired(hit[0], now):
+                self._drop_memory(key)
+                return None
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return hit[1]
+
+    def _on_disk(self, key):
+        return bool(self.disk_path) and key in self._disk
+
+    def _get_disk(self, key):
+        now = self.clock.time()
+        with self._lock:
+            entry = self._disk.get(key)
+            if entry is None:
+                return None
+            stored_at = entry[0]
+            if self._expired(stored_at, now):
+                self._forget_disk(key)
+                entry = None
+        if entry is None:
+            self._remove(key)
+            return None
+
+        audio = self._map(key)
+        with self._lock:
+            if audio is None:
+                self._forget_disk(key)
+                return None
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._remember(key, stored_at, audio)
+            self.stats["disk_hits"] += 1
+            return audio
+
+    def _map(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b""
+                # The mapping stays valid after the file is closed
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except OSError:
+            return None
+
+    # ---- stores -------------------------------------------------------
+
+    def put(self, text, audio, voice="default", model="default"):
+        if isinstance(audio, str):
+            audio = audio.encode("utf-8")
+        audio = bytes(audio)
+        key = cache_key(text, voice, model)
+        now = self.clock.time()
+
+        with self._lock:
+            self._remember(key, now, audio)
+        if self.disk_path:
+            self._submit_write(key, now, audio)
+
+    def _remember(self, key, stored_at, audio):
+        if key in self._memory:
+            self._drop_memory(key)
+        size = len(audio)
+        if size > self.memory_bytes:
+            return
+        self._memory[key] = (stored_at, audio)
+        self._memory_size += size
+        while self._memory_size > self.memory_bytes:
+            oldest = next(iter(self._memory))
+            self._drop_memory(oldest)
+            self.stats["evictions"] += 1
+
+    def _drop_memory(self, key):
+        _, audio = self._memory.pop(key)
+        self._memory_size -= len(audio)
+
+    def _forget_disk(self, key):
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_size -= entry[1]
+
+    def _remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    # ---- disk writer --------------------------------------------------
+
+    def _submit_write(self, key, stored_at, audio):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="tts-cache-writer", daemon=True
+                )
+                self._writer.start()
+        try:
+            self._writes.put_nowait((key, stored_at, audio))
+        except queue.Full:
+            # Still cached in memory; the disk copy is only an optimization
+            with self._lock:
+                self.stats["writes_dropped"] += 1
+
+    def flush(self, timeout=5.0):
+        """
+        Block until every disk write submitted so far is done.
+        """
+        if self._writer is None or not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._writes.put(done)
+        done.wait(timeout)
+
+    def _run_writer(self):
+        while True:
+            item = self._writes.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            self._write_disk(*item)
+
+    def _write_disk(self, key, stored_at, audio):
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except OSError as e:
+            log_event("WARNING", "TTSCache", "Disk cache write failed: %s", args=(e,))
+            return
+
+        evicted = []
+        with self._lock:
+            self._forget_disk(key)
+            self._disk[key] = (stored_at, len(audio))
+            self._disk_size += len(audio)
+            while self._disk_size > self.disk_bytes and self._disk:
+                oldest = next(iter(self._disk))
+                self._forget_disk(oldest)
+                evicted.append(oldest)
+                self.stats["evictions"] += 1
+        for oldest in evicted:
+            self._remove(oldest)
+
+    # ---- helpers ------------------------------------------------------
+
+    def bind(self, service):
+        """
+        Stage cache for a TTS service, keyed with its voice and model.
+        """
+        return BoundTTSCache(self, service)
+
+    def prerender(self, synthesize, phrases, voice="default", model="default"):
+        """
+        Synthesize and store any phrase not already cached. Best effort:
+        failures are logged and skipped. Returns the number rendered.
+        """
+        rendered = 0
+        for text in phrases:
+            if self.get(text, voice, model) is not None:
+                continue
+            try:
+                audio = synthesize(text)
+            except BaseServiceError as e:
+                log_event("WARNING", "TTSCache", "Pre-render of %r failed: %s", args=(text, e))
+                continue
+            self.put(text, audio, *produced_by(audio, voice, model))
+            rendered += 1
+        return rendered
+
+
+class BoundTTSCache:
+    """
+    Adapter used by engine.pipeline.Stage(cache=...): lookup/store take
+    the same positional args as text_to_speech(text).
+    """
+
+    def __init__(self, cache, service):
+        self.cache = cache
+        self.service = service
+
+    def _voice_model(self):
+        return (
+            getattr(self.service, "voice_id", "default"),
+            getattr(self.service, "model_id", "default")
+        )
+
+    async def lookup(self, text):
+        voice, model = self._voice_model()
+        return await self.cache.get_async(text, voice, model)
+
+    def store(self, result, text):
+        # Fallback audio (another provider's voice) is stored under that
+        # voice, where lookups for this service will not find it
+        self.cache.put(text, result, *produced_by(result, *self._voice_model()))
+
+    def prerender(self, phrases):
+        # Straight from the primary provider (services.tts_chain), so
+        # start-up rendering never feeds breakers or alerts; whatever
+        # fails is left to live calls
+        service = getattr(self.service, "primary", self.service)
+        voice, model = self._voice_model()
+        return self.cache.prerender(service.text_to_speech, phrases, voice, model)
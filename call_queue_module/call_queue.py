@@ -1,24 +1,250 @@
 # call_queue_module/call_queue.py
 
+import bisect
+import itertools
+from collections import deque
+
+from clock.clock import current_clock
+from config import CALL_QUEUE_CONFIG
 from logs.log_manager import log_event
+from call_queue_module.contact_source import iter_contacts
+from call_queue_module.timing_wheel import TimingWheel
+from tracing.tracer import span
+
+# Lower value = dialed first
+PRIORITY_CALLBACK = 0
+PRIORITY_COLD = 10
 
 
 class CallQueue:
-    def __init__(self, contacts):
-        self.queue = contacts
+    """
+    Priority call queue.
+
+    Ready contacts live in one FIFO deque per priority level, so push and
+    pop are O(1) for the handful of levels a campaign uses. Contacts with
+    a "not before" time wait in a hierarchical timing wheel (O(1) to
+    schedule or release early, see `release`) until they are due. An optional
+    `source` iterator of (contact, priority, not_before) tuples is pulled
+    lazily, at most `buffer_size` contacts at a time, so memory stays flat
+    for arbitrarily large campaigns. The buffer counts ready contacts and
+    source contacts not yet due; callbacks scheduled with push() do not
+    hold back the source, however many are waiting.
+
+    With a `checkpoint` (call_queue_module.checkpoint.CallCheckpoint) every
+    enqueue, dispatch and outcome goes to its write-ahead log, and the
+    queue starts from the recovered state: queued contacts are restored,
+    `contacts`/`source` are read from where the last run stopped, and
+    calls in flight at a crash are never redialed.
+    """
+
+    def __init__(self, contacts=None, source=None, buffer_size=None, clock=None,
+                 checkpoint=None):
+        self.buffer_size = buffer_size or CALL_QUEUE_CONFIG["buffer_size"]
+        self.clock = clock or current_clock
+
+        self._ready = {}          # priority -> deque of (entry_id, contact)
+        self._priorities = []     # sorted priority levels present in _ready
+        self._ready_count = 0
+        # (priority, entry_id, contact, from_source) by not_before
+        self._scheduled = TimingWheel(
+            tick=CALL_QUEUE_CONFIG["schedule_tick"], now=self.clock.time()
+        )
+        self._source_scheduled = 0  # source contacts waiting in the wheel
+        self._source = None
+        self._source_tell = None
+        self.checkpoint = checkpoint
+
+        if checkpoint is not None:
+            self._resume(contacts, source)
+            return
+
+        if source is not None:
+            self._set_source(source)
+        for contact in contacts or ():
+            self.push(contact)
+
+    def _set_source(self, source):
+        # Seekable sources (contact_source.ContactFile) report their byte
+        # position, so a checkpoint can resume them without re-reading
+        self._source_tell = getattr(source, "tell", None)
+        self._source = iter(source)
+
+    def _resume(self, contacts, source):
+        entries, source_offset, source_position = self.checkpoint.recover()
+        for entry_id, contact, priority, not_before in entries:
+            self._push(contact, priority, not_before, entry_id)
+
+        # Fixed contact lists are read like a source so the offset applies
+        if contacts:
+            source = ((contact, PRIORITY_COLD, None) for contact in contacts)
+        if source is None:
+            return
+
+        if source_position is not None and hasattr(source, "seek"):
+            source.seek(source_position)
+            self._set_source(source)
+            return
+        # Not seekable: skip the contacts already read
+        self._set_source(source)
+        if source_offset:
+            self._source = itertools.islice(self._source, source_offset, None)
+
+    @classmethod
+    def from_file(cls, path, contact_field="contact", buffer_size=None, clock=None,
+                  checkpoint=None):
+        """
+        Stream contacts from a CSV or JSONL file.
+        """
+        return cls(
+            source=iter_contacts(path, contact_field, PRIORITY_COLD),
+            buffer_size=buffer_size,
+            clock=clock,
+            checkpoint=checkpoint
+        )
+
+    def push(self, contact, priority=PRIORITY_COLD, not_before=None):
+        """
+        Queue a contact; returns a handle for release() when it is
+        scheduled for later, otherwise None.
+        """
+        entry_id = None
+        if self.checkpoint is not None:
+            entry_id = self.checkpoint.log_enqueue(contact, priority, not_before)
+        return self._push(contact, priority, not_before, entry_id)
+
+    def _push(self, contact, priority, not_before=None, entry_id=None, from_source=False):
+        """
+        Returns the wheel Timer for a contact scheduled for later.
+        """
+        if not_before is not None and not_before > self.clock.time():
+            if from_source:
+                self._source_scheduled += 1
+            return self._scheduled.schedule(
+                not_before, (priority, entry_id, contact, from_source)
+            )
+
+        bucket = self._ready.get(priority)
+        if bucket is None:
+            bucket = self._ready[priority] = deque()
+            bisect.insort(self._priorities, priority)
+        bucket.append((entry_id, contact))
+        self._ready_count += 1
+
+    def _fill(self):
+        """
+        Top up from the streaming source and release due scheduled contacts.
+        """
+        if self._source is not None:
+            while self._ready_count + self._source_scheduled < self.buffer_size:
+                try:
+                    contact, priority, not_before = next(self._source)
+                except StopIteration:
+                    self._source = None
+                    break
+                entry_id = None
+                if self.checkpoint is not None:
+                    entry_id = self.checkpoint.log_enqueue(
+                        contact, priority, not_before, from_source=True,
+                        source_position=self._source_tell() if self._source_tell else None
+                    )
+                self._push(contact, priority, not_before, entry_id, from_source=True)
+
+        if self._scheduled:
+            for item in self._scheduled.advance(self.clock.time()):
+                self._make_ready(item)
+
+    def release(self, timer):
+        """
+        Make a contact scheduled by push() ready now. Returns False if
+        it was already released.
+        """
+        if not self._scheduled.cancel(timer):
+            return False
+        self._make_ready(timer.item)
+        return True
+
+    def _make_ready(self, item):
+        priority, entry_id, contact, from_source = item
+        if from_source:
+            self._source_scheduled -= 1
+        self._push(contact, priority, None, entry_id)
 
     def has_next(self):
-        return len(self.queue) > 0
+        """
+        True if a contact can be dialed right now.
+        """
+        if self._ready_count == 0 or self._scheduled:
+            self._fill()
+        return self._ready_count > 0
+
+    def has_pending(self):
+        """
+        True if any contact remains, including ones scheduled for later.
+        """
+        return self.has_next() or bool(self._scheduled) or self._source is not None
+
+    def next_ready_time(self):
+        """
+        Epoch time the earliest scheduled contact becomes due, or None.
+        """
+        return self._scheduled.next_deadline()
+
+    def __len__(self):
+        return self._ready_count + len(self._scheduled)
+
+    def peek(self, count):
+        """
+        Up to `count` ready contacts, in the order next_call() will return
+        them. Contacts scheduled for later are not included.
+        """
+        self.has_next()
+        upcoming = []
+        for priority in self._priorities:
+            for _, contact in self._ready[priority]:
+                upcoming.append(contact)
+                if len(upcoming) >= count:
+                    return upcoming
+        return upcoming
 
     def next_call(self):
-        contact = self.queue.pop(0)
+        if not self.has_next():
+            raise IndexError("next_call() on a CallQueue with no ready contacts")
+
+        priority = self._priorities[0]
+        bucket = self._ready[priority]
+        entry_id, contact = bucket.popleft()
+        self._ready_count -= 1
+        if not bucket:
+            del self._ready[priority]
+            self._priorities.pop(0)
+
+        if self._source is not None and self._ready_count < self.buffer_size // 2:
+            self._fill()
+
+        if entry_id is not None:
+            self.checkpoint.log_dispatch(entry_id)
+
         log_event(
-            "INFO",
+            "DEBUG",
             "CallQueue",
-            f"Processing next contact: {contact}"
+            "Processing next contact: %s",
+            args=(contact,)
         )
         return contact
 
+    async def dispatched(self):
+        """
+        Wait until the last next_call() is durably recorded; dial only
+        after this returns so a crash can never lead to a second dial.
+        """
+        if self.checkpoint is not None:
+            with span("queue.dispatched"):
+                await self.checkpoint.durable()
+
+    def record_outcome(self, contact, outcome):
+        if self.checkpoint is not None:
+            self.checkpoint.log_outcome(contact, outcome)
+
     def skip_contact(self, contact, reason):
         log_event(
             "WARNING",
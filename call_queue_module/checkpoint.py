@@ -0,0 +1,427 @@
+# call_queue_module/checkpoint.py
+
+import asyncio
+import json
+import os
+import threading
+import zlib
+from collections import deque
+
+from logs.log_manager import log_event
+
+SNAPSHOT_FILE = "snapshot.json"
+
+# Record ops
+ENQUEUE = "E"
+DISPATCH = "D"
+OUTCOME = "O"
+
+
+def _wal_name(generation):
+    return f"wal.{generation:08d}.log"
+
+
+def _encode(record):
+    body = json.dumps(record, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+
+def _decode(line):
+    """
+    Parse one WAL line; None for a torn or corrupt line.
+    """
+    if len(line) < 10 or line[8:9] != b" " or not line.endswith(b"\n"):
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # not supported on this platform
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class CallCheckpoint:
+    """
+    Crash-safe record of campaign progress: an append-only write-ahead
+    log of enqueue, dispatch and outcome records plus periodic snapshots.
+
+    The checkpoint tracks only what is still open - queued contacts, how
+    far the contact source has been read and calls in flight - so a
+    snapshot is bounded by the queue buffer, not the campaign size, and
+    recovery replays just the WAL written since the last one.
+
+    A contact is dialed at most once: the engine waits for its dispatch
+    record to be durable (`durable()`) before calling. A contact that was
+    dispatched but has no outcome after a crash is "in doubt" and is not
+    redialed. fsyncs are batched: every dispatch waiting in the same loop
+    iteration (or `group_commit_delay` window) shares one, run in a worker
+    thread so the event loop keeps serving calls meanwhile. Enqueue and
+    outcome records ride along with the next sync; losing them only
+    means re-reading a few source contacts or reporting a call in doubt.
+
+    Every `snapshot_every` records the WAL moves to a new generation at
+    once, and the snapshot of the state at that point is made durable by
+    the same worker-thread commit path. Until it is, the previous WAL is
+    kept, and recovery replays every generation since the last snapshot.
+
+    For seekable sources the byte position after the last contact read is
+    kept as well (`source_position`), so resuming seeks straight to it.
+    """
+
+    def __init__(self, directory, snapshot_every=10000, group_commit_delay=0.0):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.group_commit_delay = group_commit_delay
+
+        self.generation = 0
+        self.next_id = 0
+        self.source_offset = 0
+        self.source_position = None
+        self.pending = {}        # id -> [contact, priority, not_before]
+        self.in_flight = {}      # id -> contact
+        self.in_doubt = []
+        self.outcomes = {}
+
+        self.stats = {"records": 0, "fsyncs": 0, "snapshots": 0, "replayed": 0}
+
+        self._by_contact = {}    # contact -> [ids] in flight
+        self._file = None
+        self._since_snapshot = 0
+        self._written = 0        # records appended to the WAL
+        self._synced = 0         # records known durable
+        self._sync_waiters = []  # (records needed, future)
+        self._commit_task = None
+        # (old WAL file, its generation, records written, snapshot) not yet durable
+        self._pending_snapshots = deque()
+        self._snapshot_lock = threading.Lock()
+        self._recovered = False
+
+    # ---- recovery -----------------------------------------------------
+
+    def recover(self):
+        """
+        Load the last snapshot, replay the WALs after it and open a new
+        generation. Returns (pending entries as (id, contact, priority,
+        not_before), source_offset, source_position); calls left in flight
+        become in_doubt.
+        """
+        if self._recovered:
+            raise RuntimeError("CallCheckpoint.recover() called twice")
+        self._recovered = True
+        os.makedirs(self.directory, exist_ok=True)
+
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path) as f:
+                snapshot = json.load(f)
+            self.generation = snapshot["generation"]
+            self.next_id = snapshot["next_id"]
+            self.source_offset = snapshot["source_offset"]
+            self.source_position = snapshot.get("source_position")
+            self.pending = {item[0]: item[1:] for item in snapshot["pending"]}
+            self.in_flight = {item[0]: item[1] for item in snapshot["in_flight"]}
+            self.in_doubt = snapshot["in_doubt"]
+            self.outcomes = snapshot["outcomes"]
+
+        # A crash before a snapshot became durable leaves the WALs of the
+        # generations after it; replay them in order up to a torn record
+        replayed_generations = []
+        while True:
+            path = os.path.join(self.directory, _wal_name(self.generation))
+            if not os.path.exists(path):
+                break
+            replayed_generations.append(self.generation)
+            count, complete = self._replay(path)
+            self.stats["replayed"] += count
+            if not complete:
+                break
+            self.generation += 1
+        if replayed_generations:
+            self.generation = replayed_generations[-1]
+
+        if self.in_flight:
+            lost = list(self.in_flight.values())
+            self.in_doubt.extend(lost)
+            self.in_flight.clear()
+            log_event(
+                "WARNING",
+                "CallQueue",
+                f"{len(lost)} call(s) were in flight at the last shutdown and will "
+                f"not be redialed: {', '.join(map(str, lost))}"
+            )
+
+        # Start a fresh generation so a torn WAL tail is never appended to
+        self._snapshot()
+        current = _wal_name(self.generation)
+        for name in os.listdir(self.directory):
+            if name.startswith("wal.") and name != current:
+                _remove(os.path.join(self.directory, name))
+
+        entries = [(id_, *entry) for id_, entry in self.pending.items()]
+        if entries or self.source_offset:
+            log_event(
+                "INFO",
+                "CallQueue",
+                f"Resumed from checkpoint: {len(entries)} queued, "
+                f"{self.source_offset} read from source, "
+                f"{self.stats['replayed']} WAL records replayed"
+            )
+        return entries, self.source_offset, self.source_position
+
+    def _replay(self, path):
+        """
+        Apply a WAL file; returns (records replayed, False if it ended
+        in a torn or corrupt record).
+        """
+        replayed = 0
+        with open(path, "rb") as f:
+            for line in f:
+                record = _decode(line)
+                if record is None:
+                    return replayed, False  # torn tail from the crash
+                self._apply(record)
+                replayed += 1
+        return replayed, True
+
+    def _apply(self, record):
+        op = record["op"]
+        id_ = record["id"]
+        if op == ENQUEUE:
+            self.pending[id_] = [record["c"], record["p"], record.get("nb")]
+            self.next_id = max(self.next_id, id_ + 1)
+            if record.get("src"):
+                self.source_offset += 1
+                if "so" in record:
+                    self.source_position = record["so"]
+        elif op == DISPATCH:
+            entry = self.pending.pop(id_, None)
+            if entry is not None:
+                self.in_flight[id_] = entry[0]
+        elif op == OUTCOME:
+            if self.in_flight.pop(id_, None) is not None:
+                outcome = record["r"]
+                self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    # ---- logging ------------------------------------------------------
+
+    def _append(self, record):
+        self._apply(record)
+        self._file.write(_encode(record))
+        self._written += 1
+        self.stats["records"] += 1
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self._rotate()
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                self._write_snapshots()  # no event loop to keep responsive
+            else:
+                self._start_commit()
+
+    def log_enqueue(self, contact, priority, not_before=None, from_source=False,
+                    source_position=None):
+        """
+        Record a contact entering the queue; returns its entry id.
+        `source_position` is the source's byte offset after this contact.
+        """
+        id_ = self.next_id
+        record = {"op": ENQUEUE, "id": id_, "c": contact, "p": priority}
+        if not_before is not None:
+            record["nb"] = not_before
+        if from_source:
+            record["src"] = 1
+            if source_position is not None:
+                record["so"] = source_position
+        self._append(record)
+        return id_
+
+    def log_dispatch(self, id_):
+        contact = self.pending[id_][0]
+        self._append({"op": DISPATCH, "id": id_})
+        self._by_contact.setdefault(contact, []).append(id_)
+
+    def log_outcome(self, contact, outcome):
+        ids = self._by_contact.get(contact)
+        if not ids:
+            return
+        id_ = ids.pop(0)
+        if not ids:
+            del self._by_contact[contact]
+        self._append({"op": OUTCOME, "id": id_, "r": outcome})
+
+    # ---- durability ---------------------------------------------------
+
+    def sync(self):
+        """
+        fsync everything appended so far, blocking, and wake the durable()
+        waiters. For recovery and shutdown; durable() syncs off the loop.
+        """
+        self._synced = max(self._synced, self._write_snapshots())
+        if self._synced < self._written:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.stats["fsyncs"] += 1
+            self._synced = self._written
+        self._wake()
+
+    def _wake(self, error=None):
+        waiters, self._sync_waiters = self._sync_waiters, []
+        for needed, waiter in waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            elif needed > self._synced:
+                self._sync_waiters.append((needed, waiter))
+            else:
+                waiter.set_result(None)
+
+    async def durable(self):
+        """
+        Wait until every record appended so far is on disk.
+        """
+        if self._synced >= self._written:
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._sync_waiters.append((self._written, waiter))
+        self._start_commit()
+        await waiter
+
+    def _start_commit(self):
+        if self._commit_task is None:
+            self._commit_task = asyncio.create_task(self._group_commit())
+
+    async def _group_commit(self):
+        """
+        fsync in a worker thread until no durable() caller is waiting and
+        no snapshot is pending. Records appended during an fsync go with
+        the next one.
+        """
+        try:
+            while self._sync_waiters or self._pending_snapshots:
+                # Let the rest of this loop pass (or the delay window) join
+                await asyncio.sleep(self.group_commit_delay)
+                if self._pending_snapshots:
+                    try:
+                        covered = await asyncio.to_thread(self._write_snapshots)
+                    except OSError as e:
+                        log_event("ERROR", "CallQueue", "Checkpoint snapshot failed: %s", args=(e,))
+                        self._wake(e)
+                        return
+                    self._synced = max(self._synced, covered)
+                    # Rotated again meanwhile: its old WAL is not synced yet
+                    continue
+                target = self._written
+                if self._synced < target:
+                    self._file.flush()
+                    # A snapshot may close the file meanwhile; fsync a dup
+                    fd = os.dup(self._file.fileno())
+                    try:
+                        await asyncio.to_thread(os.fsync, fd)
+                    except OSError as e:
+                        self._wake(e)
+                        return
+                    finally:
+                        os.close(fd)
+                    self.stats["fsyncs"] += 1
+                    self._synced = max(self._synced, target)
+                self._wake()
+        finally:
+            self._commit_task = None
+
+    # ---- snapshots ----------------------------------------------------
+
+    def _snapshot(self):
+        """
+        Start a new WAL generation and write its snapshot, blocking.
+        """
+        self._rotate()
+        self.sync()
+
+    def _rotate(self):
+        """
+        Switch appends to a new WAL generation and queue a snapshot of the
+        open state as of now. Only cheap work happens here; the snapshot
+        is written and the old WAL fsynced by _write_snapshots().
+        """
+        generation = self.generation + 1
+        snapshot = {
+            "generation": generation,
+            "next_id": self.next_id,
+            "source_offset": self.source_offset,
+            "source_position": self.source_position,
+            "pending": [[id_, *entry] for id_, entry in self.pending.items()],
+            "in_flight": [[id_, contact] for id_, contact in self.in_flight.items()],
+            "in_doubt": list(self.in_doubt),
+            "outcomes": dict(self.outcomes)
+        }
+
+        old_file = self._file
+        if old_file is not None:
+            old_file.flush()
+        self._pending_snapshots.append((old_file, self.generation, self._written, snapshot))
+
+        self._file = open(os.path.join(self.directory, _wal_name(generation)), "wb")
+        self.generation = generation
+        self._since_snapshot = 0
+
+    def _write_snapshots(self):
+        """
+        Make queued snapshots durable, oldest first, and drop the WALs
+        they replace. Blocking; returns the record count now durable
+        through them (0 if none were queued).
+        """
+        covered = 0
+        with self._snapshot_lock:
+            while self._pending_snapshots:
+                old_file, old_generation, written, snapshot = self._pending_snapshots[0]
+                if old_file is not None and not old_file.closed:
+                    # Its records must be durable before the WAL is dropped
+                    os.fsync(old_file.fileno())
+                    old_file.close()
+
+                snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+                tmp_path = snapshot_path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(snapshot, f, separators=(",", ":"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, snapshot_path)
+                # Also makes the new WAL's directory entry durable
+                _fsync_dir(self.directory)
+
+                _remove(os.path.join(self.directory, _wal_name(old_generation)))
+                self._pending_snapshots.popleft()
+                self.stats["snapshots"] += 1
+                covered = written
+        return covered
+
+    def close(self):
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
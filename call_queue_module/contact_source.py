@@ -0,0 +1,99 @@
+# call_queue_module/contact_source.py
+
+import csv
+import json
+from datetime import datetime
+
+
+def _parse_not_before(value):
+    """
+    Accepts epoch seconds or an ISO-8601 timestamp; blank means "now".
+    """
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
+def _parse_priority(value, default):
+    if value in (None, ""):
+        return default
+    return int(value)
+
+
+class ContactFile:
+    """
+    Contacts from a CSV file with a header row, or a JSON-lines file whose
+    lines are objects or bare JSON strings, yielded lazily as
+    (contact, priority, not_before). `priority` and `not_before` are
+    optional fields.
+
+    tell() is the byte offset just past the last contact yielded;
+    seek(offset) makes the next iteration start there, so a resumed
+    campaign skips the part of the file already queued without reading it.
+    """
+
+    def __init__(self, path, contact_field="contact", default_priority=10):
+        self.path = path
+        self.contact_field = contact_field
+        self.default_priority = default_priority
+        self.jsonl = path.endswith(".jsonl") or path.endswith(".ndjson")
+        self._start = 0
+        self._offset = 0
+
+    def tell(self):
+        return self._offset
+
+    def seek(self, offset):
+        self._start = self._offset = offset
+
+    def _lines(self, f):
+        for raw in f:
+            self._offset += len(raw)
+            yield raw.decode("utf-8")
+
+    def _item(self, item):
+        return (
+            item[self.contact_field],
+            _parse_priority(item.get("priority"), self.default_priority),
+            _parse_not_before(item.get("not_before"))
+        )
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            if self.jsonl:
+                f.seek(self._start)
+                self._offset = self._start
+                yield from self._iter_jsonl(f)
+            else:
+                yield from self._iter_csv(f)
+
+    def _iter_jsonl(self, f):
+        for line in self._lines(f):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                yield item, self.default_priority, None
+                continue
+            yield self._item(item)
+
+    def _iter_csv(self, f):
+        header = next(csv.reader([f.readline().decode("utf-8")]), None)
+        if header is None:
+            return
+        if self._start > f.tell():
+            f.seek(self._start)
+        self._offset = f.tell()
+        # csv.reader pulls lines only as needed, so tell() stays exact
+        # even for quoted fields spanning lines
+        for row in csv.reader(self._lines(f)):
+            if row:
+                yield self._item(dict(zip(header, row)))
+
+
+def iter_contacts(path, contact_field="contact", default_priority=10):
+    return ContactFile(path, contact_field, default_priority)
@@ -0,0 +1,191 @@
+# call_queue_module/redrive.py
+
+import asyncio
+import json
+import random
+import threading
+
+from clock.clock import current_clock
+from circuit_breaker.circuit_breaker import CircuitState
+from call_queue_module.call_queue import PRIORITY_CALLBACK
+from logs.log_manager import log_event
+from metrics.instruments import REDRIVE_DEFERRED, REDRIVE_RELEASED, DEAD_LETTERS
+
+
+class RedriveQueue:
+    """
+    Deferred re-drive for contacts whose call failed or was skipped.
+
+    Instead of dropping the contact (or holding a worker in backoff), the
+    engine hands it to defer(): it goes back into the CallQueue as a
+    callback scheduled after a per-contact exponential backoff, held in
+    the queue's timing wheel. While the failing service's breaker is not
+    CLOSED the contact is also parked on that service, and all parked
+    contacts are released at once when the breaker closes (see watch()).
+
+    After `max_attempts` deferrals a contact is dead-lettered: kept in
+    `dead_letters`, logged, and appended to `dead_letter_path` as JSONL
+    when set, so nothing is lost silently.
+    """
+
+    def __init__(self, call_queue, initial_delay=5, backoff_factor=2, max_delay=300,
+                 max_attempts=10, jitter=True, dead_letter_path=None, clock=None):
+        self.call_queue = call_queue
+        self.initial_delay = initial_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.jitter = jitter
+        self.dead_letter_path = dead_letter_path
+        self.clock = clock or current_clock
+
+        self.dead_letters = []
+        self.stats = {"deferred": 0, "released": 0, "dead_lettered": 0}
+
+        self._attempts = {}       # contact -> deferrals so far
+        self._breakers = {}       # service -> CircuitBreaker
+        self._parked = {}         # service -> [Timer] released when its breaker closes
+        self._closed = []         # services whose breaker closed, not yet released
+        self._lock = threading.Lock()
+        self._loop = None
+        self._released = None
+
+    # ---- breaker tracking ---------------------------------------------
+
+    def watch(self, circuit_breaker):
+        """
+        Release contacts parked on this breaker's service when it closes.
+        """
+        self._breakers[circuit_breaker.service_name] = circuit_breaker
+        circuit_breaker.add_listener(self._on_state_change)
+        return self
+
+    def _on_state_change(self, service_name, state, timestamp):
+        if state != CircuitState.CLOSED.value:
+            return
+        # Breakers may change state on health-check threads; the queue
+        # is only touched from the event loop
+        with self._lock:
+            self._closed.append(service_name)
+        if self._loop is None:
+            self.release_closed()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.release_closed)
+
+    def release_closed(self):
+        """
+        Make contacts parked on services whose breaker closed ready now.
+        """
+        with self._lock:
+            services, self._closed = self._closed, []
+
+        released = 0
+        for service_name in services:
+            count = 0
+            for timer in self._parked.pop(service_name, ()):
+                if self.call_queue.release(timer):
+                    count += 1
+            if count:
+                REDRIVE_RELEASED.labels(service_name).inc(count)
+                log_event(
+                    "INFO",
+                    service_name,
+                    f"Breaker closed: re-driving {count} deferred contact(s)"
+                )
+            released += count
+
+        self.stats["released"] += released
+        if released and self._released is not None:
+            self._released.set()
+        return released
+
+    async def wait_released(self):
+        """
+        Wait until release_closed() makes parked contacts ready.
+        """
+        self._bind_loop()
+        await self._released.wait()
+        self._released.clear()
+
+    def _bind_loop(self):
+        if self._released is None:
+            self._loop = asyncio.get_running_loop()
+            self._released = asyncio.Event()
+            self.release_closed()  # anything that closed before we had a loop
+
+    # ---- deferral -----------------------------------------------------
+
+    def backoff(self, attempt):
+        delay = min(self.max_delay, self.initial_delay * self.backoff_factor ** (attempt - 1))
+        if self.jitter:
+            # Spread a batch of failures out instead of re-driving it at once
+            delay = random.uniform(delay / 2, delay)
+        return delay
+
+    def defer(self, contact, service_name, reason):
+        """
+        Reschedule a contact after a failure or skip. Returns the delay in
+        seconds, or None if it was dead-lettered instead.
+        """
+        if self._released is None:
+            try:
+                self._bind_loop()
+            except RuntimeError:
+                pass  # used outside an event loop
+
+        attempt = self._attempts.get(contact, 0) + 1
+        if attempt > self.max_attempts:
+            self._attempts.pop(contact, None)
+            self._dead_letter(contact, service_name, reason, attempt - 1)
+            return None
+        self._attempts[contact] = attempt
+
+        delay = self.backoff(attempt)
+        timer = self.call_queue.push(
+            contact, PRIORITY_CALLBACK, not_before=self.clock.time() + delay
+        )
+
+        breaker = self._breakers.get(service_name)
+        if timer is not None and breaker is not None and breaker.state is not CircuitState.CLOSED:
+            self._parked.setdefault(service_name, []).append(timer)
+
+        self.stats["deferred"] += 1
+        REDRIVE_DEFERRED.labels(service_name).inc()
+        log_event(
+            "WARNING",
+            service_name,
+            f"Deferred contact {contact} for {delay:.1f}s "
+            f"(attempt {attempt}/{self.max_attempts}): {reason}"
+        )
+        return delay
+
+    def completed(self, contact):
+        """
+        Forget a contact's deferral history once its call went through.
+        """
+        self._attempts.pop(contact, None)
+
+    def _dead_letter(self, contact, service_name, reason, attempts):
+        entry = {
+            "contact": contact,
+            "service": service_name,
+            "reason": reason,
+            "attempts": attempts,
+            "timestamp": self.clock.time()
+        }
+        self.dead_letters.append(entry)
+        self.stats["dead_lettered"] += 1
+        DEAD_LETTERS.labels(service_name).inc()
+
+        if self.dead_letter_path:
+            with open(self.dead_letter_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+        log_event(
+            "ERROR",
+            service_name,
+            f"Dead-lettered contact {contact} after {attempts} attempts: {reason}"
+        )
+
+    def __len__(self):
+        return len(self._attempts)
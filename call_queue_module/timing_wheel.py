@@ -0,0 +1,172 @@
+# call_queue_module/timing_wheel.py
+
+import math
+
+
+class Timer:
+    """
+    Handle for a scheduled item; pass it to TimingWheel.cancel().
+    """
+
+    __slots__ = ("tick", "item", "level", "cancelled")
+
+    def __init__(self, tick, item):
+        self.tick = tick
+        self.item = item
+        self.level = -1
+        self.cancelled = False
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck).
+
+    `levels` wheels of `slots` buckets each; level n buckets span
+    slots**n ticks of `tick` seconds. Scheduling and cancelling are O(1)
+    however many timers are pending, which matters when an outage parks
+    a whole campaign; timers are cascaded to finer levels as their time
+    approaches. Items are never released early and at most one tick late.
+    Not thread-safe.
+    """
+
+    def __init__(self, tick=0.1, slots=256, levels=4, now=0.0):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._level_counts = [0] * levels
+        self._current = math.floor(now / tick)
+        self._due = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _to_tick(self, when):
+        return math.ceil(when / self.tick)
+
+    # ---- scheduling ---------------------------------------------------
+
+    def schedule(self, when, item):
+        """
+        Release `item` at epoch time `when`; returns its Timer.
+        """
+        timer = Timer(self._to_tick(when), item)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer):
+        """
+        Drop a pending timer. Returns False if it already fired or was
+        cancelled. The slot entry is discarded lazily.
+        """
+        if timer.cancelled or timer.level is None:
+            return False
+        timer.cancelled = True
+        if timer.level >= 0:
+            self._level_counts[timer.level] -= 1
+        self._count -= 1
+        return True
+
+    def _place(self, timer):
+        delta = timer.tick - self._current
+        if delta <= 0:
+            timer.level = -1
+            self._due.append(timer)
+            return
+
+        for level in range(self.levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                slot = (timer.tick >> (self._bits * level)) & self._mask
+                break
+        else:
+            # Beyond the wheel's range: park in the farthest top-level
+            # bucket and re-place it when that bucket cascades
+            level = self.levels - 1
+            shift = self._bits * level
+            slot = ((self._current >> shift) + self._mask) & self._mask
+
+        timer.level = level
+        self._level_counts[level] += 1
+        self._wheels[level][slot].append(timer)
+
+    # ---- expiry -------------------------------------------------------
+
+    def advance(self, now):
+        """
+        Move the wheel to epoch time `now`; returns the items now due.
+        """
+        target = math.floor(now / self.tick)
+        while self._current < target:
+            if self._level_counts[0] == 0:
+                # Nothing in the finest wheel: jump to its next wrap
+                boundary = self._current | self._mask
+                if boundary >= target:
+                    self._current = target
+                    break
+                self._current = boundary
+
+            self._current += 1
+            if self._current & self._mask == 0:
+                self._cascade()
+            self._expire(self._wheels[0][self._current & self._mask], 0)
+
+        due, self._due = self._due, []
+        items = []
+        for timer in due:
+            if not timer.cancelled:
+                timer.level = None
+                items.append(timer.item)
+        self._count -= len(items)
+        return items
+
+    def _expire(self, bucket, level):
+        if not bucket:
+            return
+        timers = bucket[:]
+        bucket.clear()
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            self._level_counts[level] -= 1
+            self._place(timer)
+
+    def _cascade(self):
+        for level in range(1, self.levels):
+            slot = (self._current >> (self._bits * level)) & self._mask
+            self._expire(self._wheels[level][slot], level)
+            if slot != 0:
+                break
+
+    def next_deadline(self):
+        """
+        Lower bound on the epoch time the next item is due, or None.
+        Exact for timers in the finest wheel; for coarser ones it is
+        the time their bucket cascades.
+        """
+        if self._count == 0:
+            return None
+        if any(not timer.cancelled for timer in self._due):
+            return self._current * self.tick
+
+        # A coarse bucket can come due before the finest wheel's next timer
+        earliest = None
+        for level in range(self.levels):
+            if self._level_counts[level] == 0:
+                continue
+            shift = self._bits * level
+            base = self._current >> shift
+            for offset in range(1, self.slots + 1):
+                bucket = self._wheels[level][(base + offset) & self._mask]
+                if any(not timer.cancelled for timer in bucket):
+                    tick = (base + offset) << shift
+                    if earliest is None or tick < earliest:
+                        earliest = tick
+                    break
+        return earliest * self.tick if earliest is not None else None
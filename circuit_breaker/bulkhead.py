@@ -0,0 +1,122 @@
+# circuit_breaker/bulkhead.py
+
+import asyncio
+from collections import deque
+
+from errors.exceptions import BulkheadFullError
+from metrics.instruments import BULKHEAD_ACTIVE, BULKHEAD_QUEUED, BULKHEAD_REJECTED
+
+
+class Bulkhead:
+    """
+    Fixed share of concurrency for one dependency, so a slow service can
+    tie up at most `max_concurrent` calls instead of every worker.
+
+    Calls over the limit wait in a FIFO queue of at most `max_queue`;
+    when the queue is full, or a call has waited `max_wait` seconds, it
+    fails fast with BulkheadFullError. Unlike the adaptive concurrency
+    limiter, a call holds its slot across retries and backoff. Meant for
+    a single event loop.
+    """
+
+    def __init__(self, service_name, max_concurrent=10, max_queue=10, max_wait=None):
+        self.service_name = service_name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self.active = 0
+        self._waiters = deque()
+        self.stats = {
+            "admitted": 0,
+            "rejected_full": 0,
+            "rejected_timeout": 0,
+            "peak_active": 0,
+            "peak_queued": 0
+        }
+
+        self._active_gauge = BULKHEAD_ACTIVE.labels(service_name)
+        self._queued_gauge = BULKHEAD_QUEUED.labels(service_name)
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def snapshot(self):
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            **self.stats
+        }
+
+    def try_acquire(self):
+        """
+        Take a slot only if one is free right now, without queueing.
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self._take()
+            return True
+        return False
+
+    async def acquire(self):
+        if self.try_acquire():
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject("full", f"{self.service_name} bulkhead full "
+                                 f"({self.active} active, {self.queued} queued)")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats["peak_queued"] = max(self.stats["peak_queued"], len(self._waiters))
+        self._queued_gauge.set(len(self._waiters))
+        try:
+            if self.max_wait is None:
+                await waiter
+            else:
+                await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self._reject("timeout", f"{self.service_name} bulkhead: no slot "
+                                    f"within {self.max_wait}s")
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+    def _reject(self, reason, message):
+        self.stats[f"rejected_{reason}"] += 1
+        BULKHEAD_REJECTED.labels(self.service_name, reason).inc()
+        raise BulkheadFullError(message, service_name=self.service_name)
+
+    def _abandon(self, waiter):
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up: pass it on
+            self.release()
+        else:
+            waiter.cancel()
+            # Leave the queue now: its length is what max_queue bounds
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self._queued_gauge.set(len(self._waiters))
+
+    def _take(self):
+        self.active += 1
+        self.stats["admitted"] += 1
+        self.stats["peak_active"] = max(self.stats["peak_active"], self.active)
+        self._active_gauge.set(self.active)
+
+    def _wake(self):
+        while self._waiters and self.active < self.max_concurrent:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._take()
+            waiter.set_result(True)
+        self._active_gauge.set(self.active)
+        self._queued_gauge.set(len(self._waiters))
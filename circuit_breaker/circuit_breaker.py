@@ -1,7 +1,14 @@
-import time
+import threading
 from enum import Enum
+from clock.clock import current_clock
 from logs.log_manager import log_event
 from alerts.alert_manager import send_alert
+from circuit_breaker.sliding_window import build_window
+from tracing.tracer import span
+from metrics.instruments import (
+    BREAKER_STATE, BREAKER_STATE_VALUES, BREAKER_TRANSITIONS,
+    BREAKER_OPEN_SECONDS, BREAKER_REJECTED
+)
 
 
 class CircuitState(Enum):
@@ -11,65 +18,246 @@ class CircuitState(Enum):
 
 
 class CircuitBreaker:
-    def __init__(self, service_name, failure_threshold=3, recovery_timeout=15):
+    """
+    Rate-based circuit breaker.
+
+    Trips when, over a sliding window, the failure rate or the slow-call
+    rate crosses its threshold (once at least `failure_threshold` calls
+    have been observed). After `recovery_timeout` it lets a bounded
+    number of probe calls through (HALF_OPEN); when they succeed it
+    closes and ramps admitted traffic back up over `ramp_up_duration`.
+    """
+
+    def __init__(self, service_name, failure_threshold=3, recovery_timeout=15,
+                 failure_rate_threshold=0.5, slow_call_duration=5.0,
+                 slow_call_rate_threshold=1.0, window_type="count", window_size=20,
+                 half_open_max_calls=3, ramp_up_duration=10, clock=None):
         self.service_name = service_name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.half_open_max_calls = half_open_max_calls
+        self.ramp_up_duration = ramp_up_duration
+        self.clock = clock or current_clock
 
         self.state = CircuitState.CLOSED
-        self.failure_count = 0
         self.last_failure_time = None
 
+        self._window = build_window(window_type, window_size)
+        self._lock = threading.Lock()
+        self._opened_at = None
+        self._half_open_since = None
+        self._probes_issued = 0
+        self._probe_successes = 0
+        self._ramp_started = None
+        self._ramp_credit = 0.0
+        self._listeners = []
+
+        self._state_gauge = BREAKER_STATE.labels(service_name)
+        self._rejected = BREAKER_REJECTED.labels(service_name)
+        self._state_gauge.set(BREAKER_STATE_VALUES[self.state.value])
+        self._metrics_open_since = None
+
+    def add_listener(self, listener):
+        """
+        Call listener(service_name, state, timestamp) after every state change.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, state):
+        now = self.clock.time()
+        self._state_gauge.set(BREAKER_STATE_VALUES[state])
+        BREAKER_TRANSITIONS.labels(self.service_name, state).inc()
+        if state == CircuitState.OPEN.value:
+            if self._metrics_open_since is None:
+                self._metrics_open_since = now
+        elif self._metrics_open_since is not None:
+            BREAKER_OPEN_SECONDS.labels(self.service_name).inc(now - self._metrics_open_since)
+            self._metrics_open_since = None
+
+        for listener in self._listeners:
+            listener(self.service_name, state, now)
+
+    @property
+    def failure_count(self):
+        return self._window.snapshot(self.clock.time())[1]
+
+    @property
+    def fully_closed(self):
+        """
+        CLOSED and not ramping traffic back up, so optional work (e.g.
+        prefetching) will not take admissions from live calls.
+        """
+        return self.state is CircuitState.CLOSED and self._ramp_started is None
+
+    # ---- admission ----------------------------------------------------
+
     def allow_request(self):
-        if self.state == CircuitState.OPEN:
-            elapsed = time.time() - (self.last_failure_time or 0)
-            if elapsed >= self.recovery_timeout:
-                self.state = CircuitState.HALF_OPEN
-                log_event(
-                    "INFO",
-                    self.service_name,
-                    "Circuit breaker HALF_OPEN — testing service",
-                    circuit_state=self.state.value
-                )
-                return True
-            return False
-        return True
+        # Fast path: fully closed, no lock needed (and not worth a span)
+        if self.state is CircuitState.CLOSED and self._ramp_started is None:
+            return True
 
-    def record_success(self):
-        previous = self.state
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
+        with span("breaker.allow_request", service=self.service_name) as traced:
+            allowed = self._allow_request()
+            traced.set("state", self.state.value)
+            traced.set("admitted", allowed)
+        return allowed
 
-        if previous != CircuitState.CLOSED:
-            log_event(
-                "INFO",
-                self.service_name,
-                "Circuit breaker CLOSED — service recovered",
-                circuit_state=self.state.value
-            )
+    def _allow_request(self):
+        transition = None
+        with self._lock:
+            now = self.clock.time()
+
+            if self.state is CircuitState.OPEN:
+                if now - self._opened_at < self.recovery_timeout:
+                    self._rejected.inc()
+                    return False
+                self._enter_half_open(now)
+                transition = "Circuit breaker HALF_OPEN — testing service"
+
+            if self.state is CircuitState.HALF_OPEN:
+                # Permits whose outcome never came back are reissued
+                if now - self._half_open_since >= self.recovery_timeout:
+                    self._enter_half_open(now)
+                allowed = self._probes_issued < self.half_open_max_calls
+                if allowed:
+                    self._probes_issued += 1
+            else:
+                allowed = self._admit_during_ramp(now)
+            state = self.state.value
+
+        if transition:
+            log_event("INFO", self.service_name, transition, circuit_state=state)
+            self._notify(state)
+        if not allowed:
+            self._rejected.inc()
+        return allowed
+
+    def _admit_during_ramp(self, now):
+        if self._ramp_started is None:
+            return True
+
+        fraction = (now - self._ramp_started) / self.ramp_up_duration if self.ramp_up_duration else 1
+        if fraction >= 1:
+            self._ramp_started = None
+            return True
+
+        # Admit the current share of traffic: each call adds the fraction
+        # to a credit that stays below one admission, so calls rejected
+        # earlier in the ramp are never made up for in a burst later
+        fraction = max(fraction, 1.0 / (self.half_open_max_calls + 1))
+        self._ramp_credit += fraction
+        if self._ramp_credit >= 1.0 - 1e-9:
+            self._ramp_credit -= 1.0
+            return True
+        return False
 
-    def record_failure(self):
-        self.failure_count += 1
-        self.last_failure_time = time.time()
+    # ---- outcomes -----------------------------------------------------
+
+    def record_success(self, duration=None):
+        slow = duration is not None and duration >= self.slow_call_duration
+        transition = None
+
+        with self._lock:
+            now = self.clock.time()
+            self._window.record(False, slow, now)
+
+            # Calls already in flight when the state changed say nothing
+            # about recovery; only fresh probes (or health checks) count
+            started = now - duration if duration is not None else now
+
+            if self.state is CircuitState.HALF_OPEN:
+                if started >= self._half_open_since:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max_calls:
+                        self._close(now)
+                        transition = "Circuit breaker CLOSED — service recovered"
+
+            elif self.state is CircuitState.OPEN:
+                # Out-of-band recovery signal (health check)
+                if started >= self._opened_at:
+                    self._close(now)
+                    transition = "Circuit breaker CLOSED — service recovered"
+
+            elif self._should_trip(now):
+                self._open(now)
+                transition = "Circuit breaker OPEN — service marked unhealthy"
+            state = self.state.value
+
+        if transition:
+            self._announce(transition, state)
+
+    def record_failure(self, duration=None):
+        slow = duration is not None and duration >= self.slow_call_duration
+        transition = None
+
+        with self._lock:
+            now = self.clock.time()
+            self.last_failure_time = now
+            self._window.record(True, slow, now)
+            calls, failures, _ = self._window.snapshot(now)
+            started = now - duration if duration is not None else now
+
+            if self.state is CircuitState.HALF_OPEN:
+                # Like successes, only calls started since the probe
+                # window opened say anything about recovery
+                if started >= self._half_open_since:
+                    self._open(now)
+                    transition = "Circuit breaker OPEN — service marked unhealthy"
+
+            elif self.state is CircuitState.CLOSED and self._should_trip(now):
+                self._open(now)
+                transition = "Circuit breaker OPEN — service marked unhealthy"
+            state = self.state.value
 
         log_event(
             "WARNING",
             self.service_name,
-            f"Failure recorded ({self.failure_count}/{self.failure_threshold})",
-            circuit_state=self.state.value
+            "Failure recorded (%d/%d calls in window)",
+            circuit_state=state,
+            args=(failures, calls)
         )
 
-        if self.failure_count >= self.failure_threshold and self.state != CircuitState.OPEN:
-            self.state = CircuitState.OPEN
+        if transition:
+            self._announce(transition, state)
 
-            log_event(
-                "CRITICAL",
-                self.service_name,
-                "Circuit breaker OPEN — service marked unhealthy",
-                circuit_state=self.state.value
-            )
+    # ---- transitions (lock held) -------------------------------------
+
+    def _should_trip(self, now):
+        calls, failures, slow = self._window.snapshot(now)
+        if calls < self.failure_threshold:
+            return False
+        return (
+            failures / calls >= self.failure_rate_threshold
+            or slow / calls >= self.slow_call_rate_threshold
+        )
+
+    def _open(self, now):
+        self.state = CircuitState.OPEN
+        self._opened_at = now
+        self._ramp_started = None
+
+    def _enter_half_open(self, now):
+        self.state = CircuitState.HALF_OPEN
+        self._half_open_since = now
+        self._probes_issued = 0
+        self._probe_successes = 0
+
+    def _close(self, now):
+        self.state = CircuitState.CLOSED
+        self._window.reset()
+        self._ramp_started = now if self.ramp_up_duration else None
+        self._ramp_credit = 0.0
 
+    def _announce(self, message, state):
+        self._notify(state)
+        if state == CircuitState.OPEN.value:
+            log_event("CRITICAL", self.service_name, message, circuit_state=state)
             send_alert(
                 self.service_name,
                 "Circuit breaker OPEN — service unhealthy"
             )
+        else:
+            log_event("INFO", self.service_name, message, circuit_state=state)
@@ -0,0 +1,166 @@
+# circuit_breaker/concurrency_limiter.py
+
+import asyncio
+import math
+from collections import deque
+
+from errors.exceptions import ConcurrencyLimitError
+from metrics.instruments import LIMITER_LIMIT, LIMITER_IN_FLIGHT, LIMITER_REJECTED
+
+LIMIT_ALGORITHMS = ("aimd", "gradient")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Per-service cap on in-flight requests that adapts to latency and errors.
+
+    Sits alongside the circuit breaker: the breaker stops traffic after
+    failures, the limiter trims concurrency as soon as latency rises.
+
+    - aimd: +1 per `limit` fast successes; multiply by `backoff_ratio`
+      on an error or a call slower than `slow_latency`
+    - gradient: Vegas-style; the limit is scaled by long-term RTT over
+      recent RTT (clamped to [0.5, 1]), plus sqrt(limit) headroom to probe
+      for more, smoothed by `smoothing`
+
+    Both shrink by `backoff_ratio` on errors and only grow while at least
+    half the current limit is in use. Callers over the limit wait in FIFO
+    order; with `max_wait` set, a caller that waits longer gets
+    ConcurrencyLimitError. Meant for a single event loop.
+    """
+
+    def __init__(self, service_name, algorithm="gradient", initial_limit=20,
+                 min_limit=1, max_limit=200, backoff_ratio=0.9, tolerance=1.5,
+                 smoothing=0.2, slow_latency=None, max_wait=None):
+        if algorithm not in LIMIT_ALGORITHMS:
+            raise ValueError(f"Unknown concurrency limit algorithm: {algorithm}")
+
+        self.service_name = service_name
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.slow_latency = slow_latency
+        self.max_wait = max_wait
+
+        self._limit = float(initial_limit)
+        self.in_flight = 0
+        self._rtt_short = None
+        self._rtt_long = None
+        self._waiters = deque()
+
+        self._limit_gauge = LIMITER_LIMIT.labels(service_name)
+        self._in_flight_gauge = LIMITER_IN_FLIGHT.labels(service_name)
+        self._rejected = LIMITER_REJECTED.labels(service_name)
+        self._limit_gauge.set(self.limit)
+
+    @property
+    def limit(self):
+        return max(self.min_limit, int(self._limit))
+
+    # ---- admission ----------------------------------------------------
+
+    def try_acquire(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self._take()
+            return True
+        return False
+
+    async def acquire(self):
+        if self.try_acquire():
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            if self.max_wait is None:
+                await waiter
+            else:
+                await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self._rejected.inc()
+            raise ConcurrencyLimitError(
+                f"{self.service_name} concurrency limit {self.limit} reached",
+                service_name=self.service_name
+            ) from None
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def _abandon(self, waiter):
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as we gave up: pass it on
+            self.in_flight -= 1
+            self._wake()
+        else:
+            waiter.cancel()
+
+    def _take(self):
+        self.in_flight += 1
+        self._in_flight_gauge.set(self.in_flight)
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._take()
+            waiter.set_result(True)
+        self._in_flight_gauge.set(self.in_flight)
+
+    def release_unused(self):
+        """
+        Return a slot from try_acquire() that was never used for a call;
+        no latency sample is taken.
+        """
+        self.in_flight -= 1
+        self._wake()
+
+    # ---- feedback -----------------------------------------------------
+
+    def release(self, latency, dropped=False):
+        """
+        Return a slot. `dropped` marks an overload signal (transient
+        error or timeout); other failures should pass dropped=False.
+        """
+        utilised = self.in_flight * 2 >= self.limit
+        self.in_flight -= 1
+
+        if dropped:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif self.algorithm == "aimd":
+            self._update_aimd(latency, utilised)
+        else:
+            self._update_gradient(latency, utilised)
+
+        self._limit_gauge.set(self.limit)
+        self._wake()
+
+    def _update_aimd(self, latency, utilised):
+        if self.slow_latency is not None and latency > self.slow_latency:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif utilised:
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+    def _update_gradient(self, latency, utilised):
+        latency = max(latency, 1e-6)
+        if self._rtt_long is None:
+            self._rtt_short = self._rtt_long = latency
+            return
+
+        self._rtt_short += (latency - self._rtt_short) * 0.1
+        self._rtt_long += (latency - self._rtt_long) * 0.002
+        # Let the baseline catch up quickly when things got faster
+        if self._rtt_long > self._rtt_short * 2:
+            self._rtt_long *= 0.95
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._rtt_long / self._rtt_short))
+        if gradient >= 1.0 and not utilised:
+            return  # not using the current limit: no evidence for more
+
+        target = self._limit * gradient + math.sqrt(self._limit)
+        self._limit = self._limit * (1 - self.smoothing) + target * self.smoothing
+        self._limit = max(self.min_limit, min(self.max_limit, self._limit))
@@ -0,0 +1,177 @@
+# circuit_breaker/shared_state.py
+
+import math
+import multiprocessing
+
+from circuit_breaker.circuit_breaker import CircuitBreaker, CircuitState
+from circuit_breaker.sliding_window import CountWindow, TimeWindow
+from metrics.instruments import BREAKER_STATE_VALUES
+
+_STATES = (CircuitState.CLOSED, CircuitState.HALF_OPEN, CircuitState.OPEN)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+
+_BREAKER_FIELDS = (
+    "state", "last_failure_time", "_opened_at", "_half_open_since",
+    "_probes_issued", "_probe_successes", "_ramp_started", "_ramp_credit"
+)
+_COUNT_WINDOW_FIELDS = ("_index", "_count", "_failures", "_slow")
+
+
+def _state(raw):
+    return _STATES[int(raw)]
+
+
+# Fields not listed decode as optional floats (NaN -> None)
+_DECODERS = {
+    "state": _state, "_probes_issued": int, "_probe_successes": int,
+    "_ramp_credit": float
+}
+
+
+def _encode(value):
+    if value is None:
+        return math.nan
+    if isinstance(value, CircuitState):
+        return _STATE_CODES[value]
+    return value
+
+
+class _SharedField:
+    """
+    Instance attribute kept in a slot of a shared-memory array.
+
+    Until the owner attaches its array (`_shared_slots`), values live in a
+    private dict, so the base class __init__ cannot clobber shared state
+    another process is already using.
+    """
+
+    def __init__(self, name, index, decode):
+        self.name = name
+        self.index = index
+        self.decode = decode
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        slots = obj._shared_slots
+        if slots is None:
+            return obj._unshared[self.name]
+        return self.decode(slots[self.index])
+
+    def __set__(self, obj, value):
+        slots = obj._shared_slots
+        if slots is None:
+            obj._unshared[self.name] = value
+        else:
+            slots[self.index] = _encode(value)
+
+
+def _optional_float(raw):
+    return None if math.isnan(raw) else raw
+
+
+class SharedBreakerState:
+    """
+    Shared-memory block backing one service's breaker in every process:
+    a lock, the scalar breaker fields and the sliding window arrays.
+
+    Create it in the parent and hand it to child processes at start-up
+    (e.g. through a pool initializer); build a SharedCircuitBreaker over
+    it in each process.
+    """
+
+    def __init__(self, window_type="count", window_size=20, ctx=None):
+        ctx = ctx or multiprocessing.get_context()
+        self.window_type = window_type
+        self.window_size = window_size
+        self.lock = ctx.Lock()
+
+        self.fields = ctx.RawArray("d", len(_BREAKER_FIELDS))
+        for index, name in enumerate(_BREAKER_FIELDS):
+            # Counters start at 0, optional timestamps at None (NaN)
+            self.fields[index] = 0 if name in _DECODERS else math.nan
+        self.fields[_BREAKER_FIELDS.index("state")] = _STATE_CODES[CircuitState.CLOSED]
+
+        if window_type == "count":
+            self.window_fields = ctx.RawArray("d", len(_COUNT_WINDOW_FIELDS))
+            self.arrays = {"_outcomes": ctx.RawArray("b", window_size)}
+        elif window_type == "time":
+            self.window_fields = None
+            self.arrays = {
+                "_epochs": ctx.RawArray("q", [-1] * window_size),
+                "_calls": ctx.RawArray("q", window_size),
+                "_failures": ctx.RawArray("q", window_size),
+                "_slow": ctx.RawArray("q", window_size)
+            }
+        else:
+            raise ValueError(f"Unknown window type: {window_type}")
+
+    def build_window(self):
+        if self.window_type == "count":
+            return SharedCountWindow(self)
+        return SharedTimeWindow(self)
+
+
+class SharedCountWindow(CountWindow):
+    _shared_slots = None
+
+    def __init__(self, shared):
+        self._unshared = {}
+        super().__init__(shared.window_size)
+        self._outcomes = shared.arrays["_outcomes"]
+        self._shared_slots = shared.window_fields
+
+    def reset(self):
+        for i in range(self.size):
+            self._outcomes[i] = 0
+        self._index = self._count = self._failures = self._slow = 0
+
+
+for _index, _name in enumerate(_COUNT_WINDOW_FIELDS):
+    setattr(SharedCountWindow, _name, _SharedField(_name, _index, int))
+
+
+class SharedTimeWindow(TimeWindow):
+    def __init__(self, shared):
+        super().__init__(shared.window_size)
+        for name, array in shared.arrays.items():
+            setattr(self, name, array)
+
+    def reset(self):
+        for i in range(self.size):
+            self._epochs[i] = -1
+            self._calls[i] = self._failures[i] = self._slow[i] = 0
+
+
+class SharedCircuitBreaker(CircuitBreaker):
+    """
+    CircuitBreaker whose state and failure window live in shared memory,
+    so a breaker tripped by one worker process is OPEN for all of them.
+    The lock is a multiprocessing lock; the CLOSED fast path stays
+    lock-free. Listeners, metrics and alerts remain per process, and
+    only the process that causes a transition announces it.
+    """
+
+    _shared_slots = None
+
+    def __init__(self, service_name, shared, **kwargs):
+        kwargs.pop("window_type", None)
+        kwargs.pop("window_size", None)
+        self._unshared = {}
+        super().__init__(
+            service_name,
+            window_type=shared.window_type,
+            window_size=shared.window_size,
+            **kwargs
+        )
+        self._lock = shared.lock
+        self._window = shared.build_window()
+        self._shared_slots = shared.fields
+        self._state_gauge.set(BREAKER_STATE_VALUES[self.state.value])
+
+
+for _index, _name in enumerate(_BREAKER_FIELDS):
+    setattr(
+        SharedCircuitBreaker, _name,
+        _SharedField(_name, _index, _DECODERS.get(_name, _optional_float))
+    )
@@ -0,0 +1,95 @@
+# circuit_breaker/sliding_window.py
+
+from clock.clock import current_clock
+
+
+class CountWindow:
+    """
+    Ring buffer over the last `size` calls.
+    Running totals keep record() and snapshot() O(1).
+    """
+
+    def __init__(self, size=20):
+        self.size = size
+        self._outcomes = [0] * size   # bit 0: failed, bit 1: slow
+        self._index = 0
+        self._count = 0
+        self._failures = 0
+        self._slow = 0
+
+    def record(self, failed, slow, now=None):
+        if self._count == self.size:
+            evicted = self._outcomes[self._index]
+            self._failures -= evicted & 1
+            self._slow -= (evicted >> 1) & 1
+        else:
+            self._count += 1
+
+        outcome = int(failed) | (int(slow) << 1)
+        self._outcomes[self._index] = outcome
+        self._failures += outcome & 1
+        self._slow += (outcome >> 1) & 1
+        self._index = (self._index + 1) % self.size
+
+    def snapshot(self, now=None):
+        """
+        Returns (calls, failures, slow_calls) inside the window.
+        """
+        return self._count, self._failures, self._slow
+
+    def reset(self):
+        self.__init__(self.size)
+
+
+class TimeWindow:
+    """
+    Ring of one-second buckets covering the last `size` seconds.
+    Stale buckets are cleared lazily as the clock moves forward.
+    """
+
+    def __init__(self, size=60):
+        self.size = size
+        self._epochs = [-1] * size
+        self._calls = [0] * size
+        self._failures = [0] * size
+        self._slow = [0] * size
+
+    def _bucket(self, now):
+        epoch = int(now)
+        index = epoch % self.size
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            self._calls[index] = 0
+            self._failures[index] = 0
+            self._slow[index] = 0
+        return index
+
+    def record(self, failed, slow, now=None):
+        index = self._bucket(current_clock.time() if now is None else now)
+        self._calls[index] += 1
+        self._failures[index] += int(failed)
+        self._slow[index] += int(slow)
+
+    def snapshot(self, now=None):
+        """
+        Returns (calls, failures, slow_calls) inside the window.
+        """
+        oldest = int(current_clock.time() if now is None else now) - self.size
+        calls = failures = slow = 0
+        for i in range(self.size):
+            if self._epochs[i] > oldest:
+                calls += self._calls[i]
+                failures += self._failures[i]
+                slow += self._slow[i]
+        return calls, failures, slow
+
+    def reset(self):
+        self.__init__(self.size)
+
+
+def build_window(window_type, window_size):
+    if window_type == "count":
+        return CountWindow(window_size)
+    if window_type == "time":
+        return TimeWindow(window_size)
+    raise ValueError(f"Unknown window type: {window_type}")
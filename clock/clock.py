@@ -0,0 +1,204 @@
+# clock/clock.py
+
+import asyncio
+import heapq
+import itertools
+import selectors
+import threading
+import time
+
+
+class SystemClock:
+    """
+    Wall-clock time: thin wrapper over the time module and asyncio.
+    """
+
+    virtual = False
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def call_later(self, delay, callback, *args):
+        """
+        Run callback(*args) after `delay` seconds on the running event loop.
+        """
+        return asyncio.get_running_loop().call_later(delay, callback, *args)
+
+    def new_event_loop(self):
+        return asyncio.new_event_loop()
+
+    def run(self, coro):
+        """
+        asyncio.run() on an event loop that follows this clock.
+        """
+        loop = self.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(coro)
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+
+class VirtualClock(SystemClock):
+    """
+    Discrete-event virtual time.
+
+    Time only moves when something waits: sleep() and the event loop from
+    new_event_loop() jump straight to the next deadline instead of
+    blocking, so hours of backoff, recovery timeouts and health-check
+    intervals pass at CPU speed with the same ordering as wall-clock
+    time. Timers from call_later() fire in deadline order as time passes.
+
+    Virtual loops should only run non-blocking async work: while a worker
+    thread (asyncio.to_thread) is busy, pending timers still fire
+    immediately.
+    """
+
+    virtual = True
+
+    def __init__(self, start=0.0, epoch=None):
+        self._now = start
+        self._epoch = time.time() if epoch is None else epoch
+        self._timers = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
+        self._firing = False
+
+    def time(self):
+        return self._epoch + self._now
+
+    def monotonic(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def call_later(self, delay, callback, *args):
+        with self._lock:
+            heapq.heappush(self._timers, (self._now + max(0.0, delay), next(self._seq), callback, args))
+
+    def advance(self, seconds):
+        """
+        Move time forward, firing due timers at their own deadlines.
+        """
+        with self._lock:
+            target = self._now + max(0.0, seconds)
+            if self._firing:
+                # A timer callback slept: just move time along
+                self._now = max(self._now, target)
+                return
+            self._firing = True
+            try:
+                while self._timers and self._timers[0][0] <= target:
+                    when, _, callback, args = heapq.heappop(self._timers)
+                    self._now = max(self._now, when)
+                    callback(*args)
+                self._now = max(self._now, target)
+            finally:
+                self._firing = False
+
+    def new_event_loop(self):
+        return VirtualTimeEventLoop(self)
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """
+    Polls real I/O without blocking; a wait for the next timer advances
+    the virtual clock instead of sleeping.
+    """
+
+    def __init__(self, clock):
+        super().__init__()
+        self._clock = clock
+        self._idle_steps = 0
+
+    # Idle steps between non-blocking polls of real I/O; each poll releases
+    # the GIL, which is expensive when logging threads are busy
+    POLL_EVERY = 32
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # Nothing scheduled: only real I/O (e.g. a worker thread) can wake us
+            return super().select(None)
+        if timeout <= 0:
+            # Callbacks are ready; real I/O is picked up once the loop goes idle
+            return []
+
+        self._idle_steps += 1
+        if self._idle_steps >= self.POLL_EVERY:
+            self._idle_steps = 0
+            events = super().select(0)
+            if events:
+                return events
+        self._clock.advance(timeout)
+        return []
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop whose time() is the virtual clock, so asyncio.sleep,
+    wait_for and call_later all run on virtual time.
+    """
+
+    def __init__(self, clock):
+        super().__init__(_VirtualSelector(clock))
+        self._clock = clock
+
+    def time(self):
+        return self._clock.monotonic()
+
+
+class _CurrentClock:
+    """
+    Delegates to whichever clock set_clock() installed, so components
+    built with the default follow the process clock.
+    """
+
+    @property
+    def virtual(self):
+        return _clock.virtual
+
+    def time(self):
+        return _clock.time()
+
+    def monotonic(self):
+        return _clock.monotonic()
+
+    def sleep(self, seconds):
+        _clock.sleep(seconds)
+
+    def call_later(self, delay, callback, *args):
+        return _clock.call_later(delay, callback, *args)
+
+    def new_event_loop(self):
+        return _clock.new_event_loop()
+
+    def run(self, coro):
+        return _clock.run(coro)
+
+
+_clock = SystemClock()
+current_clock = _CurrentClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """
+    Install the process clock; returns the previous one.
+    """
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
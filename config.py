@@ -4,29 +4,257 @@
 RETRY_CONFIG = {
     "max_retries": 3,
     "initial_delay": 5,     # seconds
-    "backoff_factor": 2
+    "backoff_factor": 2,
+    "jitter": "full",       # none | full | decorrelated
+    "max_delay": 60         # seconds
+}
+
+# Process-wide retry budget (token bucket)
+RETRY_BUDGET_CONFIG = {
+    "ratio": 0.2,                  # retry tokens earned per successful call
+    "min_retries_per_second": 1,   # floor refill while nothing succeeds
+    "max_tokens": 10
 }
 
 # Circuit breaker configuration
 CIRCUIT_BREAKER_CONFIG = {
-    "failure_threshold": 2,  # default
-    "recovery_timeout": 10
+    "failure_threshold": 2,          # minimum calls in window before tripping
+    "recovery_timeout": 10,          # seconds OPEN before probing
+    "failure_rate_threshold": 0.5,   # trip at >= 50% failures
+    "slow_call_duration": 5.0,       # seconds; slower calls count as slow
+    "slow_call_rate_threshold": 1.0, # trip when every call is slow
+    "window_type": "count",          # count | time
+    "window_size": 20,               # calls (count) or seconds (time)
+    "half_open_max_calls": 3,        # probe calls allowed while HALF_OPEN
+    "ramp_up_duration": 10           # seconds to ramp traffic back after CLOSED
+}
+
+# Bulkheads: fixed concurrency and wait queue per service
+BULKHEAD_CONFIG = {
+    "enabled": True,
+    "max_concurrent": 10,         # calls in flight (retries included)
+    "max_queue": 10,              # calls waiting for a slot; more are rejected
+    "max_wait": 5                 # seconds in the queue before rejection
+}
+
+# Adaptive per-service concurrency limit (runs alongside the breaker)
+CONCURRENCY_LIMIT_CONFIG = {
+    "enabled": True,
+    "algorithm": "gradient",   # gradient | aimd
+    "initial_limit": 20,       # in-flight requests
+    "min_limit": 1,
+    "max_limit": 200,
+    "backoff_ratio": 0.9,      # multiply the limit by this on errors
+    "tolerance": 1.5,          # gradient: latency growth tolerated before shrinking
+    "smoothing": 0.2,          # gradient: weight of each new limit estimate
+    "slow_latency": None,      # aimd: seconds; slower calls shrink the limit
+    "max_wait": 30             # seconds to queue for a slot; None waits forever
+}
+
+
+
+# Provider request quotas: token bucket per service and API key
+RATE_LIMIT_CONFIG = {
+    "enabled": False,             # enabled per service below
+    "requests_per_second": 10,
+    "burst": 10                   # requests allowed back to back
+}
+
+# Per-service overrides of RETRY_CONFIG / CIRCUIT_BREAKER_CONFIG /
+# BULKHEAD_CONFIG / CONCURRENCY_LIMIT_CONFIG / RATE_LIMIT_CONFIG
+SERVICES_CONFIG = {
+    "ElevenLabs": {
+        "rate_limit": {"enabled": True, "requests_per_second": 10, "burst": 20}
+    },
+    "BackupTTS": {
+        "rate_limit": {"enabled": True, "requests_per_second": 5, "burst": 10}
+    },
+    "CRM": {
+        "retry": {"max_retries": 2, "initial_delay": 0.5},
+        "bulkhead": {"max_concurrent": 4, "max_queue": 4, "max_wait": 2}
+    },
+    "LLM": {
+        "retry": {"max_retries": 2, "initial_delay": 1},
+        "circuit_breaker": {"slow_call_duration": 10.0},
+        "bulkhead": {"max_concurrent": 4, "max_queue": 8},
+        "rate_limit": {"enabled": True, "requests_per_second": 5, "burst": 10}
+    },
+    # The fallback chain retries as a whole; providers fail over inside it
+    # and are limited individually
+    "TTS": {
+        "retry": {"max_retries": 2},
+        "concurrency_limit": {"enabled": False}
+    }
+}
+
+# TTS provider fallback chain and request hedging
+TTS_CHAIN_CONFIG = {
+    "providers": ["ElevenLabs", "BackupTTS"],  # tried in order
+    "hedging": True,
+    "hedge_percentile": 0.95,     # hedge once the primary is slower than its p95
+    "min_hedge_delay": 0.05,      # seconds
+    "hedge_same_provider": False, # hedge to the next provider, not the same one
+    "hedge_budget": {             # token bucket: hedges per request
+        "ratio": 0.1,
+        "min_retries_per_second": 1,
+        "max_tokens": 10
+    }
+}
+
+# Streaming TTS: audio chunks are handed on in pooled buffers
+TTS_STREAM_CONFIG = {
+    "chunk_size": 4096,           # bytes per chunk
+    "pool_size": 64               # idle buffers kept for reuse
+}
+
+# Call pipeline stage timeouts (seconds) for optional stages
+PIPELINE_CONFIG = {
+    "crm_timeout": 2.0,
+    "llm_timeout": 5.0
+}
+
+# TTS audio cache (memory LRU + mmap-backed disk tier)
+TTS_CACHE_CONFIG = {
+    "enabled": True,
+    "disk_path": ".cache/tts",
+    "memory_bytes": 64 * 1024 * 1024,
+    "disk_bytes": 1024 * 1024 * 1024,
+    "ttl": 7 * 24 * 3600,      # seconds
+    "prerender": [             # stock phrases rendered at startup
+        "Hello",
+        "Sorry, I didn't catch that.",
+        "Thank you for your time. Goodbye!"
+    ]
+}
+
+# Call queue configuration
+CALL_QUEUE_CONFIG = {
+    "buffer_size": 1000,   # contacts held in memory when streaming from a file
+    "schedule_tick": 0.1   # timing wheel resolution for scheduled contacts (seconds)
+}
+
+# Failed/skipped contacts are re-queued with backoff instead of dropped;
+# contacts parked on an OPEN breaker are re-driven as soon as it closes
+REDRIVE_CONFIG = {
+    "enabled": True,
+    "initial_delay": 5,           # seconds before the first re-drive
+    "backoff_factor": 2,
+    "max_delay": 300,
+    "max_attempts": 10,           # deferrals before a contact is dead-lettered
+    "jitter": True,
+    "dead_letter_path": "logs/dead_letters.jsonl"
 }
 
+# Crash-safe campaign progress: write-ahead log + periodic snapshots
+CHECKPOINT_CONFIG = {
+    "enabled": False,
+    "directory": ".cache/checkpoint",
+    "snapshot_every": 10000,       # WAL records between snapshots
+    "group_commit_delay": 0.0      # seconds to gather dispatches per fsync (0 = one loop pass)
+}
 
+# Call engine configuration
+ENGINE_CONFIG = {
+    "concurrency": 10  # calls in flight at once
+}
+
+# Lookahead call setup: warm the pipeline for upcoming contacts using
+# only capacity live calls leave idle
+PREFETCH_CONFIG = {
+    "enabled": True,
+    "window": 5,        # upcoming contacts prefetched at once
+    "headroom": 0.5     # share of each limit kept free for live calls
+}
+
+# Multi-process mode: shard the call queue across worker processes
+PROCESS_POOL_CONFIG = {
+    "processes": None,          # None = one per CPU core
+    "start_method": "spawn",    # spawn | forkserver | fork
+    "concurrency": 10,          # calls in flight per process
+    "chunk_size": 500,          # contacts handed to a worker at a time
+    "queued_chunks": 8          # chunks buffered between parent and workers
+}
 
 # Health check configuration
 HEALTH_CHECK_CONFIG = {
-    "interval": 10  # seconds
+    "interval": 10,        # seconds before a service's first probe
+    "min_interval": 2,     # seconds between probes while unhealthy / breaker not CLOSED
+    "max_interval": 60,    # seconds between probes once healthy for a while
+    "backoff_factor": 2,   # interval growth per healthy probe
+    "timeout": 5,          # seconds before a probe counts as failed
+    "workers": 4           # probe threads shared by all services
 }
 
 # Logging configuration
 LOG_FILE_PATH = "logs/app.log"
 SHEETS_LOG_PATH = "logs/google_sheets_mock.csv"
 
+# Log sinks: per-sink level threshold and sampling (below ERROR)
+LOG_SINKS = {
+    "json": {"level": "INFO", "sample_rate": 1.0},
+    "sheets": {"level": "INFO", "sample_rate": 1.0}
+}
+
+# Background JSON log writer
+LOG_CONFIG = {
+    "console": "pretty",            # pretty | compact | off
+    "queue_size": 10000,            # entries buffered before backpressure
+    "batch_size": 100,              # entries per write
+    "flush_interval": 0.5,          # seconds
+    "max_bytes": 10 * 1024 * 1024,  # rotate at this size (None disables)
+    "rotate_interval": None,        # seconds between rotations (None disables)
+    "backup_count": 5,
+    "drop_below": "WARNING",        # levels below this are dropped when full
+    "block_timeout": 1.0            # seconds WARNING+ entries wait for space
+}
+
+# Log analytics sidecars (python -m analytics.log_analytics)
+LOG_ANALYTICS_CONFIG = {
+    "index_dir": ".cache/log_analytics",  # block indexes and compacted segments
+    "block_size": 1024 * 1024             # bytes of log per index block
+}
+
+# In-process metrics and Prometheus scrape endpoint
+METRICS_CONFIG = {
+    "enabled": True,
+    "host": "127.0.0.1",
+    "port": 9100,                   # GET /metrics
+    "latency_buckets": [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]  # seconds
+}
+
+# Sampled per-call tracing spans (queue, breaker, retry attempts, backoff,
+# service calls, logging), written for chrome://tracing / Perfetto or OTLP
+TRACING_CONFIG = {
+    "enabled": False,
+    "sample_rate": 0.01,            # share of calls traced (decided at the call root)
+    "format": "chrome",             # chrome | otlp
+    "path": "logs/trace.json",
+    "batch_size": 256               # spans buffered per file append
+}
+
+# Buffered Google Sheets sink
+SHEETS_CONFIG = {
+    "batch_size": 100,            # rows per batch append
+    "flush_interval": 5.0,        # seconds
+    "requests_per_minute": 60,    # Sheets API write quota
+    "max_buffer": 50000,          # oldest rows dropped beyond this
+    "max_backoff": 60.0           # seconds between failed flush retries
+}
+
 # Alert thresholds
 ALERT_CONFIG = {
-    "max_downtime": 30  # seconds
+    "max_downtime": 30,        # seconds
+    "coalesce_window": 60,     # seconds repeats of an alert are grouped
+    "rate_limits": {           # deliveries per minute, per channel
+        "email": 5,
+        "telegram": 20,
+        "webhook": 60
+    },
+    "workers": 4,              # delivery threads
+    "queue_size": 1000,        # pending deliveries before dropping
+    "delivery_retries": 3,
+    "delivery_timeout": 5,     # seconds per webhook request
+    "webhook_url": None        # None prints instead of POSTing
 }
 EMAIL_ENABLED = False
 TELEGRAM_ENABLED = False
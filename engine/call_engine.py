@@ -0,0 +1,337 @@
+# engine/call_engine.py
+
+import asyncio
+import signal
+
+from clock.clock import current_clock
+from errors.exceptions import (
+    TransientServiceError, PermanentServiceError, CircuitOpenError, ConcurrencyLimitError,
+    BulkheadFullError
+)
+from alerts.alert_manager import send_alert
+from logs.log_manager import log_event
+from metrics.instruments import QUEUE_DEPTH
+from tracing.tracer import span, start_trace
+
+
+class CallEngine:
+    """
+    Asyncio dispatcher that drains a CallQueue with a bounded number of
+    concurrent calls. Every call still goes through the circuit breaker,
+    the retry handler and the logging pipeline.
+
+    With a `pipeline` (engine.pipeline.CallPipeline) each call runs the
+    full multi-service setup, each stage behind its own breaker; the
+    engine-level service/breaker are then only used for reporting.
+
+    `on_complete(contact, outcome, duration)` is called after every call
+    with outcome "succeeded", "failed" or "skipped".
+
+    With a checkpointed CallQueue, each call is dialed only once its
+    dispatch is durable (`CallQueue.dispatched()`), and its outcome is
+    recorded back to the queue.
+
+    With a `redrive` queue (call_queue_module.redrive.RedriveQueue),
+    contacts whose call failed transiently or was skipped are handed to
+    it for a later attempt instead of being dropped; idle workers wait
+    for re-driven contacts rather than exiting while calls are in flight.
+
+    With `stream=True`, services offering text_to_speech_stream_async are
+    streamed chunk by chunk (see RetryHandler.stream_async), so playback
+    can start at the first chunk.
+
+    With a `prefetcher` (engine.prefetch.Prefetcher), workers keep its
+    window of upcoming contacts warm while they dial, and a dequeued
+    contact's pipeline starts from whatever was prefetched for it.
+
+    Each call is a trace root ("call"); with tracing configured a sampled
+    share of calls records spans for the queue, breaker, retry attempts,
+    backoff sleeps, service calls and logging underneath it.
+
+    Timing follows `clock`; run() under a VirtualClock's event loop
+    (clock.run(engine.run())) to simulate campaigns in virtual time.
+    """
+
+    def __init__(self, call_queue, service, retry_handler, circuit_breaker,
+                 service_name="ElevenLabs", concurrency=10, pipeline=None,
+                 on_complete=None, clock=None, stream=False, redrive=None,
+                 prefetcher=None):
+        self.call_queue = call_queue
+        self.service = service
+        self.retry_handler = retry_handler
+        self.circuit_breaker = circuit_breaker
+        self.service_name = service_name
+        self.concurrency = concurrency
+        self.pipeline = pipeline
+        self.on_complete = on_complete
+        self.clock = clock or current_clock
+        self.stream = stream
+        self.redrive = redrive
+        self.prefetcher = prefetcher
+
+        self.stats = {
+            "dispatched": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "skipped": 0,
+            "deferred": 0
+        }
+
+        self._stopping = None
+        self._checkpointed = getattr(call_queue, "checkpoint", None) is not None
+        self._active = 0
+        self._wake = None
+
+    def stop(self):
+        """
+        Stop dispatching new contacts. In-flight calls are allowed to finish.
+        """
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _call_service(self, contact, prefetch=None):
+        if self.pipeline is not None:
+            prefetched = None
+            if self.prefetcher is not None:
+                prefetched = await self.prefetcher.results(prefetch)
+            return await self.pipeline.run(contact, prefetched)
+
+        text = f"Hello {contact}"
+
+        stream = getattr(self.service, "text_to_speech_stream_async", None)
+        if self.stream and stream is not None:
+            audio_bytes = 0
+            async for chunk in self.retry_handler.stream_async(stream, self.circuit_breaker, text):
+                # Chunks would be forwarded to the call's media stream here
+                audio_bytes += len(chunk)
+            return audio_bytes
+
+        # Prefer the native coroutine; blocking clients run in a thread
+        tts = getattr(self.service, "text_to_speech_async", None)
+        if tts is not None:
+            return await self.retry_handler.execute_async(tts, self.circuit_breaker, text)
+
+        return await asyncio.to_thread(
+            self.retry_handler.execute,
+            self.service.text_to_speech,
+            self.circuit_breaker,
+            text
+        )
+
+    async def _handle_call(self, contact, prefetch=None):
+        """
+        Run one call; returns "succeeded", "failed" or "skipped".
+        """
+        log_event("INFO", "System", f"Processing call for {contact}")
+
+        if self.pipeline is None and not self.circuit_breaker.allow_request():
+            reason = f"circuit {self.circuit_breaker.state.value} — request not admitted"
+            self.stats["skipped"] += 1
+            self.call_queue.skip_contact(contact, reason)
+            self._defer(contact, self.service_name, reason)
+            return "skipped"
+
+        try:
+            await self._call_service(contact, prefetch)
+            self.stats["succeeded"] += 1
+            if self.redrive is not None:
+                self.redrive.completed(contact)
+
+            log_event(
+                "INFO",
+                self.service_name,
+                f"Call successful for {contact}",
+                circuit_state=self.circuit_breaker.state.value
+            )
+            return "succeeded"
+
+        except (CircuitOpenError, ConcurrencyLimitError, BulkheadFullError) as e:
+            self.stats["skipped"] += 1
+            self.call_queue.skip_contact(contact, str(e))
+            self._defer(contact, e.service_name or self.service_name, str(e))
+            return "skipped"
+
+        except TransientServiceError as e:
+            self.stats["failed"] += 1
+            service_name = e.service_name or self.service_name
+
+            log_event(
+                "ERROR",
+                service_name,
+                str(e),
+                retry_count=self.retry_handler.max_retries,
+                circuit_state=self.circuit_breaker.state.value
+            )
+            send_alert(service_name, "Transient failure, retries exhausted")
+            self._defer(contact, service_name, str(e))
+            return "failed"
+
+        except PermanentServiceError as e:
+            self.stats["failed"] += 1
+            service_name = e.service_name or self.service_name
+
+            log_event(
+                "CRITICAL",
+                service_name,
+                str(e),
+                circuit_state=self.circuit_breaker.state.value
+            )
+            send_alert(service_name, "Permanent failure detected")
+            self.stop()
+            return "failed"
+
+    def _defer(self, contact, service_name, reason):
+        if self.redrive is not None and self.redrive.defer(contact, service_name, reason) is not None:
+            self.stats["deferred"] += 1
+
+    def _notify_idle(self):
+        if self._wake is not None:
+            self._wake.set()
+            self._wake = asyncio.Event()
+
+    async def _idle_wait(self, timeout):
+        """
+        Sleep up to `timeout` seconds (None: until woken). Wakes early on
+        stop(), when a finished call may have re-queued its contact, and
+        when the redrive queue releases contacts after a breaker closes.
+        """
+        waits = [self._stopping.wait()]
+        if self.redrive is not None:
+            waits += [self._wake.wait(), self.redrive.wait_released()]
+        tasks = [asyncio.ensure_future(wait) for wait in waits]
+        try:
+            await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _wait_for_scheduled(self):
+        """
+        Sleep until the next scheduled contact is due (or stop is requested).
+        Returns False when nothing is left to wait for.
+
+        Only one idle worker sleeps on the schedule at a time; the rest
+        queue on the lock instead of all waking for every due contact.
+        """
+        has_pending = getattr(self.call_queue, "has_pending", None)
+        if has_pending is None or not has_pending():
+            if self.redrive is None or not self._active:
+                return False
+            # A call still in flight may hand its contact back for re-drive
+            await self._idle_wait(None)
+            return True
+
+        async with self._schedule_lock:
+            if self.call_queue.has_next() or self._stopping.is_set():
+                return True
+            next_ready = self.call_queue.next_ready_time()
+            delay = max(0.0, next_ready - self.clock.time()) if next_ready else 0.0
+            if self.redrive is not None:
+                await self._idle_wait(delay)
+                return True
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    async def _worker(self):
+        while not self._stopping.is_set():
+            if not self.call_queue.has_next():
+                if await self._wait_for_scheduled():
+                    continue
+                break
+
+            with start_trace("call") as traced:
+                with span("queue.next_call"):
+                    contact = self.call_queue.next_call()
+                traced.set("contact", contact)
+                prefetch = None
+                if self.prefetcher is not None:
+                    prefetch = self.prefetcher.claim(contact)
+                    self.prefetcher.refill()
+                self.stats["dispatched"] += 1
+                if self._checkpointed:
+                    await self.call_queue.dispatched()
+                self._active += 1
+                try:
+                    traced.set("outcome", await self._dispatch(contact, prefetch))
+                finally:
+                    self._active -= 1
+                    if self.prefetcher is not None:
+                        # Skipped or failed before its pipeline ran
+                        self.prefetcher.cancel(prefetch)
+                    self._notify_idle()
+
+    async def _dispatch(self, contact, prefetch=None):
+        if self.on_complete is None and not self._checkpointed:
+            return await self._handle_call(contact, prefetch)
+
+        started = self.clock.monotonic()
+        outcome = await self._handle_call(contact, prefetch)
+        if self._checkpointed:
+            self.call_queue.record_outcome(contact, outcome)
+        if self.on_complete is not None:
+            self.on_complete(contact, outcome, self.clock.monotonic() - started)
+        return outcome
+
+    def _install_signal_handlers(self, loop):
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not supported on this platform / not the main thread
+                pass
+
+    def _remove_signal_handlers(self, loop):
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.remove_signal_handler(sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+
+    async def run(self):
+        """
+        Run workers until the queue is drained or stop() is called.
+        Returns the run statistics including calls per second (None when
+        no time elapsed, e.g. on a virtual clock with instant services).
+        """
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._schedule_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._install_signal_handlers(loop)
+
+        # The queue being drained is the one the depth gauge reports
+        QUEUE_DEPTH.set_function(self.call_queue.__len__)
+        started = self.clock.monotonic()
+        try:
+            workers = [
+                asyncio.create_task(self._worker())
+                for _ in range(self.concurrency)
+            ]
+            await asyncio.gather(*workers)
+        finally:
+            QUEUE_DEPTH.set_function(None)
+            QUEUE_DEPTH.set(len(self.call_queue))
+            self._remove_signal_handlers(loop)
+            if self.prefetcher is not None:
+                self.prefetcher.close()
+            if self._checkpointed:
+                # Outcomes are not synced per call; make them durable now
+                self.call_queue.checkpoint.sync()
+
+        # Simulated time on a virtual clock
+        elapsed = self.clock.monotonic() - started
+        self.stats["elapsed"] = round(elapsed, 3)
+        self.stats["calls_per_second"] = (
+            round(self.stats["dispatched"] / elapsed, 2) if self.stats["elapsed"] > 0 else None
+        )
+
+        summary = f"Processed {self.stats['dispatched']} calls in {self.stats['elapsed']}s"
+        if self.clock.virtual:
+            summary += " of virtual time"
+        if self.stats["calls_per_second"] is not None:
+            summary += f" ({self.stats['calls_per_second']} calls/s)"
+        log_event("INFO", "CallEngine", summary)
+        return self.stats
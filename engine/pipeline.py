@@ -0,0 +1,186 @@
+# engine/pipeline.py
+
+import asyncio
+
+from clock.clock import current_clock
+from config import PIPELINE_CONFIG
+from errors.exceptions import BaseServiceError, CircuitOpenError
+from logs.log_manager import log_event
+from tracing.tracer import span
+
+GREETING_TEMPLATE = "Hello {contact}"
+
+
+class Stage:
+    """
+    One step of call setup.
+
+    - service: name in the ServiceRegistry (selects breaker and retry policy)
+    - method: service method to call (its `_async` variant is preferred)
+    - build_args: context -> tuple of positional args
+    - depends_on: stage names whose results must be in the context first
+    - optional: on failure or timeout, use `fallback` instead of failing the call
+    - cache: object with async lookup(*args) / store(result, *args); hits skip
+      the breaker and the service entirely, so they are served even while
+      the breaker is OPEN
+    """
+
+    def __init__(self, name, service, method, build_args, depends_on=(),
+                 optional=False, fallback=None, timeout=None, cache=None):
+        self.name = name
+        self.service = service
+        self.method = method
+        self.build_args = build_args
+        self.depends_on = tuple(depends_on)
+        self.optional = optional
+        self.fallback = fallback
+        self.timeout = timeout
+        self.cache = cache
+
+
+class CallPipeline:
+    """
+    Runs stages concurrently as soon as their dependencies finish, so
+    call setup takes as long as the critical path rather than the sum
+    of all stages. A failing critical stage cancels the rest and raises.
+    """
+
+    def __init__(self, stages, registry):
+        self.stages = list(stages)
+        self.registry = registry
+
+        seen = set()
+        for stage in self.stages:
+            missing = [d for d in stage.depends_on if d not in seen]
+            if missing:
+                raise ValueError(
+                    f"Stage {stage.name} depends on {missing}, which must be declared before it"
+                )
+            if stage.service not in registry:
+                raise ValueError(f"Stage {stage.name} uses unregistered service {stage.service}")
+            seen.add(stage.name)
+
+    async def _call(self, stage, context):
+        args = stage.build_args(context)
+        if stage.cache is not None:
+            cached = await stage.cache.lookup(*args)
+            if cached is not None:
+                return cached
+
+        result = await self._call_service(stage, args)
+        if stage.cache is not None:
+            stage.cache.store(result, *args)
+        return result
+
+    async def _call_service(self, stage, args):
+        entry = self.registry.get(stage.service)
+        breaker = entry.circuit_breaker
+
+        if not breaker.allow_request():
+            raise CircuitOpenError(
+                f"{stage.service} circuit {breaker.state.value} — request not admitted",
+                service_name=stage.service
+            )
+
+        call = entry.retry_handler.execute_async(
+            entry.method(stage.method), breaker, *args
+        )
+        if stage.timeout is None:
+            return await call
+
+        started = current_clock.monotonic()
+        try:
+            return await asyncio.wait_for(call, stage.timeout)
+        except asyncio.TimeoutError:
+            breaker.record_failure(duration=current_clock.monotonic() - started)
+            raise
+
+    async def _run_stage(self, stage, context, tasks, prefetched):
+        if stage.depends_on:
+            await asyncio.gather(*(tasks[name] for name in stage.depends_on))
+
+        if prefetched and stage.name in prefetched:
+            context[stage.name] = prefetched[stage.name]
+            return context[stage.name]
+
+        try:
+            with span("pipeline.stage", stage=stage.name, service=stage.service):
+                result = await self._call(stage, context)
+        except (BaseServiceError, asyncio.TimeoutError) as e:
+            if not stage.optional:
+                raise
+            log_event(
+                "WARNING",
+                stage.service,
+                "Stage %s degraded: %s",
+                args=(stage.name, str(e) or "timed out")
+            )
+            result = stage.fallback
+
+        context[stage.name] = result
+        return result
+
+    async def run(self, contact, prefetched=None):
+        """
+        Execute all stages for one contact and return the context dict
+        (contact plus one entry per stage). Stages with a result in
+        `prefetched` (see engine.prefetch.Prefetcher) are not run again.
+        """
+        context = {"contact": contact}
+        tasks = {}
+        for stage in self.stages:
+            tasks[stage.name] = asyncio.create_task(
+                self._run_stage(stage, context, tasks, prefetched)
+            )
+
+        pending = set(tasks.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    if task.exception() is not None:
+                        raise task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return context
+
+
+def build_call_pipeline(registry, tts_cache=None):
+    """
+    Default call setup: CRM lookup and greeting TTS in parallel, then an
+    LLM opener that uses the CRM record. CRM and LLM are optional.
+    The greeting uses the "TTS" fallback chain if registered.
+    `tts_cache` (cache.tts_cache.TTSCache) fronts the greeting TTS.
+    """
+    stages = []
+    if "CRM" in registry:
+        stages.append(Stage(
+            "crm", "CRM", "fetch_contact",
+            lambda ctx: (ctx["contact"],),
+            optional=True,
+            timeout=PIPELINE_CONFIG["crm_timeout"]
+        ))
+
+    # Prefer the provider fallback chain when one is registered
+    tts_name = "TTS" if "TTS" in registry else "ElevenLabs"
+    tts = registry.get(tts_name).service
+    stages.append(Stage(
+        "greeting", tts_name, "text_to_speech",
+        lambda ctx: (GREETING_TEMPLATE.format(contact=ctx["contact"]),),
+        cache=tts_cache.bind(tts) if tts_cache is not None else None
+    ))
+
+    if "LLM" in registry:
+        stages.append(Stage(
+            "opener", "LLM", "generate_reply",
+            lambda ctx: ("how are you today?", ctx.get("crm")),
+            depends_on=("crm",) if "CRM" in registry else (),
+            optional=True,
+            timeout=PIPELINE_CONFIG["llm_timeout"]
+        ))
+
+    return CallPipeline(stages, registry)
@@ -0,0 +1,239 @@
+# engine/prefetch.py
+
+import asyncio
+import inspect
+
+from circuit_breaker.bulkhead import Bulkhead
+from clock.clock import current_clock
+from errors.exceptions import BaseServiceError, TransientServiceError
+from logs.log_manager import log_event
+
+
+class Prefetcher:
+    """
+    Warms call setup for the next `window` ready contacts in the
+    CallQueue while earlier calls are active.
+
+    A prefetch runs the pipeline's stages once, in the background and in
+    declaration order. A stage only runs if its service's breaker is
+    fully CLOSED (not probing or ramping up) and its bulkhead, adaptive
+    concurrency limiter and rate limiter have room to spare right now -
+    no more than (1 - `headroom`) of their capacity in use - so
+    prefetching only uses capacity live calls leave idle and never
+    queues behind them: slots are only ever taken with try_acquire. A
+    provider chain (services.tts_chain) is prefetched straight from its
+    primary provider, which must have room as well; there is no failover
+    or hedging, so a prefetch never touches a fallback provider or takes
+    a HALF_OPEN probe. Stages are not retried; whatever is skipped or
+    fails is left to the live call. Cached stages (the greeting TTS) are
+    handed over through their cache; other results are held until the
+    contact is dialed and passed to CallPipeline.run().
+
+    At most `window` prefetches are held. A contact that leaves the
+    window, is skipped, or is still pending when the engine stops has its
+    prefetch cancelled and its results dropped.
+    """
+
+    def __init__(self, pipeline, call_queue, window=5, headroom=0.5, clock=None):
+        self.pipeline = pipeline
+        self.call_queue = call_queue
+        self.window = window
+        self.headroom = headroom
+        self.clock = clock or current_clock
+
+        self.stats = {
+            "started": 0,
+            "used": 0,
+            "cancelled": 0,
+            "stages_warmed": 0,
+            "stages_skipped": 0,
+            "stages_failed": 0
+        }
+        self._tasks = {}    # contact -> Task, in queue order
+
+    # ---- window -------------------------------------------------------
+
+    def refill(self):
+        """
+        Start prefetches for the contacts next in line; cancel those that
+        dropped out of the window (e.g. behind newly queued callbacks).
+        """
+        upcoming = self.call_queue.peek(self.window)
+        wanted = set(upcoming)
+        for contact in [c for c in self._tasks if c not in wanted]:
+            self._cancel(self._tasks.pop(contact))
+
+        for contact in upcoming:
+            if contact not in self._tasks:
+                self._tasks[contact] = asyncio.create_task(self._prefetch(contact))
+                self.stats["started"] += 1
+
+    def claim(self, contact):
+        """
+        Take a dequeued contact's prefetch out of the window; returns a
+        handle for results() / cancel(), or None.
+        """
+        return self._tasks.pop(contact, None)
+
+    async def results(self, handle):
+        """
+        Stage results of a claimed prefetch, waiting for it if it is
+        still running (its requests are already in flight).
+        """
+        if handle is None:
+            return None
+        try:
+            results = await handle
+        except Exception:
+            return None
+        if results:
+            self.stats["used"] += 1
+        return results
+
+    def cancel(self, handle):
+        if handle is not None:
+            self._cancel(handle)
+
+    def _cancel(self, task):
+        if not task.done():
+            task.cancel()
+            self.stats["cancelled"] += 1
+
+    def close(self):
+        for task in self._tasks.values():
+            self._cancel(task)
+        self._tasks.clear()
+
+    # ---- background work ----------------------------------------------
+
+    async def _prefetch(self, contact):
+        context = {"contact": contact}
+        results = {}
+        for stage in self.pipeline.stages:
+            if any(name not in context for name in stage.depends_on):
+                self.stats["stages_skipped"] += 1
+                continue
+            result = await self._warm(stage, context)
+            if result is None:
+                continue
+            context[stage.name] = result
+            # Cached stages hand over through their cache, not this window
+            if stage.cache is None:
+                results[stage.name] = result
+        return results
+
+    async def _warm(self, stage, context):
+        args = stage.build_args(context)
+        if stage.cache is not None:
+            cached = await stage.cache.lookup(*args)
+            if cached is not None:
+                return cached
+
+        targets = self._targets(self.pipeline.registry.get(stage.service))
+        acquired = self._admit(targets)
+        if acquired is None:
+            self.stats["stages_skipped"] += 1
+            return None
+
+        started = self.clock.monotonic()
+        error = None
+        try:
+            result = targets[-1].method(stage.method)(*args)
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, stage.timeout)
+        except (BaseServiceError, asyncio.TimeoutError) as e:
+            error = e
+            for target in targets:
+                target.circuit_breaker.record_failure(duration=self.clock.monotonic() - started)
+            self.stats["stages_failed"] += 1
+            log_event(
+                "DEBUG",
+                stage.service,
+                "Prefetch of stage %s for %s failed: %s",
+                args=(stage.name, context["contact"], str(e) or "timed out")
+            )
+            return None
+        finally:
+            self._release(acquired, self.clock.monotonic() - started, error)
+
+        for target in targets:
+            target.circuit_breaker.record_success(duration=self.clock.monotonic() - started)
+        if stage.cache is not None:
+            stage.cache.store(result, *args)
+        self.stats["stages_warmed"] += 1
+        return result
+
+    # ---- admission ----------------------------------------------------
+
+    def _has_room(self, entry):
+        busy = 1 - self.headroom
+        if not entry.circuit_breaker.fully_closed:
+            return False
+
+        bulkhead = entry.bulkhead
+        if bulkhead is not None and (bulkhead.queued or bulkhead.active >= bulkhead.max_concurrent * busy):
+            return False
+
+        limiter = entry.limiter
+        if limiter is not None and limiter.in_flight >= limiter.limit * busy:
+            return False
+
+        rate_limiter = entry.rate_limiter
+        if rate_limiter is not None and rate_limiter.available() < rate_limiter.burst * self.headroom + 1:
+            return False
+        return True
+
+    @staticmethod
+    def _targets(entry):
+        """
+        Entries a prefetch of `entry` calls through; the last one is
+        called. A provider chain is bypassed for its primary provider.
+        """
+        providers = getattr(entry.service, "entries", None)
+        if providers:
+            return (entry, providers[0])
+        return (entry,)
+
+    def _admit(self, targets):
+        """
+        Take a bulkhead slot, a concurrency slot and a rate token at every
+        target that has them, without waiting. Returns what was taken, or
+        None, holding nothing, if any target has no room to spare.
+        """
+        if not all(self._has_room(target) for target in targets):
+            return None
+
+        acquired = []
+        for target in targets:
+            for resource in (target.bulkhead, target.limiter):
+                if resource is None:
+                    continue
+                if not resource.try_acquire():
+                    self._release_unused(acquired)
+                    return None
+                acquired.append(resource)
+        # Rate tokens are spent, not returned: take them last
+        for target in targets:
+            rate_limiter = target.rate_limiter
+            if rate_limiter is not None and not rate_limiter.try_acquire(
+                keep=rate_limiter.burst * self.headroom
+            ):
+                self._release_unused(acquired)
+                return None
+        return acquired
+
+    @staticmethod
+    def _release_unused(acquired):
+        for resource in acquired:
+            if isinstance(resource, Bulkhead):
+                resource.release()
+            else:
+                resource.release_unused()
+
+    @staticmethod
+    def _release(acquired, duration, error):
+        for resource in acquired:
+            if isinstance(resource, Bulkhead):
+                resource.release()
+            else:
+                resource.release(duration, dropped=isinstance(error, TransientServiceError))
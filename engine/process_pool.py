@@ -0,0 +1,185 @@
+# engine/process_pool.py
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import RETRY_CONFIG, CIRCUIT_BREAKER_CONFIG, PROCESS_POOL_CONFIG
+from call_queue_module.call_queue import CallQueue, PRIORITY_COLD
+from circuit_breaker.shared_state import SharedBreakerState, SharedCircuitBreaker
+from engine.call_engine import CallEngine
+from logs import log_manager
+from logs.log_forwarder import LogCollector, forward_to, flush_forwarded
+from retry.retry_handler import RetryHandler
+
+# Set in each worker process by _init_worker
+_breaker_states = None
+_contact_queue = None
+
+
+def _init_worker(log_queue, log_levelno, breaker_states, contact_queue):
+    global _breaker_states, _contact_queue
+    _breaker_states = breaker_states
+    _contact_queue = contact_queue
+    forward_to(log_queue, log_levelno)
+
+
+def _queued_contacts():
+    # Chunks until this worker's end marker (None)
+    for chunk in iter(_contact_queue.get, None):
+        for contact in chunk:
+            if isinstance(contact, tuple):
+                yield contact
+            else:
+                yield contact, PRIORITY_COLD, None
+
+
+def _run_worker(service_factory, service_name, concurrency, retry_config, breaker_config):
+    service = service_factory()
+    breaker = SharedCircuitBreaker(service_name, _breaker_states[service_name], **breaker_config)
+    engine = CallEngine(
+        CallQueue(source=_queued_contacts()),
+        service,
+        RetryHandler(**retry_config),
+        breaker,
+        service_name=service_name,
+        concurrency=concurrency
+    )
+    try:
+        return asyncio.run(engine.run())
+    finally:
+        flush_forwarded()
+
+
+class ProcessCallPool:
+    """
+    Runs a campaign as one CallEngine per worker process.
+
+    Contacts are streamed to `processes` workers in chunks of `chunk_size`
+    through a queue holding at most `queued_chunks` chunks, so neither the
+    parent nor a worker ever holds more than a few chunks plus its
+    CallQueue buffer, and idle workers take the next chunk. Each worker
+    runs `concurrency` calls at once against its own instance from
+    `service_factory` (a picklable zero-argument callable, e.g. a service
+    class or functools.partial). The service's breaker state and failure
+    window live in shared memory, so one worker tripping it protects the
+    rest; `circuit_breaker` is the parent's view of it (e.g. for a
+    HealthChecker). Worker logs are forwarded to the parent's sinks, so
+    a single writer owns the log file.
+
+    Retry budgets, metrics and alert coalescing stay per process.
+    """
+
+    def __init__(self, service_factory, service_name="ElevenLabs", processes=None,
+                 concurrency=None, retry_config=None, breaker_config=None,
+                 start_method=None, chunk_size=None, queued_chunks=None):
+        self.service_factory = service_factory
+        self.service_name = service_name
+        self.processes = processes or PROCESS_POOL_CONFIG["processes"] or os.cpu_count() or 1
+        self.concurrency = concurrency or PROCESS_POOL_CONFIG["concurrency"]
+        self.chunk_size = chunk_size or PROCESS_POOL_CONFIG["chunk_size"]
+        self.queued_chunks = queued_chunks or PROCESS_POOL_CONFIG["queued_chunks"]
+        self.retry_config = retry_config or RETRY_CONFIG
+        self.breaker_config = breaker_config or CIRCUIT_BREAKER_CONFIG
+
+        self._ctx = multiprocessing.get_context(start_method or PROCESS_POOL_CONFIG["start_method"])
+        self.breaker_state = SharedBreakerState(
+            self.breaker_config.get("window_type", "count"),
+            self.breaker_config.get("window_size", 20),
+            self._ctx
+        )
+        self.circuit_breaker = SharedCircuitBreaker(
+            service_name, self.breaker_state, **self.breaker_config
+        )
+
+    def _feed(self, contacts, contact_queue, stopping, errors):
+        """
+        Parent-side feeder thread: chunk `contacts` into the bounded
+        queue, then one end marker per worker. Gives up once `stopping`
+        is set (a worker failed and nobody will drain the queue).
+        """
+        def put(item):
+            while not stopping.is_set():
+                try:
+                    contact_queue.put(item, timeout=0.2)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            contacts = iter(contacts)
+            for chunk in iter(lambda: list(itertools.islice(contacts, self.chunk_size)), []):
+                if not put(chunk):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(self.processes):
+                if not put(None):
+                    break
+
+    def run(self, contacts):
+        """
+        Dial every contact (any iterable, read lazily, of contacts or
+        (contact, priority, not_before) tuples); returns the summed
+        per-worker statistics with wall-clock elapsed time, overall calls
+        per second and each worker's own counts (`per_process`).
+        """
+        contact_queue = self._ctx.Queue(self.queued_chunks)
+        stopping = threading.Event()
+        feed_errors = []
+        feeder = threading.Thread(
+            target=self._feed, args=(contacts, contact_queue, stopping, feed_errors),
+            name="ProcessCallPool-feeder", daemon=True
+        )
+
+        log_queue = self._ctx.Queue()
+        collector = LogCollector(log_queue).start()
+        started = time.monotonic()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(log_queue, log_manager.min_level(),
+                          {self.service_name: self.breaker_state}, contact_queue)
+            ) as pool:
+                feeder.start()
+                futures = [
+                    pool.submit(
+                        _run_worker, self.service_factory, self.service_name,
+                        self.concurrency, self.retry_config, self.breaker_config
+                    )
+                    for _ in range(self.processes)
+                ]
+                try:
+                    results = [future.result() for future in futures]
+                finally:
+                    stopping.set()
+                    feeder.join()
+        finally:
+            collector.stop()
+        if feed_errors:
+            raise feed_errors[0]
+        elapsed = time.monotonic() - started
+
+        keys = ("dispatched", "succeeded", "failed", "skipped")
+        stats = {key: sum(result[key] for result in results) for key in keys}
+        stats["processes"] = self.processes
+        stats["per_process"] = [{key: result[key] for key in keys} for result in results]
+        stats["elapsed"] = round(elapsed, 3)
+        stats["calls_per_second"] = round(stats["dispatched"] / elapsed, 2) if elapsed > 0 else 0.0
+
+        log_manager.log_event(
+            "INFO",
+            "ProcessCallPool",
+            f"Processed {stats['dispatched']} calls in {stats['elapsed']}s on "
+            f"{stats['processes']} processes ({stats['calls_per_second']} calls/s)"
+        )
+        return stats
@@ -12,6 +12,28 @@ class TransientServiceError(BaseServiceError):
     pass
 
 
+class RateLimitError(TransientServiceError):
+    """Request throttled by the provider (e.g. HTTP 429); retry_after is its hint in seconds, if any"""
+    def __init__(self, message, service_name=None, retry_after=None):
+        super().__init__(message, service_name)
+        self.retry_after = retry_after
+
+
 class PermanentServiceError(BaseServiceError):
     """Errors that should NOT be retried (auth, invalid request)"""
     pass
+
+
+class CircuitOpenError(BaseServiceError):
+    """Request rejected because the service's circuit breaker is not admitting calls"""
+    pass
+
+
+class ConcurrencyLimitError(BaseServiceError):
+    """Request shed because the service's concurrency limit stayed full for too long"""
+    pass
+
+
+class BulkheadFullError(BaseServiceError):
+    """Request rejected because the service's bulkhead has no free slot or queue space"""
+    pass
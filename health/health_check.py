@@ -1,27 +1,30 @@
 # health/health_check.py
 
-import time
 from config import HEALTH_CHECK_CONFIG
-from logs.log_manager import log_event
+from health.scheduler import get_scheduler, default_probe
 
 
 class HealthChecker:
-    def __init__(self, service_name, service, circuit_breaker):
+    """
+    Registers a service with the shared HealthScheduler, which probes it
+    and resets its circuit breaker once the service recovers.
+    """
+
+    def __init__(self, service_name, service, circuit_breaker, probe=None, scheduler=None):
         self.service_name = service_name
         self.service = service
         self.circuit_breaker = circuit_breaker
+        self.probe = probe or default_probe(service)
+        self.scheduler = scheduler or get_scheduler()
 
     def start(self):
-        while True:
-            time.sleep(HEALTH_CHECK_CONFIG["interval"])
-
-            if not getattr(self.service, "fail_mode", False):
-                if self.circuit_breaker.state != self.circuit_breaker.state.CLOSED:
-                    self.circuit_breaker.record_success()
+        self.scheduler.register(
+            self.service_name,
+            self.probe,
+            self.circuit_breaker,
+            interval=HEALTH_CHECK_CONFIG["interval"]
+        )
+        self.scheduler.start()
 
-                    log_event(
-                        "INFO",
-                        self.service_name,
-                        "Health check successful. Circuit reset.",
-                        circuit_state=self.circuit_breaker.state.value
-                    )
+    def stop(self):
+        self.scheduler.unregister(self.service_name)
@@ -0,0 +1,317 @@
+# health/scheduler.py
+
+import heapq
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from clock.clock import current_clock
+from config import HEALTH_CHECK_CONFIG, ALERT_CONFIG
+from logs.log_manager import log_event
+from alerts.alert_manager import send_alert
+from circuit_breaker.circuit_breaker import CircuitState
+
+
+def default_probe(service):
+    """
+    Synthetic probe for a service: its health_check() if it has one,
+    otherwise the mock fail_mode flag.
+    """
+    check = getattr(service, "health_check", None)
+    if check is not None:
+        return check
+
+    def probe():
+        if getattr(service, "fail_mode", False):
+            raise RuntimeError("service in fail mode")
+    return probe
+
+
+class _Target:
+    __slots__ = (
+        "name", "probe", "circuit_breaker", "interval", "timeout",
+        "healthy_streak", "in_flight", "deadline", "generation",
+        "down_since", "last_alert_time"
+    )
+
+    def __init__(self, name, probe, circuit_breaker, interval, timeout):
+        self.name = name
+        self.probe = probe
+        self.circuit_breaker = circuit_breaker
+        self.interval = interval
+        self.timeout = timeout
+        self.healthy_streak = 0
+        self.in_flight = None
+        self.deadline = None
+        self.generation = 0
+        self.down_since = None
+        self.last_alert_time = 0
+
+
+class HealthScheduler:
+    """
+    One thread that health-checks any number of services.
+
+    Targets sit in a heap ordered by their next due time. Probes run on a
+    small worker pool with a timeout. Intervals adapt per target: while
+    its breaker is not CLOSED (or the last probe failed) it is probed
+    every `min_interval`; each healthy probe stretches the interval by
+    `backoff_factor` up to `max_interval`.
+
+    Under a virtual clock there is no thread: the scheduler runs from the
+    clock's timers and probes execute inline (timeouts do not apply).
+    """
+
+    def __init__(self, min_interval=1, max_interval=60, backoff_factor=2,
+                 timeout=5, workers=4, max_downtime=None, clock=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.workers = workers
+        self.max_downtime = max_downtime
+        self.clock = clock or current_clock
+
+        self._targets = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._executor = None
+        self._running = False
+        self._next_breaker_sweep = 0.0
+
+    # ---- registration -------------------------------------------------
+
+    def register(self, name, probe, circuit_breaker=None, interval=None, timeout=None):
+        """
+        Add (or replace) a target. `probe` is a callable that raises on
+        an unhealthy service.
+        """
+        target = _Target(
+            name, probe, circuit_breaker,
+            interval or self.min_interval,
+            timeout or self.timeout
+        )
+        with self._cond:
+            target.generation = next(self._seq)
+            self._targets[name] = target
+            self._push(target, self.clock.monotonic() + target.interval)
+            self._cond.notify()
+        return target
+
+    def unregister(self, name):
+        with self._cond:
+            self._targets.pop(name, None)
+
+    def _push(self, target, due):
+        heapq.heappush(self._heap, (due, next(self._seq), target.name, target.generation))
+
+    # ---- lifecycle ----------------------------------------------------
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+            if self.clock.virtual:
+                self.clock.call_later(0, self._tick)
+                return self
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="health-probe"
+            )
+            self._thread = threading.Thread(
+                target=self._run, name="health-scheduler", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._executor.shutdown(wait=False)
+            self._thread = self._executor = None
+
+    @property
+    def running(self):
+        return self._running
+
+    # ---- scheduling loop ---------------------------------------------
+
+    def _run(self):
+        with self._cond:
+            while self._running:
+                self._cond.wait(self._run_due())
+
+    def _tick(self):
+        # Virtual-clock driver: run what is due, then sleep until the next deadline
+        with self._cond:
+            if not self._running:
+                return
+            wait = self._run_due()
+        self.clock.call_later(wait, self._tick)
+
+    def _run_due(self):
+        """
+        Launch every due probe (lock held). Returns seconds until the next
+        deadline: a due probe, a probe timeout or the breaker sweep.
+        """
+        while True:
+            now = self.clock.monotonic()
+            self._expire_timeouts(now)
+            if now >= self._next_breaker_sweep:
+                self._tighten_tripped(now)
+
+            wait = None
+            if self._heap:
+                due, _, name, generation = self._heap[0]
+                if due <= now:
+                    heapq.heappop(self._heap)
+                    target = self._targets.get(name)
+                    if target is not None and target.generation == generation:
+                        self._launch(target, now)
+                    continue
+                wait = due - now
+
+            deadlines = [t.deadline for t in self._targets.values() if t.in_flight]
+            deadlines.append(self._next_breaker_sweep)
+            until_deadline = max(0.0, min(deadlines) - now)
+            return until_deadline if wait is None else min(wait, until_deadline)
+
+    def _launch(self, target, now):
+        if self._executor is None:
+            self._probe_inline(target, now)
+            return
+
+        target.deadline = now + target.timeout
+        target.in_flight = self._executor.submit(target.probe)
+        generation = target.generation
+        target.in_flight.add_done_callback(
+            lambda future: self._on_probe_done(target, generation, future)
+        )
+
+    def _probe_inline(self, target, now):
+        try:
+            target.probe()
+        except Exception as e:
+            self._settle(target, False, str(e), now)
+        else:
+            self._settle(target, True, None, now)
+
+    def _tighten_tripped(self, now):
+        """
+        Pull in the next probe of any target whose breaker tripped since
+        it was last scheduled, so OPEN services are probed at min_interval.
+        """
+        self._next_breaker_sweep = now + self.min_interval
+        for target in self._targets.values():
+            breaker = target.circuit_breaker
+            if breaker is None or breaker.state is CircuitState.CLOSED:
+                continue
+            if target.in_flight or target.interval <= self.min_interval:
+                continue
+            target.interval = self.min_interval
+            target.generation = next(self._seq)
+            self._push(target, now + self.min_interval)
+
+    def _expire_timeouts(self, now):
+        for target in list(self._targets.values()):
+            if target.in_flight and target.deadline <= now:
+                target.in_flight = None
+                self._settle(target, False, f"probe timed out after {target.timeout}s", now)
+
+    def _on_probe_done(self, target, generation, future):
+        with self._cond:
+            if target.generation != generation or target.in_flight is not future:
+                return  # timed out or target replaced
+            target.in_flight = None
+            error = future.exception()
+            detail = str(error) if error else None
+            self._settle(target, error is None, detail, self.clock.monotonic())
+            self._cond.notify()
+
+    # ---- outcome handling (lock held) ---------------------------------
+
+    def _settle(self, target, healthy, detail, now):
+        target.generation = next(self._seq)
+        breaker = target.circuit_breaker
+        breaker_closed = breaker is None or breaker.state is CircuitState.CLOSED
+
+        if healthy:
+            target.down_since = None
+            if not breaker_closed:
+                breaker.record_success()
+                log_event(
+                    "INFO",
+                    target.name,
+                    "Health check successful. Circuit reset.",
+                    circuit_state=breaker.state.value
+                )
+                target.healthy_streak = 0
+                target.interval = self.min_interval
+            else:
+                target.healthy_streak += 1
+                target.interval = min(
+                    self.max_interval,
+                    max(self.min_interval, target.interval * self.backoff_factor)
+                )
+        else:
+            target.healthy_streak = 0
+            target.interval = self.min_interval
+            if target.down_since is None:
+                target.down_since = now
+            log_event(
+                "WARNING",
+                target.name,
+                "Health probe failed: %s",
+                circuit_state=breaker.state.value if breaker else None,
+                args=(detail,)
+            )
+            self._check_downtime(target, now)
+
+        self._push(target, now + target.interval)
+
+    def _check_downtime(self, target, now):
+        if not self.max_downtime or target.down_since is None:
+            return
+        if now - target.down_since <= self.max_downtime:
+            return
+        if now - target.last_alert_time <= self.max_downtime:
+            return
+
+        target.last_alert_time = now
+        breaker = target.circuit_breaker
+        log_event(
+            "CRITICAL",
+            target.name,
+            "Dependency downtime exceeded threshold",
+            circuit_state=breaker.state.value if breaker else None
+        )
+        send_alert(target.name, "Service remains down beyond acceptable threshold")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Process-wide scheduler shared by every health check.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = HealthScheduler(
+                min_interval=HEALTH_CHECK_CONFIG["min_interval"],
+                max_interval=HEALTH_CHECK_CONFIG["max_interval"],
+                backoff_factor=HEALTH_CHECK_CONFIG["backoff_factor"],
+                timeout=HEALTH_CHECK_CONFIG["timeout"],
+                workers=HEALTH_CHECK_CONFIG["workers"],
+                max_downtime=ALERT_CONFIG["max_downtime"]
+            )
+        return _scheduler
@@ -0,0 +1,110 @@
+# logs/log_forwarder.py
+#
+# Routes log records from worker processes to the parent's sinks so one
+# writer owns the log file and the Sheets buffer.
+
+import threading
+import time
+
+from logs import log_manager
+from logs.log_record import LogRecord, LEVELS
+
+_FORWARD_BATCH = 200
+_FORWARD_INTERVAL = 0.5   # seconds a quiet worker may hold records
+
+
+class _Forwarder:
+    """
+    Worker-side sink: buffers records as plain tuples and ships them to
+    the parent in batches. WARNING and above are shipped immediately.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._batch = []
+        self._last_send = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        item = (
+            record.level, record.service, record.message,
+            record.retry_count, record.circuit_state, record.created, record.trace_id
+        )
+        with self._lock:
+            self._batch.append(item)
+            if (len(self._batch) < _FORWARD_BATCH
+                    and record.levelno < LEVELS["WARNING"]
+                    and time.monotonic() - self._last_send < _FORWARD_INTERVAL):
+                return
+            batch, self._batch = self._batch, []
+            self._last_send = time.monotonic()
+        self.queue.put(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch:
+            self.queue.put(batch)
+
+
+_forwarder = None
+
+
+def forward_to(queue, levelno=0):
+    """
+    In a worker process: replace the local sinks with one that forwards
+    every record at or above `levelno` (the parent's log_manager.min_level())
+    to the parent through `queue`. Per-sink levels and sampling are then
+    applied by the parent.
+    """
+    global _forwarder
+    for name in list(log_manager.get_sinks()):
+        log_manager.unregister_sink(name)
+    _forwarder = _Forwarder(queue)
+    level = next((name for name, number in LEVELS.items() if number >= levelno), "CRITICAL")
+    log_manager.register_sink("forward", _forwarder.write, level)
+    return _forwarder
+
+
+def flush_forwarded():
+    if _forwarder is not None:
+        _forwarder.flush()
+
+
+class LogCollector:
+    """
+    Parent-side thread that feeds forwarded records into the local sinks.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.received = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            for level, service, message, retry_count, circuit_state, created, trace_id in batch:
+                log_manager.dispatch_record(
+                    LogRecord(
+                        level, service, message, retry_count, circuit_state,
+                        created=created, trace_id=trace_id
+                    )
+                )
+            self.received += len(batch)
+
+    def stop(self, timeout=5.0):
+        """
+        Drain everything already queued, then stop.
+        """
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join(timeout)
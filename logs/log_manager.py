@@ -1,6 +1,123 @@
-from logs.logger import log
-from logs.sheets_logger import log_to_sheets
+import random
+import threading
 
-def log_event(level, service, message, retry_count=None, circuit_state=None):
-    log(level, service, message, retry_count, circuit_state)
-    log_to_sheets(level, service, message, retry_count, circuit_state)
+from config import LOG_SINKS
+from logs import logger, sheets_logger
+from logs.log_record import LEVELS, LogRecord, level_number
+from tracing.tracer import NOOP_SPAN, current_span, span
+
+_lock = threading.Lock()
+_sinks = {}
+_min_level = 0
+
+
+class Sink:
+    """
+    A registered log destination.
+
+    `level` drops records below it; `sample_rate` keeps only that share
+    of records below ERROR (errors and criticals are never sampled out).
+    """
+
+    __slots__ = ("name", "write", "levelno", "sample_rate")
+
+    def __init__(self, name, write, level="INFO", sample_rate=1.0):
+        self.name = name
+        self.write = write
+        self.levelno = level_number(level)
+        self.sample_rate = sample_rate
+
+    def accepts(self, levelno):
+        if levelno < self.levelno:
+            return False
+        if self.sample_rate < 1.0 and levelno < LEVELS["ERROR"]:
+            return random.random() < self.sample_rate
+        return True
+
+
+def _refresh_min_level():
+    global _min_level
+    _min_level = min((sink.levelno for sink in _sinks.values()), default=100)
+
+
+def register_sink(name, write, level="INFO", sample_rate=1.0):
+    """
+    Register (or replace) a sink. `write` receives a LogRecord.
+    """
+    with _lock:
+        _sinks[name] = Sink(name, write, level, sample_rate)
+        _refresh_min_level()
+
+
+def unregister_sink(name):
+    with _lock:
+        _sinks.pop(name, None)
+        _refresh_min_level()
+
+
+def get_sinks():
+    return dict(_sinks)
+
+
+def log_event(level, service, message, retry_count=None, circuit_state=None, args=None):
+    """
+    Fan a structured event out to every sink that wants it.
+
+    Records below every sink's threshold return before anything is
+    built. `message` may be a %-format string (with `args`) or a
+    zero-argument callable so it is only formatted if a sink keeps it.
+
+    Inside a sampled trace the record carries the trace id and the time
+    spent in the sinks is recorded as a "log" span.
+    """
+    levelno = level_number(level)
+    if levelno < _min_level:
+        return None
+
+    parent = current_span()
+    trace_id = None
+    traced = NOOP_SPAN
+    if parent is not None:
+        trace_id = f"{parent.trace_id:032x}"
+        traced = span("log", level=level, service=service)
+
+    record = None
+    with traced:
+        for sink in tuple(_sinks.values()):
+            if not sink.accepts(levelno):
+                continue
+            if record is None:
+                record = LogRecord(
+                    level, service, message, retry_count, circuit_state, args,
+                    trace_id=trace_id
+                )
+            try:
+                sink.write(record)
+            except Exception as e:
+                print(f"⚠ Log sink {sink.name} failed:", e)
+    return record
+
+
+def dispatch_record(record):
+    """
+    Fan an already-built record (e.g. one forwarded from a worker
+    process) out to every sink that wants it.
+    """
+    for sink in tuple(_sinks.values()):
+        if not sink.accepts(record.levelno):
+            continue
+        try:
+            sink.write(record)
+        except Exception as e:
+            print(f"⚠ Log sink {sink.name} failed:", e)
+
+
+def min_level():
+    """
+    Lowest level any sink accepts.
+    """
+    return _min_level
+
+
+register_sink("json", logger.write_record, **LOG_SINKS["json"])
+register_sink("sheets", sheets_logger.write_record, **LOG_SINKS["sheets"])
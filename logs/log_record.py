@@ -0,0 +1,101 @@
+# logs/log_record.py
+
+import json
+from datetime import datetime
+
+from clock.clock import current_clock
+
+LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50
+}
+
+
+def level_number(level):
+    return LEVELS.get(level, 0)
+
+
+class LogRecord:
+    """
+    Structured event shared by every sink.
+
+    The message is formatted, and the record converted to a dict / JSON /
+    sheet row, only when a sink first asks for it; the results are cached
+    so each record is serialized once no matter how many sinks consume it.
+    `message` may be a plain string, a %-format string with `args`, or a
+    zero-argument callable. `trace_id` links the record to a sampled
+    trace and is only serialized when set.
+    """
+
+    __slots__ = (
+        "level", "levelno", "service", "_message", "args",
+        "retry_count", "circuit_state", "created", "trace_id",
+        "_formatted", "_dict", "_json", "_row"
+    )
+
+    def __init__(self, level, service, message, retry_count=None,
+                 circuit_state=None, args=None, created=None, trace_id=None):
+        self.level = level
+        self.levelno = level_number(level)
+        self.service = service
+        self._message = message
+        self.args = args
+        self.retry_count = retry_count
+        self.circuit_state = circuit_state
+        self.created = current_clock.time() if created is None else created
+        self.trace_id = trace_id
+
+        self._formatted = None
+        self._dict = None
+        self._json = None
+        self._row = None
+
+    @property
+    def message(self):
+        if self._formatted is None:
+            message = self._message
+            if callable(message):
+                message = message()
+            elif self.args:
+                message = message % self.args
+            self._formatted = str(message)
+        return self._formatted
+
+    @property
+    def timestamp(self):
+        return datetime.utcfromtimestamp(self.created).isoformat()
+
+    def to_dict(self):
+        if self._dict is None:
+            self._dict = {
+                "timestamp": self.timestamp,
+                "level": self.level,
+                "service": self.service,
+                "message": self.message,
+                "retry_count": self.retry_count,
+                "circuit_state": self.circuit_state
+            }
+            if self.trace_id is not None:
+                self._dict["trace_id"] = self.trace_id
+        return self._dict
+
+    def to_json(self):
+        if self._json is None:
+            self._json = json.dumps(self.to_dict())
+        return self._json
+
+    def to_row(self):
+        if self._row is None:
+            entry = self.to_dict()
+            self._row = [
+                entry["timestamp"],
+                entry["level"],
+                entry["service"],
+                entry["message"],
+                entry["retry_count"],
+                entry["circuit_state"]
+            ]
+        return self._row
@@ -1,36 +1,230 @@
 # logs/logger.py
 
+import atexit
 import json
 import os
+import queue
+import sys
 import threading
-from datetime import datetime
-from config import LOG_FILE_PATH
+import time
+from config import LOG_FILE_PATH, LOG_CONFIG
+from logs.log_record import LogRecord, level_number
 
-_lock = threading.Lock()
+_STOP = object()
 
 # Ensure log directory exists
 os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
 
 
+class LogWriter:
+    """
+    Background writer for the JSON log.
+
+    Callers only enqueue entries; a single thread owns the file handle,
+    serializes entries, writes them in batches and rotates the file.
+    When the queue is full, entries below `drop_below` are dropped and
+    more severe ones wait up to `block_timeout` for space.
+    """
+
+    def __init__(self, path, console="pretty", queue_size=10000, batch_size=100,
+                 flush_interval=0.5, max_bytes=None, rotate_interval=None,
+                 backup_count=5, drop_below="WARNING", block_timeout=1.0):
+        self.path = path
+        self.console = console
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.drop_below = level_number(drop_below)
+        self.block_timeout = block_timeout
+
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._opened_at = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    # ---- caller side --------------------------------------------------
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, record):
+        if self._thread is None:
+            self.start()
+
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+
+        # Backpressure: only entries that matter wait for space
+        if record.levelno < self.drop_below:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put(record, timeout=self.block_timeout)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout=5.0):
+        """
+        Block until everything enqueued so far has been written.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def shutdown(self, timeout=5.0):
+        """
+        Flush remaining entries and stop the writer thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # ---- writer thread ------------------------------------------------
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+
+    def _should_rotate(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        if self.rotate_interval and time.time() - self._opened_at >= self.rotate_interval:
+            return True
+        return False
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def _format_console(self, record):
+        if self.console == "pretty":
+            return json.dumps(record.to_dict(), indent=2)
+        if self.console == "compact":
+            return f"{record.timestamp} {record.level:<8} {record.service}: {record.message}"
+        return None
+
+    def _write(self, batch):
+        lines = []
+        console = []
+        for record in batch:
+            lines.append(record.to_json())
+            text = self._format_console(record)
+            if text is not None:
+                console.append(text)
+
+        if console:
+            sys.stdout.write("\n".join(console) + "\n")
+            sys.stdout.flush()
+
+        self._file.write("\n".join(lines) + "\n")
+        if self._should_rotate():
+            self._rotate()
+
+    def _run(self):
+        try:
+            self._open()
+        except OSError as e:
+            print("⚠ Logging failed:", e)
+            return
+
+        batch = []
+        waiters = []
+        last_flush = time.monotonic()
+        stopping = False
+
+        while not stopping:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # Drain whatever else is already waiting, up to one batch
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if batch and (due or waiters or stopping or len(batch) >= self.batch_size):
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    print("⚠ Logging failed:", e)
+                batch = []
+
+            if due or waiters or stopping:
+                try:
+                    self._file.flush()
+                except Exception as e:
+                    print("⚠ Logging failed:", e)
+                last_flush = time.monotonic()
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+
+        self._file.close()
+
+
+_writer = LogWriter(LOG_FILE_PATH, **LOG_CONFIG)
+atexit.register(_writer.shutdown)
+
+
+def get_writer():
+    return _writer
+
+
+def flush():
+    _writer.flush()
+
+
+def shutdown():
+    _writer.shutdown()
+
+
+def write_record(record):
+    """
+    Sink entry point used by logs.log_manager.
+    """
+    # Serialization and file/console I/O happen on the writer thread
+    _writer.submit(record)
+
+
 def log(level, service, message, retry_count=None, circuit_state=None):
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "level": level,
-        "service": service,
-        "message": message,
-        "retry_count": retry_count,
-        "circuit_state": circuit_state
-    }
-
-    # Console output
-    print(json.dumps(log_entry, indent=2))
-
-    # File output (thread-safe)
-    try:
-        with _lock:
-            with open(LOG_FILE_PATH, "a") as f:
-                f.write(json.dumps(log_entry) + "\n")
-    except Exception as e:
-        print("⚠ Logging failed:", e)
-
-    return log_entry
+    record = LogRecord(level, service, message, retry_count, circuit_state)
+    write_record(record)
+    return record
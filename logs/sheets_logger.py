@@ -1,41 +1,233 @@
 # logs/sheets_logger.py
 
+import atexit
 import csv
 import os
 import threading
-from datetime import datetime
-from config import SHEETS_LOG_PATH
+import time
+from collections import deque
+from config import SHEETS_LOG_PATH, SHEETS_CONFIG
+from errors.exceptions import TransientServiceError
+from logs.log_record import LogRecord
 
-_lock = threading.Lock()
+HEADER = [
+    "timestamp",
+    "level",
+    "service",
+    "message",
+    "retry_count",
+    "circuit_state"
+]
 
 os.makedirs(os.path.dirname(SHEETS_LOG_PATH), exist_ok=True)
 
 
-def log_to_sheets(level, service, message, retry_count=None, circuit_state=None):
+class LocalSheetsBackend:
     """
-    CSV-based Google Sheets simulation logger
+    CSV-based Google Sheets stand-in.
+
+    Each append_rows() call is one "API request" and counts against a
+    per-minute quota, like spreadsheets.values.append does.
     """
-    file_exists = os.path.exists(SHEETS_LOG_PATH)
 
-    with _lock:
-        with open(SHEETS_LOG_PATH, "a", newline="") as f:
+    def __init__(self, path, requests_per_minute=60):
+        self.path = path
+        self.requests_per_minute = requests_per_minute
+        self._requests = deque()
+        self._header_written = os.path.exists(path)
+
+    def _check_quota(self):
+        now = time.time()
+        while self._requests and now - self._requests[0] >= 60:
+            self._requests.popleft()
+        if len(self._requests) >= self.requests_per_minute:
+            raise TransientServiceError(
+                "Sheets quota exceeded (429 RESOURCE_EXHAUSTED)",
+                service_name="GoogleSheets"
+            )
+        self._requests.append(now)
+
+    def append_rows(self, rows):
+        self._check_quota()
+
+        with open(self.path, "a", newline="") as f:
             writer = csv.writer(f)
+            if not self._header_written:
+                writer.writerow(HEADER)
+                self._header_written = True
+            writer.writerows(rows)
+
+
+class SheetsSink:
+    """
+    Buffered sink that flushes rows to a backend as one batch append
+    every `flush_interval` seconds or once `batch_size` rows are waiting.
+
+    Callers never block: rows are appended to an in-memory buffer and a
+    background thread does the I/O. Failed flushes are retried with
+    exponential backoff; if the buffer exceeds `max_buffer` the oldest
+    rows are discarded. Failures are reported through the log manager
+    once per outage, not once per attempt.
+    """
+
+    def __init__(self, backend, batch_size=100, flush_interval=5.0,
+                 max_buffer=50000, max_backoff=60.0):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_backoff = max_backoff
+
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+        self._failing = False
+        self._rows = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name="sheets-sink", daemon=True
+                )
+                self._thread.start()
+
+    def append(self, record):
+        if self._thread is None:
+            self.start()
+
+        with self._lock:
+            self._rows.append(record)
+            if len(self._rows) > self.max_buffer:
+                self._rows.popleft()
+                self.dropped += 1
+            full = len(self._rows) >= self.batch_size
+
+        if full:
+            self._wakeup.set()
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(self.batch_size, len(self._rows))
+            return [self._rows.popleft() for _ in range(count)]
+
+    def _requeue(self, batch):
+        with self._lock:
+            self._rows.extendleft(reversed(batch))
+
+    def _flush_once(self):
+        """
+        Send one batch. Returns False if the backend rejected it.
+        """
+        batch = self._take_batch()
+        if not batch:
+            return True
+        try:
+            self.backend.append_rows([record.to_row() for record in batch])
+            self.flushes += 1
+            self._failing = False
+            return True
+        except Exception as e:
+            self._requeue(batch)
+            self.failed_flushes += 1
+            if not self._failing:
+                self._failing = True
+                _report("WARNING", "Sheets flush failed, retrying with backoff: %s", (e,))
+            return False
 
-            if not file_exists:
-                writer.writerow([
-                    "timestamp",
-                    "level",
-                    "service",
-                    "message",
-                    "retry_count",
-                    "circuit_state"
-                ])
-
-            writer.writerow([
-                datetime.utcnow().isoformat(),
-                level,
-                service,
-                message,
-                retry_count,
-                circuit_state
-            ])
+    def _run(self):
+        backoff = 0.0
+        while True:
+            self._wakeup.wait(backoff or self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping:
+                return  # shutdown() makes the final attempt
+
+            # Drain full batches first, then whatever is left
+            while True:
+                if not self._flush_once():
+                    backoff = min(self.max_backoff, max(1.0, backoff * 2))
+                    break
+                backoff = 0.0
+                with self._lock:
+                    pending = len(self._rows)
+                if pending < self.batch_size:
+                    if pending:
+                        self._flush_once()
+                    break
+
+    def flush(self):
+        """
+        Synchronously push out everything buffered (best effort).
+        """
+        while self._rows:
+            if not self._flush_once():
+                break
+
+    def shutdown(self, timeout=5.0):
+        """
+        Stop the flush thread and make one bounded attempt to push out the
+        buffer: batches are sent until one fails or `timeout` passes, and
+        whatever is left is dropped and reported once.
+        """
+        deadline = time.monotonic() + timeout
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+        while self._rows and time.monotonic() < deadline:
+            if not self._flush_once():
+                break
+
+        with self._lock:
+            lost = len(self._rows)
+            self._rows.clear()
+        self.dropped += lost
+        if self.dropped:
+            _report(
+                "WARNING",
+                "Sheets sink shut down with %d row(s) never written "
+                "(%d left in the buffer at exit)",
+                (self.dropped, lost)
+            )
+
+
+def _report(level, message, args):
+    # log_manager imports this module to register the sink
+    from logs.log_manager import log_event
+    log_event(level, "GoogleSheets", message, args=args)
+
+
+_sink = SheetsSink(
+    LocalSheetsBackend(SHEETS_LOG_PATH, SHEETS_CONFIG["requests_per_minute"]),
+    batch_size=SHEETS_CONFIG["batch_size"],
+    flush_interval=SHEETS_CONFIG["flush_interval"],
+    max_buffer=SHEETS_CONFIG["max_buffer"],
+    max_backoff=SHEETS_CONFIG["max_backoff"]
+)
+atexit.register(_sink.shutdown)
+
+
+def get_sink():
+    return _sink
+
+
+def write_record(record):
+    """
+    Sink entry point used by logs.log_manager.
+    """
+    _sink.append(record)
+
+
+def log_to_sheets(level, service, message, retry_count=None, circuit_state=None):
+    """
+    CSV-based Google Sheets simulation logger
+    """
+    write_record(LogRecord(level, service, message, retry_count, circuit_state))
@@ -1,105 +1,140 @@
-import threading
-import time
+import argparse
+import asyncio
 
+from clock.clock import VirtualClock, current_clock, set_clock
 from services.elevenlabs_mock import ElevenLabsService
-from retry.retry_handler import RetryHandler
-from circuit_breaker.circuit_breaker import CircuitBreaker
-from alerts.alert_manager import send_alert
-from logs.logger import log
-from logs.sheets_logger import log_to_sheets
-from errors.exceptions import TransientServiceError, PermanentServiceError
-from call_queue_module.call_queue import CallQueue  
+from services.crm_mock import CRMService
+from services.llm_mock import LLMService
+from services.backup_tts_mock import BackupTTSService
+from services.registry import ServiceRegistry
+from services.tts_chain import TTSFallbackChain
+from retry.retry_budget import RetryBudget
+from call_queue_module.call_queue import CallQueue
+from call_queue_module.checkpoint import CallCheckpoint
+from call_queue_module.redrive import RedriveQueue
 from health.health_check import HealthChecker
-from config import RETRY_CONFIG, CIRCUIT_BREAKER_CONFIG
+from engine.call_engine import CallEngine
+from engine.pipeline import build_call_pipeline, GREETING_TEMPLATE
+from engine.prefetch import Prefetcher
+from cache.tts_cache import TTSCache, template_static_parts
+from metrics.server import start_metrics_server
+from tracing.exporters import build_exporter
+from tracing.tracer import configure_tracing
+from config import (
+    ENGINE_CONFIG, TTS_CACHE_CONFIG, TTS_CHAIN_CONFIG, METRICS_CONFIG, CHECKPOINT_CONFIG,
+    REDRIVE_CONFIG, TRACING_CONFIG, PREFETCH_CONFIG
+)
+
+
+async def run_campaign(engine, elevenlabs):
+    # Simulate service recovery after some time
+    asyncio.get_running_loop().call_later(2, setattr, elevenlabs, "fail_mode", False)
+    return await engine.run()
+
+
+def main(virtual_time=False):
+    # Virtual time: backoff, recovery timeouts and health checks run at CPU speed
+    if virtual_time:
+        set_clock(VirtualClock())
+
+    # Sampled per-call spans for flame-style latency breakdowns
+    if TRACING_CONFIG["enabled"]:
+        configure_tracing(
+            TRACING_CONFIG["sample_rate"],
+            build_exporter(
+                TRACING_CONFIG["format"], TRACING_CONFIG["path"], TRACING_CONFIG["batch_size"]
+            )
+        )
 
+    # Prometheus scrape endpoint (GET /metrics)
+    if METRICS_CONFIG["enabled"]:
+        start_metrics_server()
 
-def main():
-    # Initialize service
+    # Initialize services; each gets its own circuit breaker and retry policy
     elevenlabs = ElevenLabsService()
 
-    # Initialize retry handler
-    retry_handler = RetryHandler(
-        max_retries=RETRY_CONFIG["max_retries"],
-        initial_delay=RETRY_CONFIG["initial_delay"],
-        backoff_factor=RETRY_CONFIG["backoff_factor"]
-    )
-
-    # Initialize circuit breaker
-    circuit_breaker = CircuitBreaker(
-        service_name="ElevenLabs",
-        failure_threshold=CIRCUIT_BREAKER_CONFIG["failure_threshold"],
-        recovery_timeout=CIRCUIT_BREAKER_CONFIG["recovery_timeout"]
+    registry = ServiceRegistry()
+    registry.register("ElevenLabs", elevenlabs)
+    registry.register("BackupTTS", BackupTTSService())
+    registry.register("CRM", CRMService())
+    registry.register("LLM", LLMService())
+
+    # Ordered TTS fallback chain with hedging, exposed as one "TTS" service
+    tts_chain = TTSFallbackChain(
+        [registry.get(name) for name in TTS_CHAIN_CONFIG["providers"]],
+        hedge_percentile=TTS_CHAIN_CONFIG["hedge_percentile"],
+        min_hedge_delay=TTS_CHAIN_CONFIG["min_hedge_delay"],
+        hedge_budget=RetryBudget(**TTS_CHAIN_CONFIG["hedge_budget"]),
+        hedge_same_provider=TTS_CHAIN_CONFIG["hedge_same_provider"],
+        enabled=TTS_CHAIN_CONFIG["hedging"]
     )
+    tts = registry.register("TTS", tts_chain)
+
+    # Content-addressed TTS cache; stock phrases are rendered up front
+    tts_cache = None
+    if TTS_CACHE_CONFIG["enabled"]:
+        tts_cache = TTSCache(
+            disk_path=TTS_CACHE_CONFIG["disk_path"],
+            memory_bytes=TTS_CACHE_CONFIG["memory_bytes"],
+            disk_bytes=TTS_CACHE_CONFIG["disk_bytes"],
+            ttl=TTS_CACHE_CONFIG["ttl"]
+        )
+        phrases = TTS_CACHE_CONFIG["prerender"] + template_static_parts(GREETING_TEMPLATE)
+        tts_cache.bind(tts_chain).prerender(list(dict.fromkeys(phrases)))
+
+    # Call queue (graceful degradation); with checkpointing a restarted
+    # campaign resumes where it stopped instead of re-dialing everyone
+    checkpoint = None
+    if CHECKPOINT_CONFIG["enabled"]:
+        checkpoint = CallCheckpoint(
+            CHECKPOINT_CONFIG["directory"],
+            snapshot_every=CHECKPOINT_CONFIG["snapshot_every"],
+            group_commit_delay=CHECKPOINT_CONFIG["group_commit_delay"]
+        )
 
-    # Call queue (graceful degradation)
     call_queue = CallQueue([
         "Contact-1",
         "Contact-2",
         "Contact-3",
         "Contact-4"
-    ])
-
-    # Start health checker in background
-    health_checker = HealthChecker("ElevenLabs", elevenlabs, circuit_breaker)
-    threading.Thread(target=health_checker.start, daemon=True).start()
-
-    # Process calls
-    while call_queue.has_next():
-        contact = call_queue.next_call()
-        log("INFO", "System", f"Processing call for {contact}")
-
-        if not circuit_breaker.allow_request():
-            log(
-                "WARNING",
-                "ElevenLabs",
-                "Circuit OPEN. Skipping call.",
-                circuit_state=circuit_breaker.state.value
-            )
-            continue
-
-        try:
-            # ✅ Corrected: pass only the arguments intended for text_to_speech
-            retry_handler.execute(
-                elevenlabs.text_to_speech,  # method
-                circuit_breaker,            # CircuitBreaker object
-                f"Hello {contact}"          # forwarded to text_to_speech(text)
-            )
-
-            log(
-                "INFO",
-                "ElevenLabs",
-                f"Call successful for {contact}",
-                circuit_state=circuit_breaker.state.value
-            )
-
-        except TransientServiceError as e:
-            log(
-                "ERROR",
-                "ElevenLabs",
-                str(e),
-                retry_count=RETRY_CONFIG["max_retries"],
-                circuit_state=circuit_breaker.state.value
-            )
-
-            log_to_sheets("ElevenLabs", "Transient", str(e))
-            send_alert("ElevenLabs", "Transient failure, retries exhausted")
-
-        except PermanentServiceError as e:
-            log(
-                "CRITICAL",
-                "ElevenLabs",
-                str(e),
-                circuit_state=circuit_breaker.state.value
-            )
-
-            log_to_sheets("ElevenLabs", "Permanent", str(e))
-            send_alert("ElevenLabs", "Permanent failure detected")
-            break
-
-        # Simulate service recovery after some time
-        time.sleep(2)
-        elevenlabs.fail_mode = False
+    ], checkpoint=checkpoint)
+
+    # Failed or skipped contacts are retried later instead of dropped
+    redrive = None
+    redrive_config = dict(REDRIVE_CONFIG)
+    if redrive_config.pop("enabled"):
+        redrive = RedriveQueue(call_queue, **redrive_config)
+        for entry in registry:
+            redrive.watch(entry.circuit_breaker)
+
+    # Register every dependency with the shared background health scheduler
+    for entry in registry:
+        HealthChecker(entry.name, entry.service, entry.circuit_breaker).start()
+
+    # Upcoming contacts' setup is warmed while earlier calls are active
+    pipeline = build_call_pipeline(registry, tts_cache)
+    prefetcher = None
+    prefetch_config = dict(PREFETCH_CONFIG)
+    if prefetch_config.pop("enabled"):
+        prefetcher = Prefetcher(pipeline, call_queue, **prefetch_config)
+
+    # Process calls concurrently through the multi-service pipeline
+    engine = CallEngine(
+        call_queue,
+        elevenlabs,
+        tts.retry_handler,
+        tts.circuit_breaker,
+        service_name="TTS",
+        concurrency=ENGINE_CONFIG["concurrency"],
+        pipeline=pipeline,
+        redrive=redrive,
+        prefetcher=prefetcher
+    )
+    return current_clock.run(run_campaign(engine, elevenlabs))
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--virtual-time", action="store_true",
+                        help="simulate on a virtual clock instead of wall-clock time")
+    main(parser.parse_args().virtual_time)
@@ -0,0 +1,109 @@
+# metrics/instruments.py
+#
+# Metric families shared by the resilience components.
+
+from config import METRICS_CONFIG
+from metrics.registry import REGISTRY
+
+SERVICE_CALLS = REGISTRY.counter(
+    "service_calls_total",
+    "Service call attempts by outcome (success, transient_error, permanent_error)",
+    ("service", "outcome")
+)
+SERVICE_LATENCY = REGISTRY.histogram(
+    "service_call_duration_seconds",
+    "Latency of individual service call attempts",
+    ("service",),
+    buckets=METRICS_CONFIG["latency_buckets"]
+)
+TIME_TO_FIRST_AUDIO = REGISTRY.histogram(
+    "time_to_first_audio_seconds",
+    "Time from a streaming request (including retries) to its first audio chunk",
+    ("service",),
+    buckets=METRICS_CONFIG["latency_buckets"]
+)
+RETRIES = REGISTRY.counter(
+    "retries_total",
+    "Retries scheduled after a transient failure",
+    ("service",)
+)
+RETRIES_EXHAUSTED = REGISTRY.counter(
+    "retries_exhausted_total",
+    "Calls given up on, by reason (max_retries, budget, retry_after)",
+    ("service", "reason")
+)
+
+BREAKER_STATE = REGISTRY.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 = CLOSED, 1 = HALF_OPEN, 2 = OPEN)",
+    ("service",)
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes by target state",
+    ("service", "state")
+)
+BREAKER_OPEN_SECONDS = REGISTRY.counter(
+    "circuit_breaker_open_seconds_total",
+    "Time spent OPEN, added when the breaker leaves OPEN",
+    ("service",)
+)
+BREAKER_REJECTED = REGISTRY.counter(
+    "circuit_breaker_rejected_total",
+    "Requests not admitted by the circuit breaker",
+    ("service",)
+)
+
+LIMITER_LIMIT = REGISTRY.gauge(
+    "concurrency_limit",
+    "Current adaptive concurrency limit",
+    ("service",)
+)
+LIMITER_IN_FLIGHT = REGISTRY.gauge(
+    "concurrency_in_flight",
+    "Requests holding a concurrency limiter slot",
+    ("service",)
+)
+LIMITER_REJECTED = REGISTRY.counter(
+    "concurrency_limit_rejected_total",
+    "Requests shed after waiting max_wait for a concurrency slot",
+    ("service",)
+)
+
+BULKHEAD_ACTIVE = REGISTRY.gauge(
+    "bulkhead_active",
+    "Calls holding a bulkhead slot",
+    ("service",)
+)
+BULKHEAD_QUEUED = REGISTRY.gauge(
+    "bulkhead_queued",
+    "Calls waiting for a bulkhead slot",
+    ("service",)
+)
+BULKHEAD_REJECTED = REGISTRY.counter(
+    "bulkhead_rejected_total",
+    "Calls rejected by a bulkhead, by reason (full, timeout)",
+    ("service", "reason")
+)
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "call_queue_depth",
+    "Contacts waiting in the call queue being drained (ready + scheduled)"
+)
+REDRIVE_DEFERRED = REGISTRY.counter(
+    "redrive_deferred_total",
+    "Failed or skipped contacts rescheduled for another attempt",
+    ("service",)
+)
+REDRIVE_RELEASED = REGISTRY.counter(
+    "redrive_released_total",
+    "Deferred contacts re-driven early because the service's breaker closed",
+    ("service",)
+)
+DEAD_LETTERS = REGISTRY.counter(
+    "redrive_dead_letters_total",
+    "Contacts given up on after max_attempts deferrals",
+    ("service",)
+)
+
+BREAKER_STATE_VALUES = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
@@ -0,0 +1,123 @@
+# metrics/server.py
+#
+# Usage:
+#   python -m metrics.server            # serve the process registry on METRICS_CONFIG port
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_CONFIG
+from logs.log_manager import log_event
+from metrics.registry import REGISTRY
+
+try:
+    from flask import Flask, Response
+    from werkzeug.serving import make_server
+except ImportError:  # Flask is optional; fall back to the standard library
+    Flask = None
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_app(registry=REGISTRY):
+    """
+    Flask app exposing GET /metrics. Requires Flask.
+    """
+    if Flask is None:
+        raise RuntimeError("Flask is not installed")
+
+    app = Flask(__name__)
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype=CONTENT_TYPE)
+
+    return app
+
+
+class MetricsServer:
+    """
+    Background HTTP server for Prometheus scrapes at /metrics.
+
+    Uses the Flask app when Flask is installed, otherwise a plain
+    http.server handler with the same output.
+    """
+
+    def __init__(self, host="127.0.0.1", port=9100, registry=REGISTRY):
+        self.registry = registry
+        if Flask is not None:
+            self._server = make_server(host, port, create_app(registry), threaded=True)
+        else:
+            self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def _handler_class(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def start_metrics_server(host=None, port=None, registry=REGISTRY):
+    """
+    Start the scrape endpoint; returns None (and logs why) if the port
+    cannot be bound, so a busy port never stops the process.
+    """
+    host = host or METRICS_CONFIG["host"]
+    port = METRICS_CONFIG["port"] if port is None else port
+    try:
+        server = MetricsServer(host, port, registry)
+    except OSError as e:
+        log_event(
+            "WARNING",
+            "Metrics",
+            "Metrics endpoint disabled: cannot bind %s:%s (%s)",
+            args=(host, port, e)
+        )
+        return None
+    return server.start()
+
+
+if __name__ == "__main__":
+    server = start_metrics_server()
+    if server is None:
+        raise SystemExit(1)
+    print(f"Serving metrics on {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
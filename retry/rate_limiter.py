@@ -0,0 +1,109 @@
+# retry/rate_limiter.py
+
+import asyncio
+import threading
+
+from clock.clock import current_clock
+
+
+class RateLimiter:
+    """
+    Token bucket in front of one provider quota (a service and API key).
+
+    Every request takes a token; tokens refill at `requests_per_second`
+    up to `burst`. Callers that find the bucket empty reserve the next
+    token and wait for it, so requests leave at the quota rate instead of
+    being rejected by the provider. pause() applies a Retry-After hint to
+    every caller: no new tokens are handed out until it has passed, and
+    traffic then resumes at the quota rate rather than in a burst.
+    """
+
+    def __init__(self, requests_per_second=10, burst=None, clock=None):
+        self.rate = requests_per_second
+        self.burst = burst or requests_per_second
+        self.clock = clock or current_clock
+
+        self._tokens = float(self.burst)
+        self._last_refill = self.clock.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # _last_refill is in the future while paused
+        if now <= self._last_refill:
+            return
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def reserve(self):
+        """
+        Take a token; returns the seconds to wait before using it.
+        """
+        with self._lock:
+            now = self.clock.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._last_refill - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def available(self):
+        """
+        Tokens that could be taken right now without waiting.
+        """
+        with self._lock:
+            now = self.clock.monotonic()
+            self._refill(now)
+            if now < self._last_refill:
+                return 0.0  # paused
+            return max(0.0, self._tokens)
+
+    def try_acquire(self, keep=0.0):
+        """
+        Take a token only if one is free now and `keep` more remain for
+        other callers; never waits.
+        """
+        with self._lock:
+            now = self.clock.monotonic()
+            self._refill(now)
+            if now < self._last_refill or self._tokens < keep + 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            self.clock.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Hold every caller back for `seconds` (e.g. a Retry-After header).
+        """
+        with self._lock:
+            now = self.clock.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 1.0)
+            self._last_refill = max(self._last_refill, now + seconds)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter_for(service_name, api_key=None, **config):
+    """
+    Shared RateLimiter for a (service, API key) quota; `config` is only
+    used when the first caller creates it.
+    """
+    key = (service_name, api_key)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(**config)
+        return limiter
@@ -0,0 +1,62 @@
+# retry/retry_budget.py
+
+import threading
+
+from clock.clock import current_clock
+from config import RETRY_BUDGET_CONFIG
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries relative to successful calls.
+
+    Every success deposits `ratio` tokens and every retry withdraws one,
+    so retries can add at most `ratio` extra load on top of the traffic
+    that is actually succeeding. A small `min_retries_per_second` refill
+    keeps retries possible when there is no success traffic yet.
+    """
+
+    def __init__(self, ratio=0.2, min_retries_per_second=1, max_tokens=10, clock=None):
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self.clock = clock or current_clock
+
+        self._tokens = float(max_tokens)
+        self._last_refill = self.clock.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock.monotonic()
+        # Clamped: the process clock may be swapped (e.g. for virtual time)
+        elapsed = max(0.0, now - self._last_refill)
+        self._last_refill = now
+        self._tokens = min(
+            self.max_tokens,
+            self._tokens + elapsed * self.min_retries_per_second
+        )
+
+    def record_success(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self):
+        """
+        Withdraw one retry token. Returns False when the budget is spent.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+# Process-wide budget shared by every RetryHandler
+shared_retry_budget = RetryBudget(**RETRY_BUDGET_CONFIG)
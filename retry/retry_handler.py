@@ -1,13 +1,191 @@
-import time
-from errors.exceptions import TransientServiceError
+import asyncio
+import inspect
+import random
+from clock.clock import current_clock
+from errors.exceptions import BaseServiceError, TransientServiceError, BulkheadFullError
 from logs.log_manager import log_event
+from metrics.instruments import (
+    SERVICE_CALLS, SERVICE_LATENCY, RETRIES, RETRIES_EXHAUSTED, TIME_TO_FIRST_AUDIO
+)
+from retry.retry_budget import shared_retry_budget
+from tracing.tracer import span
+
+
+JITTER_MODES = ("none", "full", "decorrelated")
 
 
 class RetryHandler:
-    def __init__(self, max_retries=3, initial_delay=5, backoff_factor=2):
+    def __init__(self, max_retries=3, initial_delay=5, backoff_factor=2,
+                 jitter="none", max_delay=60, retry_budget=None, clock=None,
+                 concurrency_limiter=None, rate_limiter=None, bulkhead=None):
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"Unknown jitter mode: {jitter}")
+
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget or shared_retry_budget
+        self.clock = clock or current_clock
+        # Async attempts hold one of its slots while in flight
+        self.concurrency_limiter = concurrency_limiter
+        # Every attempt takes a token; Retry-After hints pause it
+        self.rate_limiter = rate_limiter
+        # Async calls hold one of its slots across all attempts
+        self.bulkhead = bulkhead
+
+    def _next_delay(self, attempt, previous_delay):
+        """
+        Backoff delay before retry number `attempt` (1-based).
+
+        - none: initial_delay * backoff_factor ** (attempt - 1)
+        - full: uniform(0, exponential delay)
+        - decorrelated: uniform(initial_delay, previous_delay * 3)
+        """
+        if self.jitter == "decorrelated":
+            upper = max(self.initial_delay, previous_delay * 3)
+            delay = random.uniform(self.initial_delay, upper)
+        else:
+            delay = self.initial_delay * self.backoff_factor ** (attempt - 1)
+            if self.jitter == "full":
+                delay = random.uniform(0, delay)
+
+        return min(delay, self.max_delay)
+
+    def _attempts(self):
+        # max_retries counts attempts; even 0 makes the call once
+        return range(1, max(self.max_retries, 1) + 1)
+
+    @staticmethod
+    def _service_name(func):
+        owner = getattr(func, "__self__", None)
+        if owner is not None:
+            return owner.__class__.__name__
+        return "Service"
+
+    @staticmethod
+    def _metric_label(service_name, circuit_breaker):
+        # Breaker names match the registry/config service names
+        return circuit_breaker.service_name if circuit_breaker else service_name
+
+    def _on_success(self, service_name, circuit_breaker, duration):
+        label = self._metric_label(service_name, circuit_breaker)
+        SERVICE_CALLS.labels(label, "success").inc()
+        SERVICE_LATENCY.labels(label).observe(duration)
+        self.retry_budget.record_success()
+
+        # Record success in circuit breaker if provided
+        if circuit_breaker:
+            circuit_breaker.record_success(duration=duration)
+
+    def _on_transient_error(self, error, attempt, service_name, circuit_breaker,
+                            previous_delay, duration):
+        """
+        Log a failed attempt and decide whether to retry.
+        Returns the delay before the next attempt, or None to give up.
+
+        A throttling error's retry_after replaces the backoff delay; hints
+        longer than max_delay give up instead of holding the call.
+        """
+        label = self._metric_label(service_name, circuit_breaker)
+        SERVICE_CALLS.labels(label, "transient_error").inc()
+        SERVICE_LATENCY.labels(label).observe(duration)
+
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None and self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after)
+
+        circuit_state = circuit_breaker.state.value if circuit_breaker else None
+        give_up = attempt >= self.max_retries
+        if give_up:
+            RETRIES_EXHAUSTED.labels(label, "max_retries").inc()
+        elif retry_after is not None and retry_after > self.max_delay:
+            RETRIES_EXHAUSTED.labels(label, "retry_after").inc()
+            log_event(
+                "WARNING",
+                service_name,
+                "Throttled with Retry-After %.2fs (max_delay %.2fs): %s",
+                retry_count=attempt,
+                circuit_state=circuit_state,
+                args=(retry_after, self.max_delay, error)
+            )
+            give_up = True
+
+        if not give_up and not self.retry_budget.try_acquire():
+            RETRIES_EXHAUSTED.labels(label, "budget").inc()
+            log_event(
+                "WARNING",
+                service_name,
+                f"Retry budget exhausted after attempt {attempt}: {str(error)}",
+                retry_count=attempt,
+                circuit_state=circuit_state
+            )
+            give_up = True
+
+        if give_up:
+            log_event(
+                "ERROR",
+                service_name,
+                "All retries exhausted. Raising error.",
+                retry_count=attempt,
+                circuit_state=circuit_state
+            )
+
+            if circuit_breaker:
+                circuit_breaker.record_failure(duration=duration)
+            return None
+
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = self._next_delay(attempt, previous_delay)
+        RETRIES.labels(label).inc()
+
+        log_event(
+            "WARNING",
+            service_name,
+            "Retry %d/%d failed: %s. Retrying in %.2fs",
+            retry_count=attempt,
+            circuit_state=circuit_state,
+            args=(attempt, self.max_retries, error, delay)
+        )
+        return delay
+
+    def _on_stream_error(self, error, service_name, circuit_breaker, duration):
+        """
+        A stream failed after its first chunk: too late to retry.
+        """
+        label = self._metric_label(service_name, circuit_breaker)
+        outcome = "transient_error" if isinstance(error, TransientServiceError) else "permanent_error"
+        SERVICE_CALLS.labels(label, outcome).inc()
+
+        log_event(
+            "ERROR",
+            service_name,
+            "Stream failed after first chunk: %s",
+            circuit_state=circuit_breaker.state.value if circuit_breaker else None,
+            args=(error,)
+        )
+        if circuit_breaker:
+            circuit_breaker.record_failure(duration=duration)
+
+    async def _enter_bulkhead(self, circuit_breaker):
+        try:
+            await self.bulkhead.acquire()
+        except BulkheadFullError:
+            # A saturated dependency is unhealthy: let the breaker count it
+            if circuit_breaker:
+                circuit_breaker.record_failure()
+            raise
+
+    async def _before_attempt_async(self, limiter):
+        if self.rate_limiter is not None:
+            with span("rate_limit.wait"):
+                await self.rate_limiter.acquire_async()
+        if limiter is not None:
+            with span("concurrency_limit.wait"):
+                await limiter.acquire()
 
     def execute(self, func, circuit_breaker=None, *args, **kwargs):
         """
@@ -20,46 +198,236 @@ class RetryHandler:
         """
 
         delay = self.initial_delay
+        service_name = self._service_name(func)
 
-        # Try to get service name for logging
-        service_name = getattr(func.__self__, '__class__', None)
-        if service_name:
-            service_name = service_name.__name__
-        else:
-            service_name = "Service"
-
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                # Only forward *args intended for the actual service function
-                result = func(*args, **kwargs)
-
-                # Record success in circuit breaker if provided
-                if circuit_breaker:
-                    circuit_breaker.record_success()
-
-                return result
-
-            except TransientServiceError as e:
-                log_event(
-                    "WARNING",
-                    service_name,
-                    f"Retry {attempt}/{self.max_retries} failed: {str(e)}. Retrying in {delay}s",
-                    retry_count=attempt,
-                    circuit_state=circuit_breaker.state.value if circuit_breaker else None
-                )
-
-                if attempt == self.max_retries:
-                    log_event(
-                        "ERROR",
-                        service_name,
-                        "All retries exhausted. Raising error.",
-                        retry_count=attempt,
-                        circuit_state=circuit_breaker.state.value if circuit_breaker else None
+        for attempt in self._attempts():
+            with span("retry.attempt", service=service_name, attempt=attempt):
+                if self.rate_limiter is not None:
+                    with span("rate_limit.wait"):
+                        self.rate_limiter.acquire()
+                started = self.clock.monotonic()
+                try:
+                    with span("service.call", service=service_name):
+                        result = func(*args, **kwargs)
+                    self._on_success(service_name, circuit_breaker, self.clock.monotonic() - started)
+                    return result
+
+                except TransientServiceError as e:
+                    delay = self._on_transient_error(
+                        e, attempt, service_name, circuit_breaker, delay,
+                        self.clock.monotonic() - started
+                    )
+                    if delay is None:
+                        raise
+
+            with span("retry.backoff", delay=delay):
+                self.clock.sleep(delay)
+
+    async def execute_async(self, func, circuit_breaker=None, *args, **kwargs):
+        """
+        Awaitable variant of execute(). Backoff yields to the event loop
+        instead of blocking the calling thread.
+
+        func may be a coroutine function or a plain callable; plain
+        callables are invoked inline and must not block.
+
+        With a bulkhead, the call waits for one of its slots first and
+        fails fast with BulkheadFullError when there is none. With a
+        concurrency limiter, each attempt waits for a slot first and gives
+        it back before any backoff; the time spent queued is not counted
+        as call latency.
+        """
+        if self.bulkhead is None:
+            return await self._execute_async(func, circuit_breaker, *args, **kwargs)
+
+        with span("bulkhead.wait"):
+            await self._enter_bulkhead(circuit_breaker)
+        try:
+            return await self._execute_async(func, circuit_breaker, *args, **kwargs)
+        finally:
+            self.bulkhead.release()
+
+    async def _execute_async(self, func, circuit_breaker, *args, **kwargs):
+        delay = self.initial_delay
+        service_name = self._service_name(func)
+        limiter = self.concurrency_limiter
+
+        for attempt in self._attempts():
+            with span("retry.attempt", service=service_name, attempt=attempt):
+                if self.rate_limiter is not None or limiter is not None:
+                    await self._before_attempt_async(limiter)
+                started = self.clock.monotonic()
+                try:
+                    with span("service.call", service=service_name):
+                        result = func(*args, **kwargs)
+                        if inspect.isawaitable(result):
+                            result = await result
+
+                except TransientServiceError as e:
+                    duration = self.clock.monotonic() - started
+                    if limiter is not None:
+                        limiter.release(duration, dropped=True)
+                    delay = self._on_transient_error(
+                        e, attempt, service_name, circuit_breaker, delay, duration
                     )
+                    if delay is None:
+                        raise
 
-                    if circuit_breaker:
-                        circuit_breaker.record_failure()
+                except BaseException:
+                    if limiter is not None:
+                        limiter.release(self.clock.monotonic() - started)
                     raise
 
-                time.sleep(delay)
-                delay *= self.backoff_factor
+                else:
+                    duration = self.clock.monotonic() - started
+                    if limiter is not None:
+                        limiter.release(duration)
+                    self._on_success(service_name, circuit_breaker, duration)
+                    return result
+
+            with span("retry.backoff", delay=delay):
+                await asyncio.sleep(delay)
+
+    def stream(self, func, circuit_breaker=None, *args, **kwargs):
+        """
+        Streaming variant of execute(): func returns an iterator of chunks,
+        which are passed on as they arrive.
+
+        An attempt is retried only if it fails before its first chunk;
+        once audio has been handed on, a failure is recorded and raised.
+        Call latency (for the breaker) is the time to the first chunk, and
+        the time from the request to the first chunk, retries included,
+        is recorded as TIME_TO_FIRST_AUDIO. Ending the stream early is not
+        a failure.
+        """
+
+        delay = self.initial_delay
+        service_name = self._service_name(func)
+        requested = started = self.clock.monotonic()
+
+        for attempt in self._attempts():
+            with span("retry.attempt", service=service_name, attempt=attempt):
+                if self.rate_limiter is not None:
+                    with span("rate_limit.wait"):
+                        self.rate_limiter.acquire()
+                started = self.clock.monotonic()
+                try:
+                    with span("service.first_chunk", service=service_name):
+                        chunks = iter(func(*args, **kwargs))
+                        first = next(chunks, None)
+                    break
+
+                except TransientServiceError as e:
+                    delay = self._on_transient_error(
+                        e, attempt, service_name, circuit_breaker, delay,
+                        self.clock.monotonic() - started
+                    )
+                    if delay is None:
+                        raise
+
+            with span("retry.backoff", delay=delay):
+                self.clock.sleep(delay)
+
+        first_chunk = self.clock.monotonic() - started
+        label = self._metric_label(service_name, circuit_breaker)
+        TIME_TO_FIRST_AUDIO.labels(label).observe(self.clock.monotonic() - requested)
+
+        failed = None
+        try:
+            if first is not None:
+                yield first
+                yield from chunks
+        except BaseServiceError as e:
+            failed = e
+            self._on_stream_error(e, service_name, circuit_breaker, first_chunk)
+            raise
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            if failed is None:
+                self._on_success(service_name, circuit_breaker, first_chunk)
+
+    async def stream_async(self, func, circuit_breaker=None, *args, **kwargs):
+        """
+        Async variant of stream(): func returns an async iterator of
+        chunks. Bulkhead and concurrency limiter slots are held until the
+        stream ends; the limiter gets the time to first chunk as its
+        latency signal.
+        """
+        if self.bulkhead is not None:
+            with span("bulkhead.wait"):
+                await self._enter_bulkhead(circuit_breaker)
+
+        chunks = self._stream_async(func, circuit_breaker, *args, **kwargs)
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+            if self.bulkhead is not None:
+                self.bulkhead.release()
+
+    async def _stream_async(self, func, circuit_breaker, *args, **kwargs):
+        delay = self.initial_delay
+        service_name = self._service_name(func)
+        limiter = self.concurrency_limiter
+        requested = started = self.clock.monotonic()
+
+        # Spans end before the first yield: a generator may resume in
+        # another context, where resetting them would fail
+        for attempt in self._attempts():
+            with span("retry.attempt", service=service_name, attempt=attempt):
+                if self.rate_limiter is not None or limiter is not None:
+                    await self._before_attempt_async(limiter)
+                started = self.clock.monotonic()
+                try:
+                    with span("service.first_chunk", service=service_name):
+                        chunks = func(*args, **kwargs).__aiter__()
+                        first = await chunks.__anext__()
+                    break
+
+                except StopAsyncIteration:
+                    first = None
+                    break
+
+                except TransientServiceError as e:
+                    duration = self.clock.monotonic() - started
+                    if limiter is not None:
+                        limiter.release(duration, dropped=True)
+                    delay = self._on_transient_error(
+                        e, attempt, service_name, circuit_breaker, delay, duration
+                    )
+                    if delay is None:
+                        raise
+
+                except BaseException:
+                    if limiter is not None:
+                        limiter.release(self.clock.monotonic() - started)
+                    raise
+
+            with span("retry.backoff", delay=delay):
+                await asyncio.sleep(delay)
+
+        first_chunk = self.clock.monotonic() - started
+        label = self._metric_label(service_name, circuit_breaker)
+        TIME_TO_FIRST_AUDIO.labels(label).observe(self.clock.monotonic() - requested)
+
+        failed = None
+        try:
+            if first is not None:
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+        except BaseServiceError as e:
+            failed = e
+            self._on_stream_error(e, service_name, circuit_breaker, first_chunk)
+            raise
+        finally:
+            close = getattr(chunks, "aclose", None)
+            if close is not None:
+                await close()
+            if limiter is not None:
+                limiter.release(first_chunk, dropped=isinstance(failed, TransientServiceError))
+            if failed is None:
+                self._on_success(service_name, circuit_breaker, first_chunk)
@@ -0,0 +1,53 @@
+# services/audio_buffers.py
+
+import threading
+
+from config import TTS_STREAM_CONFIG
+
+
+class BufferPool:
+    """
+    Free list of fixed-size bytearrays for streamed audio.
+
+    Providers fill a pooled buffer and yield a memoryview of the filled
+    part, so chunks pass through the retry and breaker layers without
+    copies. A chunk is only valid until the next one is requested: the
+    provider then returns its buffer to the pool. Consumers that need to
+    keep audio must copy it (bytes(chunk)).
+    """
+
+    def __init__(self, chunk_size=4096, pool_size=64):
+        self.chunk_size = chunk_size
+        self.pool_size = pool_size
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        return bytearray(self.chunk_size)
+
+    def release(self, buffer):
+        with self._lock:
+            if len(self._free) < self.pool_size:
+                self._free.append(buffer)
+
+
+def iter_chunks(audio, pool):
+    """
+    Yield `audio` as memoryviews over pooled buffers, one buffer per chunk.
+    """
+    source = memoryview(audio)
+    for offset in range(0, len(source), pool.chunk_size):
+        piece = source[offset:offset + pool.chunk_size]
+        buffer = pool.acquire()
+        buffer[:len(piece)] = piece
+        try:
+            yield memoryview(buffer)[:len(piece)]
+        finally:
+            pool.release(buffer)
+
+
+# Process-wide pool shared by the TTS providers
+audio_buffer_pool = BufferPool(**TTS_STREAM_CONFIG)
@@ -0,0 +1,35 @@
+# services/backup_tts_mock.py
+
+import asyncio
+from errors.exceptions import TransientServiceError
+
+
+class BackupTTSService:
+    """
+    Secondary TTS provider used at the end of the fallback chain.
+    Slower and lower quality than ElevenLabs, but independent of it.
+    """
+
+    def __init__(self, latency=0.0, voice_id="backup", model_id="standard"):
+        self.fail_mode = False
+        self.latency = latency   # seconds, simulated synthesis time
+        self.voice_id = voice_id
+        self.model_id = model_id
+
+    def text_to_speech(self, text):
+        if self.fail_mode:
+            raise TransientServiceError(
+                "BackupTTS 503 Service Unavailable",
+                service_name="BackupTTS"
+            )
+
+        print("🔈 Backup TTS generated successfully")
+        return b"backup-audio-bytes"
+
+    def health_check(self):
+        self.text_to_speech("health check")
+
+    async def text_to_speech_async(self, text):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.text_to_speech(text)
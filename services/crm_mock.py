@@ -0,0 +1,30 @@
+# services/crm_mock.py
+
+import asyncio
+from errors.exceptions import TransientServiceError
+
+
+class CRMService:
+    def __init__(self, latency=0.0):
+        self.fail_mode = False
+        self.latency = latency   # seconds, simulated network time
+
+    def fetch_contact(self, contact):
+        """
+        Simulates a CRM record lookup.
+        """
+        if self.fail_mode:
+            raise TransientServiceError(
+                "CRM 503 Service Unavailable",
+                service_name="CRM"
+            )
+
+        return {"contact": contact, "name": contact, "notes": []}
+
+    def health_check(self):
+        self.fetch_contact("health check")
+
+    async def fetch_contact_async(self, contact):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.fetch_contact(contact)
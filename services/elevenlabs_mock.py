@@ -1,19 +1,32 @@
 # services/elevenlabs_mock.py
 
+import asyncio
 import random
-from errors.exceptions import TransientServiceError, PermanentServiceError
+from errors.exceptions import TransientServiceError, PermanentServiceError, RateLimitError
+from services.audio_buffers import audio_buffer_pool, iter_chunks
 
 
 class ElevenLabsService:
-    def __init__(self):
+    def __init__(self, voice_id="default", model_id="eleven_multilingual_v2", latency=0.0):
         self.fail_mode = True   
         self.force_error = None  
+        self.latency = latency   # seconds, simulated synthesis time (async path)
+        self.voice_id = voice_id
+        self.model_id = model_id
 
     def text_to_speech(self, text):
         """
         Simulates a call to ElevenLabs TTS.
         Can simulate transient failures, permanent failures, or succeed.
         """
+        self._check_request(text)
+        print("🔊 ElevenLabs TTS generated successfully")
+        return b"audio-bytes"
+
+    def _check_request(self, text):
+        """
+        Raise the simulated failure for this request, if any.
+        """
 
         if text == "PERMANENT_FAIL":
             raise PermanentServiceError(
@@ -38,11 +51,53 @@ class ElevenLabsService:
                     service_name="ElevenLabs"
                 )
 
+            if error_type == "rate_limit":
+                raise RateLimitError(
+                    "ElevenLabs 429 Too Many Requests",
+                    service_name="ElevenLabs",
+                    retry_after=1.0
+                )
+
             if error_type == "auth":
                 raise PermanentServiceError(
                     "ElevenLabs authentication failed",
                     service_name="ElevenLabs"
                 )
 
-        print("🔊 ElevenLabs TTS generated successfully")
-        return "audio-bytes"
+    def _synthesize(self, text):
+        # About one 4 KiB chunk per dozen characters
+        return b"audio-bytes" * (32 * max(1, len(text)))
+
+    def text_to_speech_stream(self, text):
+        """
+        Streaming TTS: yields memoryview chunks over pooled buffers, each
+        valid until the next is requested. Failures are raised before the
+        first chunk.
+        """
+        self._check_request(text)
+        yield from iter_chunks(self._synthesize(text), audio_buffer_pool)
+
+    async def text_to_speech_stream_async(self, text):
+        """
+        Async variant of text_to_speech_stream(); the simulated latency is
+        spent before the first chunk.
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._check_request(text)
+        for chunk in iter_chunks(self._synthesize(text), audio_buffer_pool):
+            yield chunk
+
+    def health_check(self):
+        """
+        Synthetic probe: a tiny TTS request that raises if the service is unhealthy.
+        """
+        self.text_to_speech("health check")
+
+    async def text_to_speech_async(self, text):
+        """
+        Awaitable variant of text_to_speech() for the async call engine.
+        """
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.text_to_speech(text)
@@ -0,0 +1,31 @@
+# services/llm_mock.py
+
+import asyncio
+from errors.exceptions import TransientServiceError
+
+
+class LLMService:
+    def __init__(self, latency=0.0):
+        self.fail_mode = False
+        self.latency = latency   # seconds, simulated generation time
+
+    def generate_reply(self, prompt, context=None):
+        """
+        Simulates an LLM completion for the call opener.
+        """
+        if self.fail_mode:
+            raise TransientServiceError(
+                "LLM timeout occurred",
+                service_name="LLM"
+            )
+
+        name = (context or {}).get("name", "there")
+        return f"Hi {name}, {prompt}"
+
+    def health_check(self):
+        self.generate_reply("health check")
+
+    async def generate_reply_async(self, prompt, context=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.generate_reply(prompt, context)
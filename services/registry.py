@@ -0,0 +1,104 @@
+# services/registry.py
+
+from config import (
+    RETRY_CONFIG, CIRCUIT_BREAKER_CONFIG, BULKHEAD_CONFIG, CONCURRENCY_LIMIT_CONFIG,
+    RATE_LIMIT_CONFIG, SERVICES_CONFIG
+)
+from retry.rate_limiter import rate_limiter_for
+from retry.retry_handler import RetryHandler
+from circuit_breaker.bulkhead import Bulkhead
+from circuit_breaker.circuit_breaker import CircuitBreaker
+from circuit_breaker.concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+class ServiceEntry:
+    """
+    A downstream dependency with its own breaker and retry policy, plus
+    optional bulkhead, adaptive concurrency limiter and quota rate limiter.
+    """
+
+    def __init__(self, name, service, circuit_breaker, retry_handler, limiter=None,
+                 rate_limiter=None, bulkhead=None):
+        self.name = name
+        self.service = service
+        self.circuit_breaker = circuit_breaker
+        self.retry_handler = retry_handler
+        self.limiter = limiter
+        self.rate_limiter = rate_limiter
+        self.bulkhead = bulkhead
+
+    def method(self, name):
+        """
+        Resolve a service method, preferring its native coroutine variant.
+        """
+        return getattr(self.service, f"{name}_async", None) or getattr(self.service, name)
+
+
+class ServiceRegistry:
+    """
+    Maps service names to ServiceEntry objects. Breaker, retry, bulkhead,
+    concurrency limit and rate limit settings start from
+    CIRCUIT_BREAKER_CONFIG / RETRY_CONFIG / BULKHEAD_CONFIG /
+    CONCURRENCY_LIMIT_CONFIG / RATE_LIMIT_CONFIG, with per-service
+    overrides from SERVICES_CONFIG.
+    Rate limiters are shared by services using the same API key
+    (the service's `api_key` attribute, if any).
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def register(self, name, service, circuit_breaker=None, retry_handler=None,
+                 limiter=None, rate_limiter=None, bulkhead=None):
+        overrides = SERVICES_CONFIG.get(name, {})
+
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker(
+                service_name=name,
+                **{**CIRCUIT_BREAKER_CONFIG, **overrides.get("circuit_breaker", {})}
+            )
+        if bulkhead is None:
+            bulkhead_config = {**BULKHEAD_CONFIG, **overrides.get("bulkhead", {})}
+            if bulkhead_config.pop("enabled"):
+                bulkhead = Bulkhead(service_name=name, **bulkhead_config)
+        if limiter is None:
+            limit_config = {**CONCURRENCY_LIMIT_CONFIG, **overrides.get("concurrency_limit", {})}
+            if limit_config.pop("enabled"):
+                limiter = AdaptiveConcurrencyLimiter(service_name=name, **limit_config)
+        if rate_limiter is None:
+            rate_config = {**RATE_LIMIT_CONFIG, **overrides.get("rate_limit", {})}
+            if rate_config.pop("enabled"):
+                rate_limiter = rate_limiter_for(
+                    name, getattr(service, "api_key", None), **rate_config
+                )
+        if retry_handler is None:
+            retry_handler = RetryHandler(
+                **{**RETRY_CONFIG, **overrides.get("retry", {})},
+                concurrency_limiter=limiter,
+                rate_limiter=rate_limiter,
+                bulkhead=bulkhead
+            )
+
+        entry = ServiceEntry(
+            name, service, circuit_breaker, retry_handler, limiter, rate_limiter, bulkhead
+        )
+        self._entries[name] = entry
+        return entry
+
+    def get(self, name):
+        return self._entries[name]
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def bulkhead_stats(self):
+        """
+        Occupancy and rejection counts per service with a bulkhead.
+        """
+        return {
+            entry.name: entry.bulkhead.snapshot()
+            for entry in self if entry.bulkhead is not None
+        }
@@ -0,0 +1,299 @@
+# services/tts_chain.py
+
+import asyncio
+import inspect
+
+from clock.clock import current_clock
+from errors.exceptions import BaseServiceError, TransientServiceError, CircuitOpenError
+from logs.log_manager import log_event
+from metrics.instruments import SERVICE_CALLS, SERVICE_LATENCY
+from retry.retry_budget import RetryBudget
+
+
+class LatencyTracker:
+    """
+    Recent latencies of one provider in a fixed-size ring. The sorted view
+    used for percentiles is rebuilt only after a batch of new samples.
+    """
+
+    def __init__(self, size=200, default=0.5):
+        self.size = size
+        self.default = default
+        self._samples = []
+        self._index = 0
+        self._sorted = None
+        self._stale = 0
+
+    def record(self, seconds):
+        if len(self._samples) < self.size:
+            self._samples.append(seconds)
+        else:
+            self._samples[self._index] = seconds
+            self._index = (self._index + 1) % self.size
+        self._stale += 1
+
+    def percentile(self, q):
+        if not self._samples:
+            return self.default
+        if self._sorted is None or self._stale >= max(1, self.size // 10):
+            self._sorted = sorted(self._samples)
+            self._stale = 0
+        index = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[index]
+
+
+class SynthesizedAudio(bytes):
+    """
+    Audio bytes tagged with the voice and model of the provider that
+    produced them, so a cache keys fallback audio under that provider's
+    voice rather than the chain's primary one.
+    """
+
+    def __new__(cls, audio=b"", voice_id="default", model_id="default"):
+        self = super().__new__(cls, audio)
+        self.voice_id = voice_id
+        self.model_id = model_id
+        return self
+
+
+def _tag(entry, result):
+    if isinstance(result, str):
+        result = result.encode("utf-8")
+    if not isinstance(result, (bytes, bytearray, memoryview)):
+        return result
+    return SynthesizedAudio(
+        result,
+        getattr(entry.service, "voice_id", "default"),
+        getattr(entry.service, "model_id", "default")
+    )
+
+
+class TTSFallbackChain:
+    """
+    Ordered chain of TTS providers behind the ElevenLabsService interface.
+
+    Each provider is a registry ServiceEntry with its own breaker and
+    concurrency limiter; providers whose breaker is not admitting calls
+    are skipped, and a failing provider falls through to the next one. If the chosen provider has not answered
+    by its `hedge_percentile` latency, a second request goes to the next
+    admitting provider (or the same one with `hedge_same_provider`); the
+    first success wins and the other request is cancelled. Hedges draw from
+    a budget refilled by a fraction of requests so they cannot double load.
+
+    Results are SynthesizedAudio carrying the answering provider's voice
+    and model; `voice_id` / `model_id` of the chain are the primary's.
+    """
+
+    def __init__(self, entries, hedge_percentile=0.95, min_hedge_delay=0.05,
+                 hedge_budget=None, hedge_same_provider=False, enabled=True):
+        self.entries = list(entries)
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.hedge_same_provider = hedge_same_provider
+        self.enabled = enabled
+        # RetryBudget's token bucket: one deposit of `ratio` per request
+        self.hedge_budget = hedge_budget or RetryBudget(ratio=0.1, min_retries_per_second=1)
+
+        self.latency = {entry.name: LatencyTracker() for entry in self.entries}
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "fallbacks": 0}
+
+    # Cache lookups follow the primary provider's voice; stores follow
+    # the voice of the provider that answered (SynthesizedAudio)
+    @property
+    def voice_id(self):
+        return getattr(self.entries[0].service, "voice_id", "default")
+
+    @property
+    def model_id(self):
+        return getattr(self.entries[0].service, "model_id", "default")
+
+    @property
+    def primary(self):
+        """
+        The first provider's service itself, outside breakers and limits.
+        """
+        return self.entries[0].service
+
+    # ---- single provider attempt -------------------------------------
+
+    @staticmethod
+    def _honour_retry_after(entry, error):
+        # A throttled provider holds back all of its callers, not just this one
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None and entry.rate_limiter is not None:
+            entry.rate_limiter.pause(retry_after)
+
+    async def _attempt(self, entry, text):
+        breaker = entry.circuit_breaker
+        limiter = entry.limiter
+        if entry.rate_limiter is not None:
+            await entry.rate_limiter.acquire_async()
+        if limiter is not None:
+            await limiter.acquire()
+        started = current_clock.monotonic()
+        try:
+            result = entry.method("text_to_speech")(text)
+            if inspect.isawaitable(result):
+                result = await result
+        except BaseServiceError as e:
+            duration = current_clock.monotonic() - started
+            transient = isinstance(e, TransientServiceError)
+            if limiter is not None:
+                limiter.release(duration, dropped=transient)
+            self._honour_retry_after(entry, e)
+            outcome = "transient_error" if transient else "permanent_error"
+            SERVICE_CALLS.labels(entry.name, outcome).inc()
+            SERVICE_LATENCY.labels(entry.name).observe(duration)
+            breaker.record_failure(duration=duration)
+            raise
+        except BaseException:
+            # Cancelled, e.g. the losing side of a hedge
+            if limiter is not None:
+                limiter.release(current_clock.monotonic() - started)
+            raise
+
+        duration = current_clock.monotonic() - started
+        if limiter is not None:
+            limiter.release(duration)
+        SERVICE_CALLS.labels(entry.name, "success").inc()
+        SERVICE_LATENCY.labels(entry.name).observe(duration)
+        breaker.record_success(duration=duration)
+        self.latency[entry.name].record(duration)
+        return _tag(entry, result)
+
+    def _hedge_target(self, entry, alternatives):
+        if self.hedge_same_provider:
+            return entry
+        # Hedges are optional load: only to providers that are fully
+        # CLOSED, without taking a HALF_OPEN probe or ramp-up admission
+        for alternative in alternatives:
+            if alternative.circuit_breaker.fully_closed:
+                return alternative
+        return None
+
+    async def _hedged(self, entry, alternatives, text, tried):
+        primary = asyncio.create_task(self._attempt(entry, text))
+        tasks = {primary: entry}
+        try:
+            if not self.enabled:
+                return await primary
+
+            delay = max(
+                self.min_hedge_delay,
+                self.latency[entry.name].percentile(self.hedge_percentile)
+            )
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            if not self.hedge_budget.try_acquire():
+                return await primary
+            target = self._hedge_target(entry, alternatives)
+            if target is None:
+                return await primary
+
+            self.stats["hedges"] += 1
+            log_event(
+                "DEBUG",
+                entry.name,
+                "Hedging TTS request to %s after %.3fs",
+                args=(target.name, delay)
+            )
+            hedge = asyncio.create_task(self._attempt(target, text))
+            tasks[hedge] = target
+            tried.add(target.name)
+
+            errors = []
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    # ---- ElevenLabsService interface -----------------------------------
+
+    async def text_to_speech_async(self, text):
+        self.stats["requests"] += 1
+        self.hedge_budget.record_success()
+
+        errors = []
+        tried = set()   # providers already called, including hedge targets
+        for index, entry in enumerate(self.entries):
+            if entry.name in tried or not entry.circuit_breaker.allow_request():
+                continue
+            tried.add(entry.name)
+            if errors:
+                self.stats["fallbacks"] += 1
+            try:
+                return await self._hedged(entry, self.entries[index + 1:], text, tried)
+            except BaseServiceError as e:
+                errors.append(e)
+                log_event(
+                    "WARNING",
+                    entry.name,
+                    "TTS provider failed, falling back: %s",
+                    args=(e,)
+                )
+
+        raise self._chain_error(errors)
+
+    def text_to_speech(self, text):
+        """
+        Blocking variant (no hedging) for pre-rendering and probes.
+        """
+        errors = []
+        for entry in self.entries:
+            if not entry.circuit_breaker.allow_request():
+                continue
+            if entry.rate_limiter is not None:
+                entry.rate_limiter.acquire()
+            started = current_clock.monotonic()
+            try:
+                result = entry.service.text_to_speech(text)
+            except BaseServiceError as e:
+                entry.circuit_breaker.record_failure(duration=current_clock.monotonic() - started)
+                self._honour_retry_after(entry, e)
+                errors.append(e)
+                continue
+            entry.circuit_breaker.record_success(duration=current_clock.monotonic() - started)
+            return _tag(entry, result)
+
+        raise self._chain_error(errors)
+
+    def health_check(self):
+        """
+        Healthy if any provider in the chain passes its own probe.
+        """
+        errors = []
+        for entry in self.entries:
+            check = getattr(entry.service, "health_check", None)
+            if check is None:
+                continue
+            try:
+                check()
+                return
+            except BaseServiceError as e:
+                errors.append(e)
+        if errors:
+            raise self._chain_error(errors)
+
+    @staticmethod
+    def _chain_error(errors):
+        if not errors:
+            return CircuitOpenError("No TTS provider is admitting requests", service_name="TTS")
+        # Surface a retryable error if any provider failed transiently
+        for error in errors:
+            if isinstance(error, TransientServiceError):
+                return error
+        return errors[-1]
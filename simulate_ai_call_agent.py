@@ -1,12 +1,10 @@
-import threading
-import time
-from errors.exceptions import TransientServiceError, PermanentServiceError
+import asyncio
+from errors.exceptions import TransientServiceError
 from retry.retry_handler import RetryHandler
 from circuit_breaker.circuit_breaker import CircuitBreaker
 from health.health_check import HealthChecker
-from alerts.alert_manager import send_alert
-from logs.logger import log
-from logs.sheets_logger import log_to_sheets
+from engine.call_engine import CallEngine
+from logs.log_manager import log_event
 
 
 # -------------------------
@@ -21,6 +19,9 @@ class MockElevenLabsService:
             raise TransientServiceError("503 Service Unavailable", service_name="ElevenLabs")
         return f"Audio({text})"
 
+    async def text_to_speech_async(self, text):
+        return self.text_to_speech(text)
+
 
 # -------------------------
 # Configuration
@@ -40,6 +41,10 @@ HEALTH_CHECK_CONFIG = {
     "interval": 5  # seconds
 }
 
+ENGINE_CONFIG = {
+    "concurrency": 10
+}
+
 
 # -------------------------
 # Call Queue
@@ -57,75 +62,38 @@ class CallQueue:
         self.index += 1
         return contact
 
+    def skip_contact(self, contact, reason):
+        log_event("WARNING", "CallQueue", f"Skipping contact {contact}: {reason}")
+
 
 # -------------------------
 # Main simulation
 # -------------------------
+async def run_simulation(engine, elevenlabs):
+    # Simulate service recovery after some time
+    asyncio.get_running_loop().call_later(2, setattr, elevenlabs, "fail_mode", False)
+    return await engine.run()
+
+
 def main():
     elevenlabs = MockElevenLabsService()
     retry_handler = RetryHandler(**RETRY_CONFIG)
     circuit_breaker = CircuitBreaker("ElevenLabs", **CIRCUIT_BREAKER_CONFIG)
     call_queue = CallQueue(["Contact-1", "Contact-2", "Contact-3"])
 
-    # Start health checker in background
+    # Register with the shared background health scheduler
     health_checker = HealthChecker("ElevenLabs", elevenlabs, circuit_breaker)
-    threading.Thread(target=health_checker.start, daemon=True).start()
-
-    while call_queue.has_next():
-        contact = call_queue.next_call()
-        log("INFO", "System", f"Processing call for {contact}")
-
-        # Skip call if circuit breaker is open
-        if not circuit_breaker.allow_request():
-            log(
-                "WARNING",
-                "ElevenLabs",
-                "Circuit OPEN. Skipping call.",
-                circuit_state=circuit_breaker.state.value
-            )
-            continue
-
-        try:
-            # ✅ Corrected execute call
-            retry_handler.execute(
-                elevenlabs.text_to_speech,  # method
-                circuit_breaker,            # circuit breaker object
-                f"Hello {contact}"          # text argument
-            )
-
-            log(
-                "INFO",
-                "ElevenLabs",
-                f"Call successful for {contact}",
-                circuit_state=circuit_breaker.state.value
-            )
-
-        except TransientServiceError as e:
-            log(
-                "ERROR",
-                "ElevenLabs",
-                str(e),
-                retry_count=RETRY_CONFIG["max_retries"],
-                circuit_state=circuit_breaker.state.value
-            )
-            log_to_sheets("ElevenLabs", "Transient", str(e))
-            send_alert("ElevenLabs", "Transient failure, retries exhausted")
-            circuit_breaker.record_failure()
-
-        except PermanentServiceError as e:
-            log(
-                "CRITICAL",
-                "ElevenLabs",
-                str(e),
-                circuit_state=circuit_breaker.state.value
-            )
-            log_to_sheets("ElevenLabs", "Permanent", str(e))
-            send_alert("ElevenLabs", "Permanent failure detected")
-            break
-
-        # Simulate service recovery after some time
-        time.sleep(2)
-        elevenlabs.fail_mode = False  # Service becomes healthy
+    health_checker.start()
+
+    engine = CallEngine(
+        call_queue,
+        elevenlabs,
+        retry_handler,
+        circuit_breaker,
+        service_name="ElevenLabs",
+        **ENGINE_CONFIG
+    )
+    return asyncio.run(run_simulation(engine, elevenlabs))
 
 
 if __name__ == "__main__":
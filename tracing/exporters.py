@@ -0,0 +1,167 @@
+# tracing/exporters.py
+
+import atexit
+import itertools
+import json
+import os
+import threading
+
+TRACE_FORMATS = ("chrome", "otlp")
+
+
+class _BufferedExporter:
+    """
+    Collects finished spans and appends them to `path` every
+    `batch_size` spans and at exit, so tracing never writes per span.
+    """
+
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self.exported = 0
+
+        self._spans = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._start()
+        atexit.register(self.close)
+
+    def _start(self):
+        pass
+
+    def export(self, span):
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) < self.batch_size:
+                return
+            batch, self._spans = self._spans, []
+            self._write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._spans = self._spans, []
+            if batch:
+                self._write(batch)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+
+class ChromeTraceExporter(_BufferedExporter):
+    """
+    Chrome trace event format ("JSON Array Format"), readable by
+    chrome://tracing, Perfetto and speedscope. Every trace (call) gets
+    its own row; nested spans stack into a flame chart. The array is
+    left open so batches can be appended; the viewers accept that.
+    """
+
+    def _start(self):
+        self._rows = {}
+        # Rows are never reused: a trace that started before another one
+        # ended would otherwise overlap it on the freed row
+        self._next_row = itertools.count(1)
+        with open(self.path, "w") as f:
+            f.write("[\n")
+
+    def _row(self, trace_id):
+        row = self._rows.get(trace_id)
+        if row is None:
+            row = self._rows[trace_id] = next(self._next_row)
+        return row
+
+    def _write(self, batch):
+        pid = os.getpid()
+        lines = []
+        for span in batch:
+            args = dict(span.attributes)
+            args["trace_id"] = f"{span.trace_id:032x}"
+            if span.error:
+                args["error"] = span.error
+            lines.append(json.dumps({
+                "name": span.name,
+                "cat": "call",
+                "ph": "X",
+                "ts": round(span.start * 1e6, 3),
+                "dur": round((span.end - span.start) * 1e6, 3),
+                "pid": pid,
+                "tid": self._row(span.trace_id),
+                "args": args
+            }))
+            if span.parent_id is None:
+                # Finished call: its row number will not be needed again
+                self._rows.pop(span.trace_id, None)
+        with open(self.path, "a") as f:
+            f.write(",\n".join(lines) + ",\n")
+        self.exported += len(batch)
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPJsonExporter(_BufferedExporter):
+    """
+    OTLP/JSON: one ExportTraceServiceRequest per line, as written by the
+    OpenTelemetry Collector's file exporter; `otelcol` can replay it into
+    Jaeger, Tempo and friends.
+    """
+
+    def __init__(self, path, batch_size=256, service_name="ai-call-agent"):
+        self.service_name = service_name
+        super().__init__(path, batch_size)
+
+    def _write(self, batch):
+        spans = []
+        for span in batch:
+            item = {
+                "traceId": f"{span.trace_id:032x}",
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(int(span.start * 1e9)),
+                "endTimeUnixNano": str(int(span.end * 1e9)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in span.attributes.items()
+                ],
+                "status": {"code": 2, "message": span.error} if span.error else {}
+            }
+            if span.parent_id is not None:
+                item["parentSpanId"] = f"{span.parent_id:016x}"
+            spans.append(item)
+
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}}
+                ]},
+                "scopeSpans": [{"scope": {"name": "tracing"}, "spans": spans}]
+            }]
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(request) + "\n")
+        self.exported += len(batch)
+
+
+def build_exporter(format, path, batch_size=256):
+    if format == "chrome":
+        return ChromeTraceExporter(path, batch_size)
+    if format == "otlp":
+        return OTLPJsonExporter(path, batch_size)
+    raise ValueError(f"Unknown trace format: {format}")
@@ -0,0 +1,150 @@
+# tracing/tracer.py
+
+import contextvars
+import random
+
+from clock.clock import current_clock
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    One timed operation within a sampled trace.
+
+    Used as a context manager: entering makes it the current span for
+    the task or thread (contextvars), so spans opened underneath - also in
+    asyncio tasks and to_thread calls started from there - become its
+    children. An exception leaving the block marks the span as an error.
+    """
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id",
+        "start", "end", "attributes", "error", "_token"
+    )
+
+    def __init__(self, tracer, name, trace_id, parent_id, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = None
+        self.end = None
+        self.error = None
+        self._token = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.start = self.tracer.clock.time()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = self.tracer.clock.time()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.finish(self)
+        return False
+
+
+class _NoopSpan:
+    """
+    Stand-in when the trace is not sampled: costs one attribute lookup.
+    """
+
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Head-sampled tracer.
+
+    start_trace() decides once per call whether it is traced (`sample_rate`);
+    span() only creates a span under a sampled parent, so unsampled calls
+    pay a ContextVar lookup per instrumented layer. Finished spans go to
+    `exporter` (see tracing.exporters).
+    """
+
+    def __init__(self, sample_rate=0.0, exporter=None, clock=None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.clock = clock or current_clock
+
+    def start_trace(self, name, **attributes):
+        """
+        Root span for a new trace, or NOOP_SPAN if it is not sampled.
+        """
+        if self.exporter is None or random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        return Span(self, name, random.getrandbits(128), None, attributes)
+
+    def span(self, name, **attributes):
+        """
+        Child of the current span, or NOOP_SPAN outside a sampled trace.
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    def finish(self, span):
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+tracer = Tracer()
+
+
+def configure_tracing(sample_rate, exporter):
+    """
+    Enable tracing on the process-wide tracer.
+    """
+    if tracer.exporter is not None:
+        tracer.exporter.close()
+    tracer.sample_rate = sample_rate
+    tracer.exporter = exporter
+    return tracer
+
+
+def start_trace(name, **attributes):
+    return tracer.start_trace(name, **attributes)
+
+
+def span(name, **attributes):
+    return tracer.span(name, **attributes)
+
+
+def current_span():
+    """
+    The active sampled span, or None.
+    """
+    return _current_span.get()
+
+
+def current_trace_id():
+    """
+    Hex id of the active sampled trace, for correlating log records.
+    """
+    active = _current_span.get()
+    return f"{active.trace_id:032x}" if active is not None else None